@@ -23,6 +23,7 @@ from app.config import settings
 from app.db import Base  # Import Base which has all models registered
 from app.models.user import User  # Ensure models are imported
 from app.models.case import Case, Person, PersonRelationship
+from app.models.calculation_job import CalculationJob
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
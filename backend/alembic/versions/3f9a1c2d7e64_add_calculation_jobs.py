@@ -0,0 +1,52 @@
+"""Add calculation_jobs table
+
+Revision ID: 3f9a1c2d7e64
+Revises: b42994db1a14
+Create Date: 2026-10-19 10:12:41.512093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c2d7e64'
+down_revision: Union[str, Sequence[str], None] = 'b42994db1a14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('calculation_jobs',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('case_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('phase', sa.String(length=20), nullable=True),
+    sa.Column('include_tree', sa.Boolean(), nullable=False),
+    sa.Column('result', sa.JSON(), nullable=True),
+    sa.Column('error', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['case_id'], ['cases.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        op.f('ix_calculation_jobs_case_id'), 'calculation_jobs', ['case_id'],
+        unique=False,
+    )
+    op.create_index(
+        op.f('ix_calculation_jobs_status'), 'calculation_jobs', ['status'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_calculation_jobs_status'), table_name='calculation_jobs')
+    op.drop_index(op.f('ix_calculation_jobs_case_id'), table_name='calculation_jobs')
+    op.drop_table('calculation_jobs')
@@ -0,0 +1,106 @@
+"""Add normalized search columns
+
+Revision ID: 5e0b93c4a7f1
+Revises: d71f4a0c6b28
+Create Date: 2026-10-19 16:05:31.204117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.search_text import normalize_search_text
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e0b93c4a7f1'
+down_revision: Union[str, Sequence[str], None] = 'd71f4a0c6b28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def _normalized(column: str, value):
+    text = normalize_search_text(value)
+    # description_search is nullable, like description
+    return text or None if column == 'description' else text
+
+
+def _backfill(table: str, columns: Sequence[str]) -> None:
+    """Fill <column>_search from <column> in id-ordered batches"""
+    bind = op.get_bind()
+    select_sql = sa.text(
+        f"SELECT id, {', '.join(columns)} FROM {table} WHERE id > :last_id "
+        f"ORDER BY id LIMIT {BACKFILL_BATCH_SIZE}"
+    )
+    update_sql = sa.text(
+        f"UPDATE {table} SET "
+        + ", ".join(f"{column}_search = :{column}" for column in columns)
+        + " WHERE id = :id"
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(select_sql, {"last_id": last_id}).all()
+        if not rows:
+            break
+        bind.execute(
+            update_sql,
+            [
+                {
+                    "id": row[0],
+                    **{
+                        column: _normalized(column, value)
+                        for column, value in zip(columns, row[1:])
+                    },
+                }
+                for row in rows
+            ],
+        )
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('persons', sa.Column(
+        'name_search', sa.String(length=255), server_default='', nullable=False
+    ))
+    op.add_column('cases', sa.Column(
+        'title_search', sa.String(length=255), server_default='', nullable=False
+    ))
+    op.add_column('cases', sa.Column('description_search', sa.Text(), nullable=True))
+
+    _backfill('persons', ['name'])
+    _backfill('cases', ['title', 'description'])
+
+    if op.get_context().dialect.name == 'postgresql':
+        # pg_trgm only extracts trigrams from characters the database
+        # locale treats as alphanumeric; use a UTF-8 locale for kanji / kana
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.create_index(
+            'ix_persons_name_search_trgm', 'persons', ['name_search'],
+            unique=False, postgresql_using='gin',
+            postgresql_ops={'name_search': 'gin_trgm_ops'},
+        )
+        op.create_index(
+            'ix_cases_title_search_trgm', 'cases', ['title_search'],
+            unique=False, postgresql_using='gin',
+            postgresql_ops={'title_search': 'gin_trgm_ops'},
+        )
+        op.create_index(
+            'ix_cases_description_search_trgm', 'cases', ['description_search'],
+            unique=False, postgresql_using='gin',
+            postgresql_ops={'description_search': 'gin_trgm_ops'},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_context().dialect.name == 'postgresql':
+        op.drop_index('ix_cases_description_search_trgm', table_name='cases')
+        op.drop_index('ix_cases_title_search_trgm', table_name='cases')
+        op.drop_index('ix_persons_name_search_trgm', table_name='persons')
+    op.drop_column('cases', 'description_search')
+    op.drop_column('cases', 'title_search')
+    op.drop_column('persons', 'name_search')
@@ -0,0 +1,30 @@
+"""Add case revision counter
+
+Revision ID: 8c2e5b7a91d3
+Revises: 3f9a1c2d7e64
+Create Date: 2026-10-19 11:03:27.844210
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c2e5b7a91d3'
+down_revision: Union[str, Sequence[str], None] = '3f9a1c2d7e64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('cases', sa.Column(
+        'revision', sa.Integer(), server_default='0', nullable=False
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('cases', 'revision')
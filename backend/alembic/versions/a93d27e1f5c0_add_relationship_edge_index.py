@@ -0,0 +1,70 @@
+"""Add unique relationship edge index
+
+Revision ID: a93d27e1f5c0
+Revises: 5e0b93c4a7f1
+Create Date: 2026-10-19 17:21:44.870251
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a93d27e1f5c0'
+down_revision: Union[str, Sequence[str], None] = '5e0b93c4a7f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+# Rows repeating an earlier (case, from, to, type) edge
+DUPLICATE_IDS = """
+    SELECT r.id FROM person_relationships r
+    JOIN person_relationships k
+      ON k.case_id = r.case_id
+     AND k.from_person_id = r.from_person_id
+     AND k.to_person_id = r.to_person_id
+     AND k.relationship_type = r.relationship_type
+     AND k.id < r.id
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep the oldest copy of every edge; bump the revision of affected
+    # cases so cached indexes and results are rebuilt without duplicates
+    op.execute(
+        "UPDATE cases SET revision = revision + 1 WHERE id IN ("
+        f"SELECT case_id FROM person_relationships WHERE id IN ({DUPLICATE_IDS}))"
+    )
+    op.execute(f"DELETE FROM person_relationships WHERE id IN ({DUPLICATE_IDS})")
+    # Their Neo4j edges are left behind; the migration only touches
+    # PostgreSQL (and works offline), so they are removed afterwards with
+    # python -m app.services.graph_repair
+    logger.info(
+        "Removed duplicate relationship edges; with GRAPH_BACKEND=neo4j, run "
+        "python -m app.services.graph_repair to delete their graph edges"
+    )
+
+    op.create_index(
+        'uq_person_relationships_edge',
+        'person_relationships',
+        ['case_id', 'from_person_id', 'to_person_id', 'relationship_type'],
+        unique=True,
+        postgresql_include=['id', 'is_biological', 'is_adopted', 'blood_type'],
+    )
+    # The edge index leads with case_id and replaces the single-column one
+    op.drop_index(
+        op.f('ix_person_relationships_case_id'), table_name='person_relationships'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        op.f('ix_person_relationships_case_id'), 'person_relationships',
+        ['case_id'], unique=False,
+    )
+    op.drop_index('uq_person_relationships_edge', table_name='person_relationships')
@@ -0,0 +1,74 @@
+"""Add case counters
+
+Revision ID: c6f18d2b04e9
+Revises: a93d27e1f5c0
+Create Date: 2026-10-19 18:02:13.559830
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6f18d2b04e9'
+down_revision: Union[str, Sequence[str], None] = 'a93d27e1f5c0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('cases', sa.Column(
+        'person_count', sa.Integer(), server_default='0', nullable=False
+    ))
+    op.add_column('cases', sa.Column(
+        'relationship_count', sa.Integer(), server_default='0', nullable=False
+    ))
+    op.add_column('cases', sa.Column(
+        'has_decedent', sa.Boolean(), server_default=sa.false(), nullable=False
+    ))
+    op.add_column('cases', sa.Column(
+        'last_calculated_at', sa.DateTime(), nullable=True
+    ))
+    op.add_column('cases', sa.Column(
+        'last_result_fingerprint', sa.String(length=64), nullable=True
+    ))
+
+    # Backfill from rows (updated_at is kept so ETags stay valid)
+    op.execute(
+        """
+        UPDATE cases SET
+            person_count = (
+                SELECT count(*) FROM persons WHERE persons.case_id = cases.id
+            ),
+            relationship_count = (
+                SELECT count(*) FROM person_relationships
+                WHERE person_relationships.case_id = cases.id
+            ),
+            has_decedent = EXISTS (
+                SELECT 1 FROM persons
+                WHERE persons.case_id = cases.id AND persons.is_decedent
+            )
+        """
+    )
+
+    op.create_index(
+        'ix_cases_user_listing',
+        'cases',
+        ['user_id', 'updated_at'],
+        unique=False,
+        postgresql_where=sa.text('deleted_at IS NULL'),
+        sqlite_where=sa.text('deleted_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_cases_user_listing', table_name='cases')
+    op.drop_column('cases', 'last_result_fingerprint')
+    op.drop_column('cases', 'last_calculated_at')
+    op.drop_column('cases', 'has_decedent')
+    op.drop_column('cases', 'relationship_count')
+    op.drop_column('cases', 'person_count')
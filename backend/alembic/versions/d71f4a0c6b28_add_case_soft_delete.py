@@ -0,0 +1,30 @@
+"""Add case soft delete
+
+Revision ID: d71f4a0c6b28
+Revises: 8c2e5b7a91d3
+Create Date: 2026-10-19 13:42:08.516307
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd71f4a0c6b28'
+down_revision: Union[str, Sequence[str], None] = '8c2e5b7a91d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('cases', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.create_index(op.f('ix_cases_deleted_at'), 'cases', ['deleted_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_cases_deleted_at'), table_name='cases')
+    op.drop_column('cases', 'deleted_at')
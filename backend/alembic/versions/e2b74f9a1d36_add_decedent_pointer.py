@@ -0,0 +1,72 @@
+"""Add decedent pointer and one-decedent-per-case index
+
+Revision ID: e2b74f9a1d36
+Revises: c6f18d2b04e9
+Create Date: 2026-10-19 18:47:52.118604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b74f9a1d36'
+down_revision: Union[str, Sequence[str], None] = 'c6f18d2b04e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Decedents after the first (lowest ID) of their case; calculations have
+# always used the first one
+EXTRA_DECEDENTS = """
+    SELECT p.id FROM persons p
+    JOIN persons k
+      ON k.case_id = p.case_id AND k.is_decedent AND k.id < p.id
+    WHERE p.is_decedent
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        "UPDATE cases SET revision = revision + 1 WHERE id IN ("
+        f"SELECT case_id FROM persons WHERE id IN ({EXTRA_DECEDENTS}))"
+    )
+    false = sa.false().compile(dialect=op.get_context().dialect)
+    op.execute(
+        f"UPDATE persons SET is_decedent = {false} WHERE id IN ({EXTRA_DECEDENTS})"
+    )
+    op.create_index(
+        'uq_persons_case_decedent',
+        'persons',
+        ['case_id'],
+        unique=True,
+        postgresql_where=sa.text('is_decedent'),
+        sqlite_where=sa.text('is_decedent'),
+    )
+
+    with op.batch_alter_table('cases') as batch_op:
+        batch_op.add_column(
+            sa.Column('decedent_person_id', sa.Integer(), nullable=True)
+        )
+        batch_op.create_foreign_key(
+            'fk_cases_decedent_person_id', 'persons',
+            ['decedent_person_id'], ['id'], ondelete='SET NULL',
+        )
+    op.execute(
+        """
+        UPDATE cases SET decedent_person_id = (
+            SELECT persons.id FROM persons
+            WHERE persons.case_id = cases.id AND persons.is_decedent
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('cases') as batch_op:
+        batch_op.drop_constraint('fk_cases_decedent_person_id', type_='foreignkey')
+        batch_op.drop_column('decedent_person_id')
+    op.drop_index('uq_persons_case_decedent', table_name='persons')
@@ -1,37 +1,100 @@
 """Inheritance Calculation API Endpoints"""
-from typing import Dict, Any
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Path,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 
-from app.auth import current_active_user
-from app.db import get_async_session
-from app.models import User, Case, Person, PersonRelationship
-from app.services.calculation_service import (
-    CalculationService,
-    get_calculation_service,
+from app.auth import current_active_user, current_token_user_id
+from app.config import settings
+from app.db import get_async_session, get_snapshot_session
+from app.models import User, Case, Person
+from app.schemas import (
+    ApportionmentRequest,
+    CalculationJobCreate,
+    CalculationPreviewRequest,
+    CalculationJobRead,
+    SuccessionRequest,
+    ValidationReport,
+)
+from app.services.apportionment import apportion_estate
+from app.services.calculation_inputs import (
+    CalculationInputs,
+    InvalidCalculationInput,
+    build_validation_report,
+    load_calculation_inputs,
+    preview_calculation_inputs,
+)
+from app.services.calculation_runner import (
+    CalculationCancelled,
+    CalculationError,
+    CalculationRunner,
+    CalculationTimeout,
+    get_calculation_runner,
+)
+from app.services.case_stats import record_calculation
+from app.services.case_revision import (
+    DEFAULT_CACHE_CONTROL,
+    case_etag,
+    etag_matches,
+    not_modified,
+    set_cache_headers,
+)
+from app.services.graph_export import (
+    EXPORT_MEDIA_TYPES,
+    PersonNode,
+    export_family_tree,
+    graph_export_cache,
+)
+from app.services.graph_index import load_graph_index
+from app.services.job_queue import (
+    CalculationJobQueue,
+    JobRecord,
+    get_calculation_job_queue,
 )
+from app.services.person_rows import PersonRow, load_person_rows
+from app.services.result_cache import calculation_result_cache
+from app.services.succession import ChainNode, SuccessionCycle, resolve_succession
+from app.services.tree_renderer import (
+    RenderedTree,
+    render_tree_lines,
+    tree_render_cache,
+)
+from app.services.validation_service import validate_family_tree
 
 router = APIRouter()
 
+# Calculations on inline trees, mounted outside /api/cases
+preview_router = APIRouter()
 
-@router.post("/{case_id}/calculate")
-async def calculate_inheritance(
-    case_id: int,
-    user: User = Depends(current_active_user),
-    session: AsyncSession = Depends(get_async_session),
-    calc_service: CalculationService = Depends(get_calculation_service),
-) -> Dict[str, Any]:
-    """
-    Calculate inheritance for a case
+# Seconds between keep-alive comments on job event streams
+SSE_HEARTBEAT_SECONDS = 15.0
 
-    Returns:
-        Dict with calculation results including heirs and their shares
-    """
-    # Verify case ownership
+
+async def _verify_case_ownership(
+    session: AsyncSession, case_id: int, user: User
+) -> Case:
+    """Get the case or raise 404 if it does not belong to the user"""
     result = await session.execute(
-        select(Case).where(and_(Case.id == case_id, Case.user_id == user.id))
+        select(Case).where(
+            and_(
+                Case.id == case_id,
+                Case.user_id == user.id,
+                Case.deleted_at.is_(None),
+            )
+        )
     )
     case = result.scalar_one_or_none()
 
@@ -39,122 +102,570 @@ async def calculate_inheritance(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Case not found"
         )
+    return case
 
-    # Get all persons
-    persons_result = await session.execute(
-        select(Person).where(Person.case_id == case_id)
-    )
-    persons = list(persons_result.scalars().all())
 
-    if not persons:
+async def _load_inputs(session: AsyncSession, case: Case) -> CalculationInputs:
+    """Load and validate calculation inputs, mapping failures to HTTP errors"""
+    try:
+        return await load_calculation_inputs(session, case.id, case.revision)
+    except InvalidCalculationInput as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+
+async def _run_calculation(
+    request: Request,
+    runner: CalculationRunner,
+    inputs: CalculationInputs,
+    include_tree: bool,
+) -> Dict[str, Any]:
+    """Run a calculation within the deadline, mapping failures to HTTP errors"""
+    try:
+        return await runner.run(
+            persons=inputs.persons,
+            decedent_id=inputs.decedent_id,
+            index=inputs.index,
+            include_tree=include_tree,
+            is_disconnected=request.is_disconnected,
+        )
+    except CalculationTimeout as e:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="No persons found in this case",
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=f"Calculation timed out: {str(e)}",
         )
-
-    # Find decedent
-    decedent = next((p for p in persons if p.is_decedent), None)
-    if not decedent:
+    except CalculationCancelled:
+        # Client is gone; the status code is only visible in access logs
+        raise HTTPException(status_code=499, detail="Client closed request")
+    except CalculationError as e:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="No decedent (被相続人) specified in this case",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Calculation failed: {str(e)}",
         )
 
-    # Get all relationships
-    rels_result = await session.execute(
-        select(PersonRelationship).where(PersonRelationship.case_id == case_id)
+
+async def _calculate_case(
+    request: Request,
+    session: AsyncSession,
+    runner: CalculationRunner,
+    case: Case,
+    include_tree: bool,
+) -> Dict[str, Any]:
+    """Get the calculation output of the case's current revision, computing if needed"""
+    output = calculation_result_cache.get(
+        case.id, case.revision, include_tree=include_tree
+    )
+    if output is None:
+        inputs = await _load_inputs(session, case)
+        # End the read snapshot: no transaction stays open while the worker
+        # runs, and the result is recorded at the default isolation level
+        await session.commit()
+        output = await _run_calculation(request, runner, inputs, include_tree)
+        calculation_result_cache.put(case.id, inputs.revision, None, output)
+        await record_calculation(session, case.id, inputs.revision, output["summary"])
+    return output
+
+
+def _check_not_modified(
+    request: Request, response: Response, case: Case, variant: str
+) -> Optional[Response]:
+    """Set validators on the response; return a 304 if the client copy is current"""
+    etag = case_etag(case.id, case.revision, case.updated_at, variant)
+    cache_control = DEFAULT_CACHE_CONTROL
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag, cache_control)
+    set_cache_headers(response, etag, cache_control)
+    return None
+
+
+@router.get("/{case_id}/validate", response_model=ValidationReport)
+async def validate_case(
+    case_id: int,
+    user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_snapshot_session),
+) -> ValidationReport:
+    """
+    Validate the family tree of a case
+
+    Returns:
+        ValidationReport with per-person / per-relationship errors and warnings
+    """
+    case = await _verify_case_ownership(session, case_id, user)
+
+    persons = await load_person_rows(session, case_id)
+    index = await load_graph_index(session, case_id, case.revision)
+
+    return build_validation_report(case_id, validate_family_tree(persons, index))
+
+
+@router.post("/{case_id}/calculate")
+async def calculate_inheritance(
+    case_id: int,
+    request: Request,
+    response: Response,
+    user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_snapshot_session),
+    runner: CalculationRunner = Depends(get_calculation_runner),
+) -> Dict[str, Any]:
+    """
+    Calculate inheritance for a case
+
+    Returns:
+        Dict with calculation results including heirs and their shares
+    """
+    case = await _verify_case_ownership(session, case_id, user)
+
+    # Calculate inheritance in a worker process (cached per case revision)
+    output = await _calculate_case(request, session, runner, case, include_tree=False)
+
+    set_cache_headers(
+        response,
+        case_etag(case.id, case.revision, case.updated_at, "calculation"),
+        DEFAULT_CACHE_CONTROL,
     )
-    relationships = list(rels_result.scalars().all())
+    return output["summary"]
 
-    # Calculate inheritance
+
+@preview_router.post("/preview")
+async def preview_calculation(
+    data: CalculationPreviewRequest,
+    request: Request,
+    user_id: int = Depends(current_token_user_id),
+    runner: CalculationRunner = Depends(get_calculation_runner),
+) -> Dict[str, Any]:
+    """
+    Calculate inheritance for an inline family tree without saving anything
+
+    No database or graph store I/O: the access token is only verified, and
+    the tree is validated and calculated in memory, so the endpoint scales
+    with CPU alone.
+
+    Returns:
+        Dict with calculation results, plus "ascii_tree" if include_tree
+    """
     try:
-        calc_result = calc_service.calculate_inheritance(
-            persons=persons,
-            relationships=relationships,
-            decedent_id=decedent.id,
+        inputs = preview_calculation_inputs(data)
+    except InvalidCalculationInput as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+    output = await _run_calculation(request, runner, inputs, data.include_tree)
+    if data.include_tree:
+        return {**output["summary"], "ascii_tree": output["ascii_tree"]}
+    return output["summary"]
+
+
+@router.get("/{case_id}/calculate")
+async def get_calculation_result(
+    case_id: int,
+    request: Request,
+    response: Response,
+    user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_snapshot_session),
+    runner: CalculationRunner = Depends(get_calculation_runner),
+) -> Dict[str, Any]:
+    """
+    Get the calculation result of a case, supporting If-None-Match
+
+    Returns 304 without loading persons or relationships when the case has
+    not changed since the client's copy.
+    """
+    case = await _verify_case_ownership(session, case_id, user)
+    unchanged = _check_not_modified(request, response, case, "calculation")
+    if unchanged is not None:
+        return unchanged
+
+    output = await _calculate_case(request, session, runner, case, include_tree=False)
+    return output["summary"]
+
+
+async def _render_tree(
+    request: Request,
+    session: AsyncSession,
+    runner: CalculationRunner,
+    case: Case,
+    mode: str,
+    depth: Optional[int],
+) -> RenderedTree:
+    """Get the rendered tree of the case's current revision, rendering it if needed"""
+    key = (case.id, case.revision, mode, depth)
+    rendered = tree_render_cache.get(key)
+    if rendered is not None:
+        return rendered
+
+    if mode == "full" and depth is None:
+        # Core library rendering, done in a worker process
+        output = await _calculate_case(
+            request, session, runner, case, include_tree=True
         )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Calculation failed: {str(e)}",
+        text = output["ascii_tree"]
+        rendered = RenderedTree(text.splitlines(), text)
+    else:
+        # Read labels and edges before calculating: a calculation commits the
+        # read snapshot, and later reads could see a newer revision
+        persons_result = await session.execute(
+            select(Person.id, Person.name, Person.is_alive).where(
+                Person.case_id == case.id
+            )
+        )
+        labels = {
+            person_id: name if is_alive else f"{name} (故)"
+            for person_id, name, is_alive in persons_result.all()
+        }
+        index = await load_graph_index(session, case.id, case.revision)
+        output = await _calculate_case(
+            request, session, runner, case, include_tree=False
+        )
+        summary = output["summary"]
+        heirs = {
+            int(heir["id"]): f"{heir['share_numerator']}/{heir['share_denominator']}"
+            for heir in summary["heirs"]
+        }
+        rendered = RenderedTree(
+            render_tree_lines(
+                index, labels, int(summary["decedent"]["id"]), heirs, mode, depth
+            )
         )
 
-    # Get summary
-    summary = calc_service.get_calculation_summary(calc_result)
-
-    return summary
+    tree_render_cache.put(key, rendered)
+    return rendered
 
 
 @router.get("/{case_id}/ascii-tree")
 async def get_ascii_tree(
     case_id: int,
+    request: Request,
+    response: Response,
+    mode: str = Query("full", pattern="^(full|heirs|collapsed)$"),
+    depth: Optional[int] = Query(None, ge=1),
+    stream: bool = False,
     user: User = Depends(current_active_user),
-    session: AsyncSession = Depends(get_async_session),
-    calc_service: CalculationService = Depends(get_calculation_service),
-) -> Dict[str, str]:
+    session: AsyncSession = Depends(get_snapshot_session),
+    runner: CalculationRunner = Depends(get_calculation_runner),
+):
     """
     Get ASCII family tree for a case
 
+    Args:
+        mode: "full", "heirs" (only branches leading to heirs) or
+            "collapsed" (branches without heirs folded into one line)
+        depth: Number of generations to expand around the decedent
+        stream: Send the tree as text/plain, line by line
+
     Returns:
-        Dict with ASCII tree string
+        Dict with ASCII tree string, or a text stream
     """
-    # Verify case ownership
-    result = await session.execute(
-        select(Case).where(and_(Case.id == case_id, Case.user_id == user.id))
+    case = await _verify_case_ownership(session, case_id, user)
+    unchanged = _check_not_modified(
+        request, response, case, f"ascii-tree:{mode}:{depth}"
     )
-    case = result.scalar_one_or_none()
+    if unchanged is not None:
+        return unchanged
 
-    if not case:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Case not found"
+    # Rendered once per case revision and mode, then shared by all viewers
+    rendered = await _render_tree(request, session, runner, case, mode, depth)
+
+    if stream:
+        return StreamingResponse(
+            (f"{line}\n" for line in rendered.lines),
+            media_type="text/plain; charset=utf-8",
+            headers={
+                "ETag": response.headers["etag"],
+                "Cache-Control": response.headers["cache-control"],
+            },
         )
+    return {"ascii_tree": rendered.text}
 
-    # Get all persons
-    persons_result = await session.execute(
-        select(Person).where(Person.case_id == case_id)
-    )
-    persons = list(persons_result.scalars().all())
 
-    if not persons:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="No persons found in this case",
+@router.get("/{case_id}/export/{fmt}")
+async def export_family_tree_graph(
+    case_id: int,
+    request: Request,
+    response: Response,
+    fmt: str = Path(..., pattern="^(dot|mermaid|svg)$"),
+    user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_snapshot_session),
+    runner: CalculationRunner = Depends(get_calculation_runner),
+):
+    """
+    Export the family tree as Graphviz DOT, Mermaid or SVG
+
+    Persons are laid out by generation on the server, with heirs and their
+    shares highlighted. Exports are cached per case revision.
+    """
+    case = await _verify_case_ownership(session, case_id, user)
+    unchanged = _check_not_modified(request, response, case, f"export:{fmt}")
+    if unchanged is not None:
+        return unchanged
+    headers = {
+        "ETag": response.headers["etag"],
+        "Cache-Control": response.headers["cache-control"],
+    }
+
+    key = (case.id, case.revision, fmt)
+    output = graph_export_cache.get(key)
+    if output is None:
+        index = await load_graph_index(session, case.id, case.revision)
+        if index.person_count > settings.graph_export_max_persons:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=(
+                    f"Case has {index.person_count} persons; exports are limited "
+                    f"to {settings.graph_export_max_persons}"
+                ),
+            )
+        # Persons are read from the snapshot before the calculation commits it
+        persons_result = await session.execute(
+            select(Person.id, Person.name, Person.is_decedent).where(
+                Person.case_id == case.id
+            )
         )
+        persons = persons_result.all()
+        summary = (
+            await _calculate_case(request, session, runner, case, include_tree=False)
+        )["summary"]
+        shares = {
+            int(heir["id"]): f"{heir['share_numerator']}/{heir['share_denominator']}"
+            for heir in summary["heirs"]
+        }
+        nodes = {
+            person_id: PersonNode(name, is_decedent, shares.get(person_id))
+            for person_id, name, is_decedent in persons
+        }
+        output = export_family_tree(index, nodes, fmt)
+        graph_export_cache.put(key, output)
+
+    return Response(content=output, media_type=EXPORT_MEDIA_TYPES[fmt], headers=headers)
+
+
+@router.post("/{case_id}/calculate/apportion")
+async def apportion_estate_value(
+    case_id: int,
+    apportionment_data: ApportionmentRequest,
+    request: Request,
+    user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_snapshot_session),
+    runner: CalculationRunner = Depends(get_calculation_runner),
+) -> Dict[str, Any]:
+    """
+    Apportion an estate value, or a list of assets, across the heirs
+
+    Every asset is split with exact integer arithmetic on the shares'
+    common denominator and rounded to whole yen by largest remainder, so
+    each split adds up to the asset value.
 
-    # Find decedent
-    decedent = next((p for p in persons if p.is_decedent), None)
-    if not decedent:
+    Returns:
+        Dict with per-heir totals and the split of each asset
+    """
+    if apportionment_data.assets is not None:
+        assets = [(asset.name, asset.value) for asset in apportionment_data.assets]
+    elif apportionment_data.estate_value is not None:
+        assets = [("estate", apportionment_data.estate_value)]
+    else:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="No decedent (被相続人) specified in this case",
+            detail="Either estate_value or assets is required",
         )
 
-    # Get all relationships
-    rels_result = await session.execute(
-        select(PersonRelationship).where(PersonRelationship.case_id == case_id)
+    case = await _verify_case_ownership(session, case_id, user)
+    output = await _calculate_case(request, session, runner, case, include_tree=False)
+
+    return {"case_id": case_id, **apportion_estate(output["summary"]["heirs"], assets)}
+
+
+@router.post("/{case_id}/calculate/succession")
+async def calculate_succession(
+    case_id: int,
+    request: Request,
+    chain_data: SuccessionRequest = SuccessionRequest(),
+    user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_snapshot_session),
+    runner: CalculationRunner = Depends(get_calculation_runner),
+) -> Dict[str, Any]:
+    """
+    Calculate successive inheritance (数次相続)
+
+    Heirs who died after their decedent (or the given successor_ids) pass
+    their share on through their own inheritance, calculated in the same
+    case or, for linked heirs, in the linked case. Each decedent is
+    calculated once and cached per case revision.
+
+    Returns:
+        Dict with the chain steps and the combined share of each final heir
+    """
+    cases: Dict[int, Case] = {
+        case_id: await _verify_case_ownership(session, case_id, user)
+    }
+    inputs: Dict[int, CalculationInputs] = {}
+    persons: Dict[int, Dict[int, PersonRow]] = {}
+    links = {link.person_id: link.case_id for link in chain_data.links}
+    successor_ids = (
+        set(chain_data.successor_ids) if chain_data.successor_ids is not None else None
     )
-    relationships = list(rels_result.scalars().all())
 
-    # Calculate inheritance first
-    try:
-        calc_result = calc_service.calculate_inheritance(
-            persons=persons,
-            relationships=relationships,
-            decedent_id=decedent.id,
+    # Every case the chain can reach is the root or a linked case: load all
+    # of their inputs from the snapshot, then end it before any calculation
+    for chain_case_id in (case_id, *links.values()):
+        if chain_case_id in inputs:
+            continue
+        if chain_case_id not in cases:
+            cases[chain_case_id] = await _verify_case_ownership(
+                session, chain_case_id, user
+            )
+        inputs[chain_case_id] = await _load_inputs(session, cases[chain_case_id])
+        persons[chain_case_id] = {p.id: p for p in inputs[chain_case_id].persons}
+    await session.commit()
+
+    async def summary_of(node: ChainNode) -> Dict[str, Any]:
+        chain_case_id, decedent_id = node
+        case_data = inputs[chain_case_id]
+        # The case's own decedent shares its cache entry with /calculate
+        cache_key = None if decedent_id == case_data.decedent_id else decedent_id
+        output = calculation_result_cache.get(
+            chain_case_id, case_data.revision, cache_key
         )
-    except Exception as e:
+        if output is None:
+            output = await _run_calculation(
+                request, runner, case_data._replace(decedent_id=decedent_id), False
+            )
+            calculation_result_cache.put(
+                chain_case_id, case_data.revision, cache_key, output
+            )
+        return output["summary"]
+
+    async def successor_of(node: ChainNode, heir_id: int) -> Optional[ChainNode]:
+        if heir_id in links:
+            linked_case_id = links[heir_id]
+            return linked_case_id, inputs[linked_case_id].decedent_id
+        case_persons = persons[node[0]]
+        heir = case_persons.get(heir_id)
+        if heir is None or heir.is_alive:
+            return None
+        if successor_ids is not None:
+            return (node[0], heir_id) if heir_id in successor_ids else None
+        decedent = case_persons[node[1]]
+        if (
+            heir.death_date is not None
+            and decedent.death_date is not None
+            and heir.death_date > decedent.death_date
+        ):
+            return node[0], heir_id
+        return None
+
+    root = (case_id, inputs[case_id].decedent_id)
+    try:
+        return await resolve_succession(root, summary_of, successor_of)
+    except SuccessionCycle as e:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Calculation failed: {str(e)}",
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
         )
 
-    # Generate ASCII tree
-    try:
-        ascii_tree = calc_service.generate_ascii_tree(calc_result)
-    except Exception as e:
+
+# ==================== Calculation Jobs ====================
+
+
+async def _get_owned_job(
+    queue: CalculationJobQueue, case_id: int, job_id: str, user: User
+) -> JobRecord:
+    job = await queue.get(job_id)
+    if not job or job.case_id != case_id or job.user_id != user.id:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"ASCII tree generation failed: {str(e)}",
+            status_code=status.HTTP_404_NOT_FOUND, detail="Job not found"
         )
+    return job
+
 
-    return {"ascii_tree": ascii_tree}
+@router.post(
+    "/{case_id}/calculate/jobs",
+    response_model=CalculationJobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def create_calculation_job(
+    case_id: int,
+    job_data: CalculationJobCreate = CalculationJobCreate(),
+    user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_async_session),
+    queue: CalculationJobQueue = Depends(get_calculation_job_queue),
+):
+    """
+    Queue an inheritance calculation and return immediately
+
+    Poll GET /{case_id}/calculate/jobs/{job_id} or subscribe to
+    GET /{case_id}/calculate/jobs/{job_id}/events for progress.
+    """
+    await _verify_case_ownership(session, case_id, user)
+    job = await queue.submit(
+        case_id=case_id, user_id=user.id, include_tree=job_data.include_tree
+    )
+    return job.to_dict()
+
+
+@router.get("/{case_id}/calculate/jobs/{job_id}", response_model=CalculationJobRead)
+async def get_calculation_job(
+    case_id: int,
+    job_id: str,
+    user: User = Depends(current_active_user),
+    queue: CalculationJobQueue = Depends(get_calculation_job_queue),
+):
+    """Get status and, once finished, the result of a calculation job"""
+    job = await _get_owned_job(queue, case_id, job_id, user)
+    return job.to_dict()
+
+
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+@router.get("/{case_id}/calculate/jobs/{job_id}/events")
+async def stream_calculation_job(
+    case_id: int,
+    job_id: str,
+    request: Request,
+    user: User = Depends(current_active_user),
+    queue: CalculationJobQueue = Depends(get_calculation_job_queue),
+):
+    """
+    Server-Sent Events stream of a calculation job
+
+    Emits a "progress" event on every status/phase change (loading,
+    converting, calculating, rendering) and a final "done" event.
+    """
+    job = await _get_owned_job(queue, case_id, job_id, user)
+
+    async def events() -> AsyncIterator[str]:
+        listener = queue.subscribe(job_id)
+        try:
+            state = job.to_dict()
+            while True:
+                finished = state["status"] in ("succeeded", "failed")
+                yield _sse_event("done" if finished else "progress", state)
+                if finished:
+                    return
+
+                while True:
+                    try:
+                        new_state = await asyncio.wait_for(
+                            listener.get(), SSE_HEARTBEAT_SECONDS
+                        )
+                    except asyncio.TimeoutError:
+                        if await request.is_disconnected():
+                            return
+                        # The job may be running in another process (durable store)
+                        latest = await queue.get(job_id)
+                        if (
+                            latest
+                            and latest.updated_at.isoformat() != state["updated_at"]
+                        ):
+                            new_state = latest.to_dict()
+                        else:
+                            yield ": keep-alive\n\n"
+                            continue
+                    break
+                state = new_state
+        finally:
+            queue.unsubscribe(job_id, listener)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,42 +1,130 @@
 """Case Management API Endpoints"""
-from typing import List
-
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import String, select, and_, cast, delete, func, insert, literal, update
+from sqlalchemy.orm import aliased
 
 from app.auth import current_active_user
-from app.db import get_async_session
-from app.models import User, Case, Person, PersonRelationship
+from app.db import get_async_session, get_snapshot_session
+from app.models import User, Case, CaseStatus, Person, PersonRelationship
 from app.schemas import (
     CaseRead,
     CaseCreate,
     CaseUpdate,
     CaseWithDetails,
+    CaseClone,
     PersonRead,
     PersonCreate,
     PersonUpdate,
+    PersonBulkUpdate,
+    BulkDelete,
+    PersonRelatives,
+    SiblingRef,
     RelationshipRead,
     RelationshipCreate,
     RelationshipUpdate,
 )
-from app.services import Neo4jService
-from app.services.neo4j_service import get_neo4j_service
+from app.search_text import normalize_search_text
+from app.services.case_lock import lock_case
+from app.services.case_purge import case_purger
+from app.services.case_stats import recounted_stats
+from app.services.case_views import load_case_view, parse_field_selection
+from app.services.case_revision import (
+    DEFAULT_CACHE_CONTROL,
+    case_etag,
+    check_if_match,
+    etag_matches,
+    make_etag,
+    not_modified,
+    set_cache_headers,
+    touch_case,
+)
+from app.services.graph_store import GraphStore, get_graph_store
+from app.services.graph_index import (
+    CaseGraphIndex,
+    graph_index_cache,
+    load_graph_index,
+)
 
 router = APIRouter()
 
 
+async def _get_case_for_write(
+    session: AsyncSession, case_id: int, user: User, if_match: Optional[str]
+) -> Case:
+    """
+    Lock a case for the current transaction and get it for a write
+
+    Raises 404 if the user has no such case and 412 if If-Match names an
+    older version of it. Concurrent writes to the case wait for the commit.
+    """
+    await lock_case(session, case_id)
+    result = await session.execute(
+        select(Case).where(
+            and_(
+                Case.id == case_id,
+                Case.user_id == user.id,
+                Case.deleted_at.is_(None),
+            )
+        )
+    )
+    case = result.scalar_one_or_none()
+
+    if not case:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Case not found"
+        )
+    check_if_match(if_match, case)
+    return case
+
+
 # ==================== Case CRUD ====================
 
 
 @router.get("/", response_model=List[CaseRead])
 async def list_cases(
+    request: Request,
+    response: Response,
     user: User = Depends(current_active_user),
     session: AsyncSession = Depends(get_async_session),
 ):
     """List all cases for current user"""
+    # Cheap aggregate over the user_id index: any case write changes it
+    stamp = await session.execute(
+        select(
+            func.count(Case.id),
+            func.max(Case.updated_at),
+            func.coalesce(func.sum(Case.revision), 0),
+            # Calculations change last_calculated_at but not the revision
+            func.max(Case.last_calculated_at),
+        ).where(and_(Case.user_id == user.id, Case.deleted_at.is_(None)))
+    )
+    count, last_updated, revisions, last_calculated = stamp.one()
+    etag = make_etag(
+        "cases", user.id, count, last_updated, revisions, last_calculated
+    )
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag, DEFAULT_CACHE_CONTROL)
+    set_cache_headers(response, etag, DEFAULT_CACHE_CONTROL)
+
     result = await session.execute(
-        select(Case).where(Case.user_id == user.id).order_by(Case.updated_at.desc())
+        select(Case)
+        .where(and_(Case.user_id == user.id, Case.deleted_at.is_(None)))
+        .order_by(Case.updated_at.desc())
     )
     cases = result.scalars().all()
     return cases
@@ -59,12 +147,42 @@ async def create_case(
 @router.get("/{case_id}", response_model=CaseWithDetails)
 async def get_case(
     case_id: int,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(
+        None, description="Comma-separated person / relationship fields to return"
+    ),
+    exclude: Optional[str] = Query(
+        None, description="Comma-separated fields to leave out"
+    ),
+    view: str = Query("full", pattern="^(full|graph)$"),
     user: User = Depends(current_active_user),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_snapshot_session),
 ):
-    """Get case by ID with persons and relationships"""
+    """
+    Get case by ID with persons and relationships
+
+    fields= / exclude= name person and relationship fields, bare (both) or
+    as "persons.<field>" / "relationships.<field>". view=graph returns
+    persons as arrays and relationships as [from, to, ...] indices into the
+    persons array. Each representation has its own ETag; If-Match takes
+    the ETag of the full representation (or of a write response).
+    """
+    reduced = view != "full" or fields is not None or exclude is not None
+    if reduced:
+        try:
+            selection = parse_field_selection(fields, exclude, view)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
     result = await session.execute(
-        select(Case).where(and_(Case.id == case_id, Case.user_id == user.id))
+        select(Case).where(
+            and_(
+                Case.id == case_id,
+                Case.user_id == user.id,
+                Case.deleted_at.is_(None),
+            )
+        )
     )
     case = result.scalar_one_or_none()
 
@@ -73,6 +191,39 @@ async def get_case(
             status_code=status.HTTP_404_NOT_FOUND, detail="Case not found"
         )
 
+    # Conditional GET: answer from the case row alone
+    variant = "case"
+    if reduced:
+        variant = ":".join(
+            (
+                "case",
+                view,
+                ",".join(selection.persons),
+                ",".join(selection.relationships),
+            )
+        )
+    etag = case_etag(
+        case.id,
+        case.revision,
+        case.updated_at,
+        variant,
+        last_calculated_at=case.last_calculated_at,
+    )
+    cache_control = DEFAULT_CACHE_CONTROL
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag, cache_control)
+    set_cache_headers(response, etag, cache_control)
+
+    if reduced:
+        # Only the selected columns are read, and rows skip model validation
+        return JSONResponse(
+            {
+                **CaseRead.model_validate(case).model_dump(mode="json"),
+                **await load_case_view(session, case_id, view, selection),
+            },
+            headers={"ETag": etag, "Cache-Control": cache_control},
+        )
+
     # Get persons
     persons_result = await session.execute(
         select(Person).where(Person.case_id == case_id)
@@ -96,86 +247,320 @@ async def get_case(
 async def update_case(
     case_id: int,
     case_data: CaseUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     user: User = Depends(current_active_user),
     session: AsyncSession = Depends(get_async_session),
 ):
     """Update case"""
-    result = await session.execute(
-        select(Case).where(and_(Case.id == case_id, Case.user_id == user.id))
-    )
-    case = result.scalar_one_or_none()
-
-    if not case:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Case not found"
-        )
+    case = await _get_case_for_write(session, case_id, user, if_match)
 
     update_data = case_data.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(case, key, value)
+    case.revision += 1
 
     await session.commit()
     await session.refresh(case)
+    graph_index_cache.apply(case_id, lambda index: None, case.revision)
+    response.headers["ETag"] = case_etag(
+        case.id,
+        case.revision,
+        case.updated_at,
+        last_calculated_at=case.last_calculated_at,
+    )
     return case
 
 
 @router.delete("/{case_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_case(
     case_id: int,
+    if_match: Optional[str] = Header(None),
     user: User = Depends(current_active_user),
     session: AsyncSession = Depends(get_async_session),
-    neo4j: Neo4jService = Depends(get_neo4j_service),
 ):
-    """Delete case and all related data"""
+    """
+    Delete case and all related data
+
+    The case is soft-deleted immediately; its persons, relationships and
+    Neo4j nodes are purged in batches in the background.
+    """
+    case = await _get_case_for_write(session, case_id, user, if_match)
+
+    case.deleted_at = datetime.utcnow()
+    await session.commit()
+
+    graph_index_cache.invalidate(case_id)
+    case_purger.schedule(case_id)
+
+
+@router.post(
+    "/{case_id}/clone", response_model=CaseRead, status_code=status.HTTP_201_CREATED
+)
+async def clone_case(
+    case_id: int,
+    clone_data: CaseClone,
+    user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_async_session),
+    graph_store: GraphStore = Depends(get_graph_store),
+):
+    """
+    Copy a case with all persons and relationships
+
+    Rows are copied with INSERT ... SELECT statements, so the number of
+    database round trips does not depend on the size of the family tree.
+    Overlays (new decedent, death date) are applied to the copy only.
+    """
     result = await session.execute(
-        select(Case).where(and_(Case.id == case_id, Case.user_id == user.id))
+        select(Case).where(
+            and_(
+                Case.id == case_id,
+                Case.user_id == user.id,
+                Case.deleted_at.is_(None),
+            )
+        )
     )
-    case = result.scalar_one_or_none()
+    source = result.scalar_one_or_none()
 
-    if not case:
+    if not source:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Case not found"
         )
 
-    # Delete from Neo4j
-    await neo4j.clear_case_graph(case_id)
+    if clone_data.decedent_person_id is not None:
+        found = await session.execute(
+            select(Person.id).where(
+                and_(
+                    Person.case_id == case_id,
+                    Person.id == clone_data.decedent_person_id,
+                )
+            )
+        )
+        if found.scalar_one_or_none() is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Person not found"
+            )
 
-    # Delete from PostgreSQL (cascade will handle persons and relationships)
-    await session.delete(case)
+    case = Case(
+        title=clone_data.title or f"{source.title} (copy)",
+        description=(
+            clone_data.description
+            if clone_data.description is not None
+            else source.description
+        ),
+        status=CaseStatus.DRAFT,
+        user_id=user.id,
+    )
+    session.add(case)
+    await session.flush()
+    now = datetime.utcnow()
+
+    # Copy persons; the source ID is parked in neo4j_node_id to map IDs
+    source_key = cast(Person.id, String)
+    await session.execute(
+        insert(Person).from_select(
+            [
+                "case_id", "name", "name_search", "is_alive", "death_date",
+                "birth_date", "gender", "is_decedent", "is_spouse", "neo4j_node_id",
+                "created_at", "updated_at",
+            ],
+            select(
+                literal(case.id), Person.name, Person.name_search, Person.is_alive,
+                Person.death_date, Person.birth_date, Person.gender,
+                Person.is_decedent, Person.is_spouse, source_key, literal(now),
+                literal(now),
+            )
+            .where(Person.case_id == case_id)
+            .order_by(Person.id),
+        )
+    )
+
+    # Overlays; the copied decedent is unset before the new one is set, so
+    # the one-decedent-per-case index never sees two of them
+    if clone_data.decedent_person_id is not None:
+        await session.execute(
+            update(Person)
+            .where(and_(Person.case_id == case.id, Person.is_decedent.is_(True)))
+            .values(is_decedent=False)
+            .execution_options(synchronize_session=False)
+        )
+        overlay: Dict[str, Any] = {"is_decedent": True}
+        if clone_data.decedent_death_date is not None:
+            overlay.update(is_alive=False, death_date=clone_data.decedent_death_date)
+        await session.execute(
+            update(Person)
+            .where(
+                and_(
+                    Person.case_id == case.id,
+                    Person.neo4j_node_id == str(clone_data.decedent_person_id),
+                )
+            )
+            .values(**overlay)
+            .execution_options(synchronize_session=False)
+        )
+
+    # Copy relationships, remapping both ends through the parked source IDs
+    source_rel = aliased(PersonRelationship)
+    new_from = aliased(Person)
+    new_to = aliased(Person)
+    await session.execute(
+        insert(PersonRelationship).from_select(
+            [
+                "case_id", "from_person_id", "to_person_id", "relationship_type",
+                "is_biological", "is_adopted", "blood_type", "created_at", "updated_at",
+            ],
+            select(
+                literal(case.id), new_from.id, new_to.id, source_rel.relationship_type,
+                source_rel.is_biological, source_rel.is_adopted, source_rel.blood_type,
+                literal(now), literal(now),
+            )
+            .join(
+                new_from,
+                and_(
+                    new_from.case_id == case.id,
+                    new_from.neo4j_node_id == cast(source_rel.from_person_id, String),
+                ),
+            )
+            .join(
+                new_to,
+                and_(
+                    new_to.case_id == case.id,
+                    new_to.neo4j_node_id == cast(source_rel.to_person_id, String),
+                ),
+            )
+            .where(source_rel.case_id == case_id),
+        )
+    )
+    # The parked source IDs are not graph store IDs; clear them
+    await session.execute(
+        update(Person)
+        .where(Person.case_id == case.id)
+        .values(neo4j_node_id=None)
+        .execution_options(synchronize_session=False)
+    )
+
+    # Rebuild the graph store subgraph in one write transaction
+    persons_result = await session.execute(
+        select(
+            Person.id, Person.name, Person.is_alive, Person.death_date,
+            Person.birth_date, Person.gender, Person.is_decedent, Person.is_spouse,
+        ).where(Person.case_id == case.id)
+    )
+    rels_result = await session.execute(
+        select(
+            PersonRelationship.id, PersonRelationship.from_person_id,
+            PersonRelationship.to_person_id, PersonRelationship.relationship_type,
+            PersonRelationship.is_biological, PersonRelationship.is_adopted,
+            PersonRelationship.blood_type,
+        ).where(PersonRelationship.case_id == case.id)
+    )
+    node_ids, rel_ids = await graph_store.create_case_subgraph(
+        case_id=case.id,
+        persons=[
+            {
+                "person_id": row.id,
+                "properties": {
+                    "name": row.name,
+                    "is_alive": row.is_alive,
+                    "death_date": (
+                        row.death_date.isoformat() if row.death_date else None
+                    ),
+                    "birth_date": (
+                        row.birth_date.isoformat() if row.birth_date else None
+                    ),
+                    "gender": row.gender,
+                    "is_decedent": row.is_decedent,
+                    "is_spouse": row.is_spouse,
+                },
+            }
+            for row in persons_result
+        ],
+        relationships=[
+            {
+                "relationship_id": row.id,
+                "from_person_id": row.from_person_id,
+                "to_person_id": row.to_person_id,
+                "type": row.relationship_type.value.upper(),
+                "properties": {
+                    "is_biological": row.is_biological,
+                    "is_adopted": row.is_adopted,
+                    "blood_type": row.blood_type,
+                },
+            }
+            for row in rels_result
+        ],
+    )
+
+    await session.execute(
+        update(Case)
+        .where(Case.id == case.id)
+        .values(**recounted_stats(case.id))
+        .execution_options(synchronize_session=False)
+    )
+
+    # Store the Neo4j IDs with bulk updates
+    if node_ids:
+        await session.execute(
+            update(Person),
+            [{"id": pid, "neo4j_node_id": nid} for pid, nid in node_ids.items()],
+        )
+    if rel_ids:
+        await session.execute(
+            update(PersonRelationship),
+            [
+                {"id": rid, "neo4j_relationship_id": nid}
+                for rid, nid in rel_ids.items()
+            ],
+        )
     await session.commit()
+    await session.refresh(case)
+
+    return case
 
 
 # ==================== Person CRUD ====================
 
 
+def _decedent_conflict() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Case already has a decedent (被相続人); unset it first",
+    )
+
+
+async def _flush_or_conflict(session: AsyncSession) -> None:
+    """Flush person changes; the one-decedent-per-case index maps to 409"""
+    try:
+        await session.flush()
+    except IntegrityError:
+        await session.rollback()
+        raise _decedent_conflict()
+
+
 @router.post("/{case_id}/persons", response_model=PersonRead, status_code=status.HTTP_201_CREATED)
 async def create_person(
     case_id: int,
     person_data: PersonCreate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     user: User = Depends(current_active_user),
     session: AsyncSession = Depends(get_async_session),
-    neo4j: Neo4jService = Depends(get_neo4j_service),
+    graph_store: GraphStore = Depends(get_graph_store),
 ):
     """Create a person in a case"""
-    # Verify case ownership
-    result = await session.execute(
-        select(Case).where(and_(Case.id == case_id, Case.user_id == user.id))
-    )
-    case = result.scalar_one_or_none()
-
-    if not case:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Case not found"
-        )
+    await _get_case_for_write(session, case_id, user, if_match)
 
     # Create person in PostgreSQL
     person = Person(**person_data.model_dump(), case_id=case_id)
     session.add(person)
-    await session.commit()
-    await session.refresh(person)
+    await _flush_or_conflict(session)
+    revision = await touch_case(
+        session, case_id, persons=1, decedent=person.is_decedent, response=response
+    )
 
-    # Create node in Neo4j
-    node_id = await neo4j.create_person_node(
+    # Create node in the graph store, in the same locked transaction
+    node_id = await graph_store.create_person_node(
+        case_id=case_id,
         person_id=person.id,
         name=person.name,
         is_alive=person.is_alive,
@@ -186,10 +571,14 @@ async def create_person(
         is_spouse=person.is_spouse,
     )
 
-    # Update with Neo4j node ID
-    person.neo4j_node_id = node_id
+    # Store the Neo4j node ID (the in-process store issues none)
+    if node_id:
+        person.neo4j_node_id = node_id
     await session.commit()
     await session.refresh(person)
+    graph_index_cache.apply(
+        case_id, lambda index: index.add_person(person.id), revision
+    )
 
     return person
 
@@ -199,21 +588,14 @@ async def update_person(
     case_id: int,
     person_id: int,
     person_data: PersonUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     user: User = Depends(current_active_user),
     session: AsyncSession = Depends(get_async_session),
-    neo4j: Neo4jService = Depends(get_neo4j_service),
+    graph_store: GraphStore = Depends(get_graph_store),
 ):
     """Update a person"""
-    # Verify case ownership
-    result = await session.execute(
-        select(Case).where(and_(Case.id == case_id, Case.user_id == user.id))
-    )
-    case = result.scalar_one_or_none()
-
-    if not case:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Case not found"
-        )
+    await _get_case_for_write(session, case_id, user, if_match)
 
     # Get person
     person_result = await session.execute(
@@ -232,14 +614,20 @@ async def update_person(
     update_data = person_data.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(person, key, value)
+    await _flush_or_conflict(session)
+    revision = await touch_case(
+        session, case_id, decedent="is_decedent" in update_data, response=response
+    )
+
+    # Update the graph store before committing, while the case is locked
+    if person.neo4j_node_id:
+        await graph_store.update_person_node(person.neo4j_node_id, **update_data)
 
     await session.commit()
+    # Structure is unchanged; only keep the cached index's revision current
+    graph_index_cache.apply(case_id, lambda index: None, revision)
     await session.refresh(person)
 
-    # Update Neo4j
-    if person.neo4j_node_id:
-        await neo4j.update_person_node(person.neo4j_node_id, **update_data)
-
     return person
 
 
@@ -247,21 +635,14 @@ async def update_person(
 async def delete_person(
     case_id: int,
     person_id: int,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     user: User = Depends(current_active_user),
     session: AsyncSession = Depends(get_async_session),
-    neo4j: Neo4jService = Depends(get_neo4j_service),
+    graph_store: GraphStore = Depends(get_graph_store),
 ):
     """Delete a person"""
-    # Verify case ownership
-    result = await session.execute(
-        select(Case).where(and_(Case.id == case_id, Case.user_id == user.id))
-    )
-    case = result.scalar_one_or_none()
-
-    if not case:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Case not found"
-        )
+    await _get_case_for_write(session, case_id, user, if_match)
 
     # Get person
     person_result = await session.execute(
@@ -276,34 +657,186 @@ async def delete_person(
             status_code=status.HTTP_404_NOT_FOUND, detail="Person not found"
         )
 
-    # Delete from Neo4j
+    # Delete from the graph store
     if person.neo4j_node_id:
-        await neo4j.delete_person_node(person.neo4j_node_id)
+        await graph_store.delete_person_node(person.neo4j_node_id)
 
-    # Delete from PostgreSQL
+    # Delete from PostgreSQL (cascade will handle relationships)
     await session.delete(person)
+    # Relationships of the person go with it (cascade), so recount
+    revision = await touch_case(session, case_id, recount=True, response=response)
     await session.commit()
+    graph_index_cache.apply(
+        case_id, lambda index: index.remove_person(person_id), revision
+    )
 
 
-# ==================== Relationship CRUD ====================
+# ==================== Bulk Person Operations ====================
 
 
-@router.post(
-    "/{case_id}/relationships",
-    response_model=RelationshipRead,
-    status_code=status.HTTP_201_CREATED,
-)
-async def create_relationship(
+def _reject_duplicate_ids(ids: List[int]) -> None:
+    if len(set(ids)) != len(ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Duplicate IDs in request"
+        )
+
+
+def _missing_ids(requested: List[int], found: Dict[int, Any]) -> None:
+    missing = [i for i in requested if i not in found]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"message": "Not found in this case", "ids": missing},
+        )
+
+
+@router.patch("/{case_id}/persons", response_model=List[PersonRead])
+async def bulk_update_persons(
     case_id: int,
-    relationship_data: RelationshipCreate,
+    bulk_data: PersonBulkUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     user: User = Depends(current_active_user),
     session: AsyncSession = Depends(get_async_session),
-    neo4j: Neo4jService = Depends(get_neo4j_service),
+    graph_store: GraphStore = Depends(get_graph_store),
 ):
-    """Create a relationship between persons"""
+    """
+    Update many persons in one transaction
+
+    Patches with identical changes are applied with a single UPDATE.
+    """
+    await _get_case_for_write(session, case_id, user, if_match)
+
+    ids = [item.id for item in bulk_data.items]
+    _reject_duplicate_ids(ids)
+
+    # Verify all persons belong to this case
+    node_result = await session.execute(
+        select(Person.id, Person.neo4j_node_id).where(
+            and_(Person.case_id == case_id, Person.id.in_(ids))
+        )
+    )
+    node_ids = dict(node_result.all())
+    _missing_ids(ids, node_ids)
+
+    # Group identical patches so each distinct change is one UPDATE
+    groups: Dict[tuple, List[int]] = {}
+    changes_by_key: Dict[tuple, Dict[str, Any]] = {}
+    for item in bulk_data.items:
+        changes = item.model_dump(exclude_unset=True, exclude={"id"})
+        if not changes:
+            continue
+        key = tuple(sorted(changes.items(), key=lambda kv: kv[0]))
+        groups.setdefault(key, []).append(item.id)
+        if "name" in changes:
+            # Core UPDATEs bypass the model validator
+            changes["name_search"] = normalize_search_text(changes["name"])
+        changes_by_key[key] = changes
+
+    now = datetime.utcnow()
+    # Unset decedents before setting one, so moving the flag in one request
+    # does not trip the one-decedent-per-case index
+    ordered = sorted(
+        groups.items(), key=lambda kv: changes_by_key[kv[0]].get("is_decedent") is True
+    )
+    try:
+        for key, group_ids in ordered:
+            await session.execute(
+                update(Person)
+                .where(and_(Person.case_id == case_id, Person.id.in_(group_ids)))
+                .values(**changes_by_key[key], updated_at=now)
+                .execution_options(synchronize_session=False)
+            )
+    except IntegrityError:
+        await session.rollback()
+        raise _decedent_conflict()
+    revision = await touch_case(
+        session,
+        case_id,
+        decedent=any("is_decedent" in changes for changes in changes_by_key.values()),
+        response=response,
+    )
+
+    # Update the graph store with a single UNWIND query, before committing
+    await graph_store.update_person_nodes(
+        [
+            {
+                "node_id": node_ids[item.id],
+                "properties": item.model_dump(exclude_unset=True, exclude={"id"}),
+            }
+            for item in bulk_data.items
+            if node_ids[item.id]
+        ]
+    )
+    await session.commit()
+    graph_index_cache.apply(case_id, lambda index: None, revision)
+
+    persons_result = await session.execute(
+        select(Person).where(Person.id.in_(ids)).order_by(Person.id)
+    )
+    return persons_result.scalars().all()
+
+
+@router.post("/{case_id}/persons/bulk-delete", status_code=status.HTTP_204_NO_CONTENT)
+async def bulk_delete_persons(
+    case_id: int,
+    bulk_data: BulkDelete,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_async_session),
+    graph_store: GraphStore = Depends(get_graph_store),
+):
+    """Delete many persons (and their relationships) in one transaction"""
+    await _get_case_for_write(session, case_id, user, if_match)
+
+    ids = bulk_data.ids
+    _reject_duplicate_ids(ids)
+
+    node_result = await session.execute(
+        select(Person.id, Person.neo4j_node_id).where(
+            and_(Person.case_id == case_id, Person.id.in_(ids))
+        )
+    )
+    node_ids = dict(node_result.all())
+    _missing_ids(ids, node_ids)
+
+    # Delete from the graph store with a single UNWIND query
+    await graph_store.delete_person_nodes([n for n in node_ids.values() if n])
+
+    # Delete from PostgreSQL (cascade will handle relationships)
+    await session.execute(
+        delete(Person)
+        .where(and_(Person.case_id == case_id, Person.id.in_(ids)))
+        .execution_options(synchronize_session=False)
+    )
+    revision = await touch_case(session, case_id, recount=True, response=response)
+    await session.commit()
+
+    def remove_all(index: CaseGraphIndex) -> None:
+        for person_id in ids:
+            index.remove_person(person_id)
+
+    graph_index_cache.apply(case_id, remove_all, revision)
+
+
+@router.get("/{case_id}/persons/{person_id}/relatives", response_model=PersonRelatives)
+async def get_person_relatives(
+    case_id: int,
+    person_id: int,
+    user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_snapshot_session),
+):
+    """Get parents, children, spouses and siblings of a person"""
     # Verify case ownership
     result = await session.execute(
-        select(Case).where(and_(Case.id == case_id, Case.user_id == user.id))
+        select(Case).where(
+            and_(
+                Case.id == case_id,
+                Case.user_id == user.id,
+                Case.deleted_at.is_(None),
+            )
+        )
     )
     case = result.scalar_one_or_none()
 
@@ -312,43 +845,81 @@ async def create_relationship(
             status_code=status.HTTP_404_NOT_FOUND, detail="Case not found"
         )
 
-    # Verify both persons exist and belong to this case
-    from_person_result = await session.execute(
-        select(Person).where(
-            and_(
-                Person.id == relationship_data.from_person_id,
-                Person.case_id == case_id,
-            )
+    index = await load_graph_index(session, case_id, case.revision)
+    if person_id not in index:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Person not found"
         )
+
+    return PersonRelatives(
+        person_id=person_id,
+        parents=index.parents(person_id),
+        children=index.children(person_id),
+        spouses=index.spouses(person_id),
+        siblings=[
+            SiblingRef(person_id=sibling_id, blood_type=blood_type)
+            for sibling_id, blood_type in index.siblings(person_id)
+        ],
     )
-    from_person = from_person_result.scalar_one_or_none()
 
-    to_person_result = await session.execute(
+
+# ==================== Relationship CRUD ====================
+
+
+@router.post(
+    "/{case_id}/relationships",
+    response_model=RelationshipRead,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_relationship(
+    case_id: int,
+    relationship_data: RelationshipCreate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_async_session),
+    graph_store: GraphStore = Depends(get_graph_store),
+):
+    """Create a relationship between persons"""
+    await _get_case_for_write(session, case_id, user, if_match)
+
+    # Verify both persons exist and belong to this case (one query)
+    persons_result = await session.execute(
         select(Person).where(
             and_(
-                Person.id == relationship_data.to_person_id,
                 Person.case_id == case_id,
+                Person.id.in_(
+                    {relationship_data.from_person_id, relationship_data.to_person_id}
+                ),
             )
         )
     )
-    to_person = to_person_result.scalar_one_or_none()
+    persons = {person.id: person for person in persons_result.scalars()}
+    from_person = persons.get(relationship_data.from_person_id)
+    to_person = persons.get(relationship_data.to_person_id)
 
     if not from_person or not to_person:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Person not found"
         )
 
-    # Create relationship in PostgreSQL
+    # Create relationship in PostgreSQL; the edge unique index rejects duplicates
     relationship = PersonRelationship(
         **relationship_data.model_dump(), case_id=case_id
     )
     session.add(relationship)
-    await session.commit()
-    await session.refresh(relationship)
+    try:
+        await session.flush()
+    except IntegrityError:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Relationship already exists"
+        )
+    revision = await touch_case(session, case_id, relationships=1, response=response)
 
-    # Create relationship in Neo4j
+    # Create relationship in the graph store, in the same locked transaction
     if from_person.neo4j_node_id and to_person.neo4j_node_id:
-        rel_id = await neo4j.create_relationship(
+        relationship.neo4j_relationship_id = await graph_store.create_relationship(
             from_node_id=from_person.neo4j_node_id,
             to_node_id=to_person.neo4j_node_id,
             relationship_type=relationship.relationship_type.value.upper(),
@@ -358,9 +929,21 @@ async def create_relationship(
                 "blood_type": relationship.blood_type,
             },
         )
-        relationship.neo4j_relationship_id = rel_id
-        await session.commit()
-        await session.refresh(relationship)
+    await session.commit()
+    await session.refresh(relationship)
+    graph_index_cache.apply(
+        case_id,
+        lambda index: index.add_relationship(
+            relationship.id,
+            relationship.from_person_id,
+            relationship.to_person_id,
+            relationship.relationship_type,
+            relationship.is_biological,
+            relationship.is_adopted,
+            relationship.blood_type,
+        ),
+        revision,
+    )
 
     return relationship
 
@@ -369,21 +952,14 @@ async def create_relationship(
 async def delete_relationship(
     case_id: int,
     relationship_id: int,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     user: User = Depends(current_active_user),
     session: AsyncSession = Depends(get_async_session),
-    neo4j: Neo4jService = Depends(get_neo4j_service),
+    graph_store: GraphStore = Depends(get_graph_store),
 ):
     """Delete a relationship"""
-    # Verify case ownership
-    result = await session.execute(
-        select(Case).where(and_(Case.id == case_id, Case.user_id == user.id))
-    )
-    case = result.scalar_one_or_none()
-
-    if not case:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Case not found"
-        )
+    await _get_case_for_write(session, case_id, user, if_match)
 
     # Get relationship
     rel_result = await session.execute(
@@ -401,10 +977,71 @@ async def delete_relationship(
             status_code=status.HTTP_404_NOT_FOUND, detail="Relationship not found"
         )
 
-    # Delete from Neo4j
+    # Delete from the graph store
     if relationship.neo4j_relationship_id:
-        await neo4j.delete_relationship(relationship.neo4j_relationship_id)
+        await graph_store.delete_relationship(relationship.neo4j_relationship_id)
 
     # Delete from PostgreSQL
     await session.delete(relationship)
+    revision = await touch_case(session, case_id, relationships=-1, response=response)
+    await session.commit()
+    graph_index_cache.apply(
+        case_id, lambda index: index.remove_relationship(relationship_id), revision
+    )
+
+
+@router.post(
+    "/{case_id}/relationships/bulk-delete", status_code=status.HTTP_204_NO_CONTENT
+)
+async def bulk_delete_relationships(
+    case_id: int,
+    bulk_data: BulkDelete,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_async_session),
+    graph_store: GraphStore = Depends(get_graph_store),
+):
+    """Delete many relationships in one transaction"""
+    await _get_case_for_write(session, case_id, user, if_match)
+
+    ids = bulk_data.ids
+    _reject_duplicate_ids(ids)
+
+    rel_result = await session.execute(
+        select(
+            PersonRelationship.id, PersonRelationship.neo4j_relationship_id
+        ).where(
+            and_(
+                PersonRelationship.case_id == case_id,
+                PersonRelationship.id.in_(ids),
+            )
+        )
+    )
+    neo4j_ids = dict(rel_result.all())
+    _missing_ids(ids, neo4j_ids)
+
+    # Delete from the graph store with a single UNWIND query
+    await graph_store.delete_relationships([r for r in neo4j_ids.values() if r])
+
+    # Delete from PostgreSQL
+    await session.execute(
+        delete(PersonRelationship)
+        .where(
+            and_(
+                PersonRelationship.case_id == case_id,
+                PersonRelationship.id.in_(ids),
+            )
+        )
+        .execution_options(synchronize_session=False)
+    )
+    revision = await touch_case(
+        session, case_id, relationships=-len(ids), response=response
+    )
     await session.commit()
+
+    def remove_all(index: CaseGraphIndex) -> None:
+        for relationship_id in ids:
+            index.remove_relationship(relationship_id)
+
+    graph_index_cache.apply(case_id, remove_all, revision)
@@ -3,11 +3,13 @@ Health check endpoints for monitoring and deployment.
 Provides basic liveness and detailed readiness checks.
 """
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import PlainTextResponse
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db import get_async_session
 from app.config import settings
+from app.services.metrics import metrics
 from app.services.neo4j_service import Neo4jService
 
 router = APIRouter(tags=["health"])
@@ -72,19 +74,22 @@ async def readiness_check():
         health_status["checks"]["database"] = f"unhealthy: {str(e)}"
         is_ready = False
 
-    # Check Neo4j connection
-    try:
-        neo4j_service = Neo4jService()
-        await neo4j_service.connect()
+    # Check Neo4j connection (not used with the in-process graph store)
+    if settings.graph_backend == "memory":
+        health_status["checks"]["neo4j"] = "disabled"
+    else:
         try:
-            # Simple connectivity test
-            await neo4j_service.driver.verify_connectivity()
-            health_status["checks"]["neo4j"] = "healthy"
-        finally:
-            await neo4j_service.close()
-    except Exception as e:
-        health_status["checks"]["neo4j"] = f"unhealthy: {str(e)}"
-        is_ready = False
+            neo4j_service = Neo4jService()
+            await neo4j_service.connect()
+            try:
+                # Simple connectivity test
+                await neo4j_service.driver.verify_connectivity()
+                health_status["checks"]["neo4j"] = "healthy"
+            finally:
+                await neo4j_service.close()
+        except Exception as e:
+            health_status["checks"]["neo4j"] = f"unhealthy: {str(e)}"
+            is_ready = False
 
     if not is_ready:
         health_status["status"] = "not_ready"
@@ -106,3 +111,14 @@ async def liveness_check():
         "status": "alive",
         "service": "inheritance-calculator-api"
     }
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """
+    Process-local metrics in Prometheus text format.
+    Includes calculation timeouts and cancellations per case size.
+    """
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4"
+    )
@@ -0,0 +1,39 @@
+"""Search API Endpoints"""
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth import current_active_user
+from app.db import get_async_session
+from app.models import User
+from app.schemas import SearchHit, SearchResults
+from app.services.search import search
+
+router = APIRouter()
+
+
+# ==================== Search ====================
+
+
+@router.get("/", response_model=SearchResults)
+async def search_persons_and_cases(
+    q: str = Query(..., min_length=1, max_length=255),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Search the current user's cases by person name, case title and description
+
+    Matching ignores full-width / half-width, katakana / hiragana, small
+    kana and common variant kanji differences. Hits are ranked exact >
+    prefix > substring, with description matches below the others.
+    """
+    total, hits = await search(session, user.id, q, limit, offset)
+    return SearchResults(
+        query=q,
+        total=total,
+        limit=limit,
+        offset=offset,
+        results=[SearchHit(**hit._asdict()) for hit in hits],
+    )
@@ -1,7 +1,8 @@
 """Authentication Configuration"""
 from typing import Optional
 
-from fastapi import Depends, Request
+import jwt
+from fastapi import Depends, HTTPException, Request, status
 from fastapi_users import BaseUserManager, FastAPIUsers, IntegerIDMixin
 from fastapi_users.authentication import (
     AuthenticationBackend,
@@ -9,6 +10,7 @@ from fastapi_users.authentication import (
     JWTStrategy,
 )
 from fastapi_users.db import SQLAlchemyUserDatabase
+from fastapi_users.jwt import decode_jwt
 
 from app.config import settings
 from app.models.user import User
@@ -69,3 +71,25 @@ fastapi_users = FastAPIUsers[User, int](
 
 # Current user dependency
 current_active_user = fastapi_users.current_user(active=True)
+
+
+async def current_token_user_id(
+    token: Optional[str] = Depends(bearer_transport.scheme),
+) -> int:
+    """
+    User ID from a valid access token, without loading the user
+
+    For endpoints that never touch the database: a deactivated or deleted
+    user keeps access until the token expires.
+    """
+    strategy = get_jwt_strategy()
+    if token is not None:
+        try:
+            data = decode_jwt(
+                token, strategy.decode_key, strategy.token_audience,
+                algorithms=[strategy.algorithm],
+            )
+            return int(data["sub"])
+        except (jwt.PyJWTError, KeyError, ValueError):
+            pass
+    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
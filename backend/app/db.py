@@ -1,5 +1,6 @@
 """Database Configuration"""
-from typing import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator
 
 from fastapi import Depends
 from fastapi_users.db import SQLAlchemyUserDatabase
@@ -34,6 +35,30 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+@asynccontextmanager
+async def snapshot_session() -> AsyncIterator[AsyncSession]:
+    """
+    Session whose first transaction reads one consistent snapshot
+
+    On PostgreSQL that transaction runs at REPEATABLE READ, so reads spread
+    over several statements (case row, persons, relationships) never mix
+    two revisions of a case. Commit before writing: transactions after the
+    first use the default isolation level.
+    """
+    async with async_session_maker() as session:
+        if engine.dialect.name == "postgresql":
+            await session.connection(
+                execution_options={"isolation_level": "REPEATABLE READ"}
+            )
+        yield session
+
+
+async def get_snapshot_session() -> AsyncGenerator[AsyncSession, None]:
+    """Get async database session reading a consistent snapshot"""
+    async with snapshot_session() as session:
+        yield session
+
+
 async def get_user_db(session: AsyncSession = Depends(get_async_session)):
     """Get user database for FastAPI-Users"""
     yield SQLAlchemyUserDatabase(session, User)
@@ -1,4 +1,5 @@
 """FastAPI Main Application"""
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -6,18 +7,44 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.auth import auth_backend, fastapi_users
 from app.config import settings
-from app.db import create_db_and_tables
+from app.db import create_db_and_tables, engine
 from app.schemas import UserRead, UserCreate
-from app.api import cases, calculate, health
+from app.api import cases, calculate, health, search
+from app.services.cache_warmup import cache_warmer
+from app.services.calculation_runner import calculation_runner
+from app.services.case_purge import case_purger
+from app.services.job_queue import calculation_job_queue
+from app.services.graph_store import configured_graph_store
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Application lifespan events"""
-    # Startup: Create database tables
-    await create_db_and_tables()
+    """Application lifespan events (run once in every server worker process)"""
+    # Startup: Drop DB connections inherited from a parent process, create
+    # database tables (unless Alembic manages the schema), start calculation
+    # job workers, resume purging deleted cases and warm caches in the
+    # background. The Neo4j driver (when GRAPH_BACKEND=neo4j) is created
+    # lazily, so each worker opens its own.
+    await engine.dispose(close=False)
+    if settings.auto_create_tables:
+        await create_db_and_tables()
+    await calculation_job_queue.start()
+    await case_purger.start()
+    await cache_warmer.start()
     yield
-    # Shutdown: Cleanup if needed
+    # Shutdown: uvicorn has already given in-flight requests up to
+    # shutdown_drain_seconds. Running jobs and calculations then share one
+    # more such period before background workers, calculation worker
+    # processes and connections are stopped
+    await cache_warmer.stop()
+    await case_purger.stop()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.shutdown_drain_seconds
+    await calculation_job_queue.stop(drain_timeout=settings.shutdown_drain_seconds)
+    await calculation_runner.drain(max(0.0, deadline - loop.time()))
+    calculation_runner.shutdown()
+    await configured_graph_store().close()
+    await engine.dispose()
 
 
 app = FastAPI(
@@ -83,6 +110,20 @@ app.include_router(
     tags=["calculate"],
 )
 
+# Calculation preview routes (no case)
+app.include_router(
+    calculate.preview_router,
+    prefix="/api/calculate",
+    tags=["calculate"],
+)
+
+# Search routes
+app.include_router(
+    search.router,
+    prefix="/api/search",
+    tags=["search"],
+)
+
 # Health check routes
 app.include_router(
     health.router,
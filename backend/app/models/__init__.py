@@ -1,6 +1,7 @@
 """Database Models"""
 from .user import User
 from .case import Case, Person, PersonRelationship, CaseStatus, RelationshipType
+from .calculation_job import CalculationJob
 
 __all__ = [
     "User",
@@ -9,4 +10,5 @@ __all__ = [
     "PersonRelationship",
     "CaseStatus",
     "RelationshipType",
+    "CalculationJob",
 ]
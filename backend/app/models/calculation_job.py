@@ -0,0 +1,39 @@
+"""Calculation Job Model for the durable job queue"""
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import JSON, Boolean, DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.user import Base
+
+
+class CalculationJob(Base):
+    """Queued or finished asynchronous calculation"""
+
+    __tablename__ = "calculation_jobs"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    case_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("cases.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id"), nullable=False
+    )
+
+    # "queued", "running", "succeeded" or "failed"
+    status: Mapped[str] = mapped_column(String(20), nullable=False, index=True)
+    # "loading", "converting", "calculating" or "rendering" while running
+    phase: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
+    include_tree: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+
+    result: Mapped[Optional[Any]] = mapped_column(JSON, nullable=True)
+    error: Mapped[Optional[Any]] = mapped_column(JSON, nullable=True)
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
@@ -2,11 +2,41 @@
 from datetime import datetime
 from typing import Optional, List
 
-from sqlalchemy import String, Integer, DateTime, ForeignKey, Text, Enum as SQLEnum
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import (
+    DDL,
+    Boolean,
+    Index,
+    String,
+    Integer,
+    DateTime,
+    ForeignKey,
+    Text,
+    Enum as SQLEnum,
+    event,
+)
+from sqlalchemy.sql import false, text
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 import enum
 
 from app.models.user import Base
+from app.search_text import normalize_search_text
+
+# Trigram indexes on the normalized search columns need pg_trgm
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
+def _trigram_index(name: str, column: str) -> Index:
+    """GIN trigram index for LIKE '%...%' search (PostgreSQL only)"""
+    return Index(
+        name,
+        column,
+        postgresql_using="gin",
+        postgresql_ops={column: "gin_trgm_ops"},
+    ).ddl_if(dialect="postgresql")
 
 
 class CaseStatus(str, enum.Enum):
@@ -21,6 +51,18 @@ class Case(Base):
     """Case model for managing inheritance calculation cases"""
 
     __tablename__ = "cases"
+    __table_args__ = (
+        _trigram_index("ix_cases_title_search_trgm", "title_search"),
+        _trigram_index("ix_cases_description_search_trgm", "description_search"),
+        # Case list: live cases of a user, newest first, in one index scan
+        Index(
+            "ix_cases_user_listing",
+            "user_id",
+            "updated_at",
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -36,9 +78,50 @@ class Case(Base):
         Integer, ForeignKey("users.id"), nullable=False, index=True
     )
 
+    # Normalized copies of title / description for search (see app.search_text)
+    title_search: Mapped[str] = mapped_column(
+        String(255), default="", server_default="", nullable=False
+    )
+    description_search: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    # The person marked is_decedent, if any (kept in sync by touch_case)
+    decedent_person_id: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        ForeignKey(
+            "persons.id",
+            ondelete="SET NULL",
+            use_alter=True,
+            name="fk_cases_decedent_person_id",
+        ),
+        nullable=True,
+    )
+
     # Neo4j graph ID (for linking to family tree graph)
     neo4j_graph_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
 
+    # Incremented on every change to the case or its persons / relationships
+    revision: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+
+    # Counters maintained with every write (see touch_case)
+    person_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    relationship_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    has_decedent: Mapped[bool] = mapped_column(
+        Boolean, default=False, server_default=false(), nullable=False
+    )
+    # Last completed calculation; current if last_calculated_at >= updated_at
+    last_calculated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, nullable=True
+    )
+    last_result_fingerprint: Mapped[Optional[str]] = mapped_column(
+        String(64), nullable=True
+    )
+
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, nullable=False
@@ -46,17 +129,40 @@ class Case(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
+    # Set when the case is deleted; its data is purged in the background
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, nullable=True, index=True
+    )
 
     # Relationships
     # user relationship will be added when we import User model
     # For now, we use string reference to avoid circular import
     # user: Mapped["User"] = relationship("User", back_populates="cases")
 
+    @validates("title", "description")
+    def _normalize_for_search(self, key: str, value: Optional[str]) -> Optional[str]:
+        if key == "title":
+            self.title_search = normalize_search_text(value)
+        else:
+            self.description_search = normalize_search_text(value) or None
+        return value
+
 
 class Person(Base):
     """Person model for storing individual person data"""
 
     __tablename__ = "persons"
+    __table_args__ = (
+        _trigram_index("ix_persons_name_search_trgm", "name_search"),
+        # At most one decedent per case
+        Index(
+            "uq_persons_case_decedent",
+            "case_id",
+            unique=True,
+            postgresql_where=text("is_decedent"),
+            sqlite_where=text("is_decedent"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     case_id: Mapped[int] = mapped_column(
@@ -65,6 +171,10 @@ class Person(Base):
 
     # Basic info
     name: Mapped[str] = mapped_column(String(255), nullable=False)
+    # Normalized name for search (see app.search_text)
+    name_search: Mapped[str] = mapped_column(
+        String(255), default="", server_default="", nullable=False
+    )
     is_alive: Mapped[bool] = mapped_column(default=True, nullable=False)
     death_date: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     birth_date: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
@@ -85,6 +195,11 @@ class Person(Base):
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
 
+    @validates("name")
+    def _normalize_for_search(self, key: str, value: str) -> str:
+        self.name_search = normalize_search_text(value)
+        return value
+
 
 class RelationshipType(str, enum.Enum):
     """Relationship type enum"""
@@ -97,10 +212,24 @@ class PersonRelationship(Base):
     """Person relationship model for storing family relationships"""
 
     __tablename__ = "person_relationships"
+    __table_args__ = (
+        # One edge per (from, to, type) in a case. Leads with case_id, so it
+        # also serves per-case scans; on PostgreSQL the remaining columns
+        # read by the graph index are included to make those scans index-only.
+        Index(
+            "uq_person_relationships_edge",
+            "case_id",
+            "from_person_id",
+            "to_person_id",
+            "relationship_type",
+            unique=True,
+            postgresql_include=["id", "is_biological", "is_adopted", "blood_type"],
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     case_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("cases.id", ondelete="CASCADE"), nullable=False, index=True
+        Integer, ForeignKey("cases.id", ondelete="CASCADE"), nullable=False
     )
 
     # Source and target persons
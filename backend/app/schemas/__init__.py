@@ -5,12 +5,31 @@ from .case import (
     CaseCreate,
     CaseUpdate,
     CaseWithDetails,
+    CaseClone,
     PersonRead,
     PersonCreate,
     PersonUpdate,
+    PersonPatch,
+    PersonBulkUpdate,
+    BulkDelete,
+    PersonRelatives,
+    SiblingRef,
     RelationshipRead,
     RelationshipCreate,
     RelationshipUpdate,
+    CalculationJobCreate,
+    CalculationJobRead,
+    AssetValue,
+    ApportionmentRequest,
+    SuccessionLink,
+    SuccessionRequest,
+    PreviewPerson,
+    PreviewRelationship,
+    CalculationPreviewRequest,
+    ValidationIssue,
+    ValidationReport,
+    SearchHit,
+    SearchResults,
 )
 
 __all__ = [
@@ -21,10 +40,29 @@ __all__ = [
     "CaseCreate",
     "CaseUpdate",
     "CaseWithDetails",
+    "CaseClone",
     "PersonRead",
     "PersonCreate",
     "PersonUpdate",
+    "PersonPatch",
+    "PersonBulkUpdate",
+    "BulkDelete",
+    "PersonRelatives",
+    "SiblingRef",
     "RelationshipRead",
     "RelationshipCreate",
     "RelationshipUpdate",
+    "CalculationJobCreate",
+    "CalculationJobRead",
+    "AssetValue",
+    "ApportionmentRequest",
+    "SuccessionLink",
+    "SuccessionRequest",
+    "PreviewPerson",
+    "PreviewRelationship",
+    "CalculationPreviewRequest",
+    "ValidationIssue",
+    "ValidationReport",
+    "SearchHit",
+    "SearchResults",
 ]
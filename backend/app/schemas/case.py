@@ -1,6 +1,6 @@
 """Case Schemas"""
 from datetime import datetime
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 
 from pydantic import BaseModel, Field
 
@@ -35,6 +35,21 @@ class PersonUpdate(BaseModel):
     is_spouse: Optional[bool] = None
 
 
+class PersonPatch(PersonUpdate):
+    """Single item of a bulk person update"""
+    id: int
+
+
+class PersonBulkUpdate(BaseModel):
+    """Schema for updating many persons at once"""
+    items: List[PersonPatch] = Field(..., min_length=1, max_length=1000)
+
+
+class BulkDelete(BaseModel):
+    """Schema for deleting many rows at once"""
+    ids: List[int] = Field(..., min_length=1, max_length=1000)
+
+
 class PersonRead(PersonBase):
     """Schema for reading a person"""
     id: int
@@ -47,6 +62,21 @@ class PersonRead(PersonBase):
         from_attributes = True
 
 
+class SiblingRef(BaseModel):
+    """Sibling reference with blood type"""
+    person_id: int
+    blood_type: Optional[str] = None
+
+
+class PersonRelatives(BaseModel):
+    """Direct relatives of a person"""
+    person_id: int
+    parents: List[int] = []
+    children: List[int] = []
+    spouses: List[int] = []
+    siblings: List[SiblingRef] = []
+
+
 # Relationship schemas
 class RelationshipBase(BaseModel):
     """Base relationship schema"""
@@ -108,6 +138,13 @@ class CaseRead(CaseBase):
     id: int
     user_id: int
     neo4j_graph_id: Optional[str] = None
+    revision: int = 0
+    person_count: int = 0
+    relationship_count: int = 0
+    has_decedent: bool = False
+    decedent_person_id: Optional[int] = None
+    last_calculated_at: Optional[datetime] = None
+    last_result_fingerprint: Optional[str] = None
     created_at: datetime
     updated_at: datetime
 
@@ -115,7 +152,119 @@ class CaseRead(CaseBase):
         from_attributes = True
 
 
+class CaseClone(BaseModel):
+    """Schema for cloning a case, with optional overlays applied to the copy"""
+    title: Optional[str] = Field(None, min_length=1, max_length=255)
+    description: Optional[str] = None
+    # Person ID in the source case who becomes the decedent of the copy
+    decedent_person_id: Optional[int] = None
+    decedent_death_date: Optional[datetime] = None
+
+
 class CaseWithDetails(CaseRead):
     """Case with persons and relationships"""
     persons: List[PersonRead] = []
     relationships: List[RelationshipRead] = []
+
+
+# Successive inheritance (数次相続) schemas
+class SuccessionLink(BaseModel):
+    """An heir whose own estate is modelled as the decedent of another case"""
+    person_id: int
+    case_id: int
+
+
+class SuccessionRequest(BaseModel):
+    """Schema for a successive-inheritance chain calculation"""
+    # Deceased heirs whose share passes on through their own inheritance;
+    # when omitted, heirs who died after their decedent are used
+    successor_ids: Optional[List[int]] = None
+    links: List[SuccessionLink] = []
+
+
+# Calculation preview schemas
+class PreviewPerson(PersonBase):
+    """Person of an inline family tree; the ID is chosen by the client"""
+    id: int
+
+
+class PreviewRelationship(RelationshipBase):
+    """Relationship of an inline family tree, between client-chosen person IDs"""
+    pass
+
+
+class CalculationPreviewRequest(BaseModel):
+    """Schema for calculating an inline family tree without saving it"""
+    persons: List[PreviewPerson] = Field(..., min_length=1, max_length=1000)
+    relationships: List[PreviewRelationship] = Field([], max_length=5000)
+    include_tree: bool = False
+
+
+# Apportionment schemas
+class AssetValue(BaseModel):
+    """A single estate asset valued in yen"""
+    name: str = Field(..., min_length=1, max_length=255)
+    value: int = Field(..., ge=0)
+
+
+class ApportionmentRequest(BaseModel):
+    """Schema for apportioning an estate; give estate_value or assets"""
+    estate_value: Optional[int] = Field(None, ge=0)
+    assets: Optional[List[AssetValue]] = Field(None, max_length=10000)
+
+
+# Calculation job schemas
+class CalculationJobCreate(BaseModel):
+    """Schema for submitting a calculation job"""
+    include_tree: bool = False
+
+
+class CalculationJobRead(BaseModel):
+    """Schema for reading a calculation job"""
+    id: str
+    case_id: int
+    status: str
+    phase: Optional[str] = None
+    include_tree: bool = False
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[Dict[str, Any]] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+# Validation schemas
+class ValidationIssue(BaseModel):
+    """A single family tree validation issue"""
+    code: str
+    message: str
+    severity: str = "error"  # "error" blocks calculation, "warning" does not
+    person_ids: List[int] = []
+    relationship_id: Optional[int] = None
+
+
+class ValidationReport(BaseModel):
+    """Result of validating a case's family tree"""
+    case_id: int
+    valid: bool
+    errors: List[ValidationIssue] = []
+    warnings: List[ValidationIssue] = []
+
+
+# Search schemas
+class SearchHit(BaseModel):
+    """A person or case matching a search; person fields are unset for case hits"""
+    kind: str  # "person" or "case"
+    case_id: int
+    case_title: str
+    person_id: Optional[int] = None
+    person_name: Optional[str] = None
+    score: float
+
+
+class SearchResults(BaseModel):
+    """A page of ranked search hits"""
+    query: str
+    total: int
+    limit: int
+    offset: int
+    results: List[SearchHit] = []
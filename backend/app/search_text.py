@@ -0,0 +1,38 @@
+"""Normalization of Japanese text for search"""
+import re
+import unicodedata
+from typing import Optional
+
+# Katakana ァ..ヶ -> hiragana ぁ..ゖ
+_KATAKANA_TO_HIRAGANA = {code: code - 0x60 for code in range(0x30A1, 0x30F7)}
+
+# Small kana are written full-size in older registers (キヤ for キャ)
+_SMALL_KANA = str.maketrans("ぁぃぅぇぉっゃゅょゎゕゖ", "あいうえおつやゆよわかけ")
+
+# Old and variant kanji common in surnames -> their usual form
+_KANJI_VARIANTS = str.maketrans({
+    "髙": "高", "﨑": "崎", "嵜": "崎", "邊": "辺", "邉": "辺", "澤": "沢",
+    "齋": "斎", "齊": "斉", "濱": "浜", "廣": "広", "國": "国", "嶋": "島",
+    "櫻": "桜", "實": "実", "德": "徳", "惠": "恵", "榮": "栄", "藏": "蔵",
+    "龍": "竜", "眞": "真", "淺": "浅", "瀧": "滝", "冨": "富",
+})
+
+# Separators dropped before matching (spaces, middle dots, hyphens)
+_IGNORED = re.compile(r"[\s・\-‐]+")
+
+
+def normalize_search_text(text: Optional[str]) -> str:
+    """
+    Fold text so that spelling variants match each other
+
+    NFKC folds full-width / half-width forms (ＡＢＣ, ｶﾅ), then case is
+    folded, katakana become hiragana, small kana become full-size, common
+    variant kanji are mapped to their usual form and separators are
+    removed. The same function is applied to stored values and queries.
+    """
+    if not text:
+        return ""
+    folded = unicodedata.normalize("NFKC", text).casefold()
+    folded = folded.translate(_KATAKANA_TO_HIRAGANA)
+    folded = folded.translate(_SMALL_KANA).translate(_KANJI_VARIANTS)
+    return _IGNORED.sub("", folded)
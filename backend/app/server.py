@@ -0,0 +1,62 @@
+"""
+Production server entry point
+
+Runs uvicorn with ``settings.web_concurrency`` worker processes:
+
+    python -m app.server
+
+One-time setup (creating tables when AUTO_CREATE_TABLES is on) runs here
+before the workers start. Every worker process then imports the app on its
+own and runs the lifespan, so the DB engine, the Neo4j driver, the
+calculation worker pool and the job queue exist once per worker. State
+shared between workers lives in PostgreSQL:
+
+- Graph index, calculation result, tree render and export caches are
+  process-local and keyed by the case revision stored in the database, so
+  a worker never serves data older than the revision it just read.
+- Calculation jobs must use CALCULATION_JOB_STORE=database when running
+  more than one worker; otherwise a job is only visible to the worker that
+  accepted it.
+"""
+import asyncio
+import logging
+import os
+
+import uvicorn
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+async def _create_tables_once() -> None:
+    from app.db import create_db_and_tables, engine
+
+    await create_db_and_tables()
+    await engine.dispose()
+
+
+def main() -> None:
+    """Run the API server"""
+    if settings.auto_create_tables and settings.web_concurrency > 1:
+        # Create tables here, once, instead of racing in every worker
+        asyncio.run(_create_tables_once())
+        os.environ["AUTO_CREATE_TABLES"] = "false"
+    if settings.web_concurrency > 1 and settings.calculation_job_store != "database":
+        logger.warning(
+            "WEB_CONCURRENCY=%d with the in-memory job store: calculation jobs "
+            "are only visible to the worker that accepted them; set "
+            "CALCULATION_JOB_STORE=database",
+            settings.web_concurrency,
+        )
+    uvicorn.run(
+        "app.main:app",
+        host=settings.host,
+        port=settings.port,
+        workers=settings.web_concurrency,
+        timeout_graceful_shutdown=int(settings.shutdown_drain_seconds),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,14 @@
 """Services"""
 from .neo4j_service import Neo4jService
-from .calculation_service import CalculationService
 
 __all__ = ["Neo4jService", "CalculationService"]
+
+
+def __getattr__(name: str):
+    # The calculation service pulls in the core library; only calculation
+    # worker processes need it, so load it on first access
+    if name == "CalculationService":
+        from .calculation_service import CalculationService
+
+        return CalculationService
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,80 @@
+"""Apportioning estate values across heirs in whole yen"""
+from fractions import Fraction
+from math import lcm
+from typing import Any, Dict, List, Sequence, Tuple
+
+
+def integer_weights(shares: Sequence[Fraction]) -> Tuple[List[int], int]:
+    """
+    Put shares on their least common denominator
+
+    Returns:
+        (numerators, total) with share_i == numerators[i] / total
+        relative to the sum of all shares
+    """
+    denominator = lcm(*(share.denominator for share in shares))
+    weights = [share.numerator * (denominator // share.denominator) for share in shares]
+    return weights, sum(weights)
+
+
+def apportion(value: int, weights: Sequence[int], total: int) -> List[int]:
+    """
+    Split an integer amount in proportion to integer weights
+
+    Each part is rounded down and the remaining yen go to the parts with
+    the largest remainders (ties to the earlier part), so the parts always
+    add up to ``value`` and the result does not depend on float rounding.
+    """
+    if total == 0:
+        return [0] * len(weights)
+    parts = []
+    remainders = []
+    for i, weight in enumerate(weights):
+        quotient, remainder = divmod(value * weight, total)
+        parts.append(quotient)
+        remainders.append((-remainder, i))
+    leftover = value - sum(parts)
+    for _, i in sorted(remainders)[:leftover]:
+        parts[i] += 1
+    return parts
+
+
+def apportion_estate(
+    heirs: Sequence[Dict[str, Any]], assets: Sequence[Tuple[str, int]]
+) -> Dict[str, Any]:
+    """
+    Apportion assets across the heirs of a calculation summary
+
+    Args:
+        heirs: Heir dicts from the calculation summary
+        assets: (name, value in yen) pairs
+
+    Returns:
+        Dict with the estate total, per-heir totals and per-asset splits
+    """
+    shares = [Fraction(h["share_numerator"], h["share_denominator"]) for h in heirs]
+    weights, total = integer_weights(shares)
+
+    heir_totals = [0] * len(heirs)
+    asset_rows = []
+    for name, value in assets:
+        parts = apportion(value, weights, total)
+        for i, part in enumerate(parts):
+            heir_totals[i] += part
+        asset_rows.append({"name": name, "value": value, "amounts": parts})
+
+    return {
+        "estate_value": sum(value for _, value in assets),
+        "common_denominator": total,
+        "heirs": [
+            {
+                "id": heir["id"],
+                "name": heir["name"],
+                "share_numerator": heir["share_numerator"],
+                "share_denominator": heir["share_denominator"],
+                "amount": amount,
+            }
+            for heir, amount in zip(heirs, heir_totals)
+        ],
+        "assets": asset_rows,
+    }
@@ -0,0 +1,220 @@
+"""Background preloading of caches for recently updated cases"""
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, select
+
+from app.config import settings
+from app.db import snapshot_session
+from app.models import Case, Person, PersonRelationship
+from app.services.calculation_runner import CalculationRunner, calculation_runner
+from app.services.graph_index import CaseGraphIndex, RelationshipRow, graph_index_cache
+from app.services.metrics import metrics
+from app.services.person_rows import PERSON_ROW_COLUMNS, PersonRow
+from app.services.result_cache import calculation_result_cache
+from app.services.tree_renderer import RenderedTree, tree_render_cache
+from app.services.validation_service import validate_family_tree
+
+logger = logging.getLogger(__name__)
+
+# Cases loaded per pair of set-based queries
+WARMUP_BATCH_SIZE = 50
+
+warmup_cases_planned = metrics.gauge(
+    "cache_warmup_cases_planned", "Cases selected for cache warm-up"
+)
+warmup_cases_done = metrics.counter(
+    "cache_warmup_cases_done_total",
+    "Cases processed by the cache warm-up",
+    label="outcome",
+)
+warmup_running = metrics.gauge(
+    "cache_warmup_running", "1 while the cache warm-up is in progress"
+)
+
+
+class CacheWarmer:
+    """
+    Fills the per-process caches with the most recently updated cases
+
+    Runs in the background after startup, so readiness is not delayed.
+    Cases are loaded in batches with one query for their persons and one
+    for their relationships, then calculated with the full ASCII tree, at
+    most ``concurrency`` at a time so live requests keep the remaining
+    calculation workers. Warms the graph index, calculation result and
+    rendered tree caches; nothing is written to the database.
+    """
+
+    def __init__(self, case_limit: int, concurrency: int, runner: CalculationRunner):
+        self.case_limit = case_limit
+        self.concurrency = max(1, concurrency)
+        self.runner = runner
+        self._task: Optional[asyncio.Task] = None
+
+    # ---------- Lifecycle ----------
+
+    async def start(self) -> None:
+        """Start the warm-up in the background (no-op if disabled)"""
+        if self._task or self.case_limit <= 0:
+            return
+        self._task = asyncio.create_task(self.run(), name="cache-warmup")
+
+    async def stop(self) -> None:
+        """Cancel a warm-up still in progress"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    # ---------- Warm-up ----------
+
+    async def run(self) -> None:
+        """Warm the caches for the most recently updated cases"""
+        # Warming more cases than the caches hold would only evict earlier ones
+        limit = min(
+            self.case_limit,
+            graph_index_cache.max_size,
+            calculation_result_cache.max_size,
+            tree_render_cache.max_size,
+        )
+        warmup_running.set(1)
+        try:
+            async with snapshot_session() as session:
+                result = await session.execute(
+                    select(Case.id)
+                    .where(
+                        and_(
+                            Case.deleted_at.is_(None),
+                            Case.decedent_person_id.is_not(None),
+                        )
+                    )
+                    .order_by(Case.updated_at.desc())
+                    .limit(limit)
+                )
+                case_ids = list(result.scalars().all())
+            warmup_cases_planned.set(len(case_ids))
+            logger.info("Warming caches for %d recent cases", len(case_ids))
+
+            semaphore = asyncio.Semaphore(self.concurrency)
+            for start in range(0, len(case_ids), WARMUP_BATCH_SIZE):
+                batch = await self._load_batch(
+                    case_ids[start:start + WARMUP_BATCH_SIZE]
+                )
+                await asyncio.gather(
+                    *(self._warm(semaphore, *case) for case in batch)
+                )
+            logger.info("Cache warm-up finished")
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Cache warm-up failed")
+        finally:
+            warmup_running.set(0)
+
+    async def _load_batch(
+        self, case_ids: List[int]
+    ) -> List[Tuple[int, int, int, List[PersonRow], CaseGraphIndex]]:
+        """Load persons and relationships of several cases from one snapshot"""
+        async with snapshot_session() as session:
+            cases_result = await session.execute(
+                select(Case.id, Case.revision, Case.decedent_person_id).where(
+                    and_(Case.id.in_(case_ids), Case.deleted_at.is_(None))
+                )
+            )
+            cases = {
+                case_id: (revision, decedent_id)
+                for case_id, revision, decedent_id in cases_result
+            }
+            persons: Dict[int, List[PersonRow]] = {case_id: [] for case_id in cases}
+            persons_result = await session.execute(
+                select(Person.case_id, *PERSON_ROW_COLUMNS).where(
+                    Person.case_id.in_(cases)
+                )
+            )
+            for case_id, *columns in persons_result.tuples():
+                persons[case_id].append(PersonRow(*columns))
+            relationships: Dict[int, List[RelationshipRow]] = {
+                case_id: [] for case_id in cases
+            }
+            rels_result = await session.execute(
+                select(
+                    PersonRelationship.case_id,
+                    PersonRelationship.id,
+                    PersonRelationship.from_person_id,
+                    PersonRelationship.to_person_id,
+                    PersonRelationship.relationship_type,
+                    PersonRelationship.is_biological,
+                    PersonRelationship.is_adopted,
+                    PersonRelationship.blood_type,
+                ).where(PersonRelationship.case_id.in_(cases))
+            )
+            for case_id, *columns in rels_result.tuples():
+                relationships[case_id].append(tuple(columns))
+
+        batch = []
+        for case_id in case_ids:
+            if case_id not in cases or cases[case_id][1] is None:
+                warmup_cases_done.inc("skipped")
+                continue
+            revision, decedent_id = cases[case_id]
+            index = graph_index_cache.get(case_id, revision)
+            if index is None:
+                index = CaseGraphIndex.from_rows(
+                    case_id,
+                    [person.id for person in persons[case_id]],
+                    relationships[case_id],
+                    revision,
+                )
+                graph_index_cache.put(index)
+            batch.append((case_id, revision, decedent_id, persons[case_id], index))
+        return batch
+
+    async def _warm(
+        self,
+        semaphore: asyncio.Semaphore,
+        case_id: int,
+        revision: int,
+        decedent_id: int,
+        persons: List[PersonRow],
+        index: CaseGraphIndex,
+    ) -> None:
+        """Calculate one case and cache its result and full tree"""
+        tree_key = (case_id, revision, "full", None)
+        if tree_render_cache.get(tree_key) is not None:
+            warmup_cases_done.inc("cached")
+            return
+        issues = validate_family_tree(persons, index)
+        if any(issue.severity == "error" for issue in issues):
+            warmup_cases_done.inc("skipped")
+            return
+
+        async with semaphore:
+            output = calculation_result_cache.get(case_id, revision, include_tree=True)
+            if output is None:
+                try:
+                    output = await self.runner.run(
+                        persons=persons,
+                        decedent_id=decedent_id,
+                        index=index,
+                        include_tree=True,
+                    )
+                except Exception:
+                    logger.warning(
+                        "Cache warm-up of case %s failed", case_id, exc_info=True
+                    )
+                    warmup_cases_done.inc("failed")
+                    return
+                calculation_result_cache.put(case_id, revision, None, output)
+
+        text = output["ascii_tree"]
+        tree_render_cache.put(tree_key, RenderedTree(text.splitlines(), text))
+        warmup_cases_done.inc("warmed")
+
+
+# Global cache warmer
+cache_warmer = CacheWarmer(
+    case_limit=settings.cache_warmup_cases,
+    concurrency=settings.cache_warmup_concurrency,
+    runner=calculation_runner,
+)
@@ -0,0 +1,165 @@
+"""Loading and validating the inputs of a case calculation"""
+from typing import Any, List, NamedTuple, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Case
+from app.schemas import CalculationPreviewRequest, ValidationIssue, ValidationReport
+from app.services.graph_index import CaseGraphIndex, load_graph_index
+from app.services.person_rows import PersonRow, load_person_rows
+from app.services.validation_service import validate_family_tree
+
+
+class InvalidCalculationInput(Exception):
+    """Raised when a case cannot be calculated; carries the HTTP status and detail"""
+
+    def __init__(self, status_code: int, detail: Any):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class CalculationInputs(NamedTuple):
+    """
+    Everything a calculation worker needs for one case
+
+    The index is shared with the graph index cache, which never changes
+    cached indexes in place, so the relationship rows stay those read at
+    revision even after the read snapshot ends.
+    """
+    persons: List[PersonRow]
+    decedent_id: int
+    index: CaseGraphIndex
+    revision: Optional[int] = None
+
+
+def _validation_failed(report: ValidationReport) -> InvalidCalculationInput:
+    return InvalidCalculationInput(
+        422,
+        {
+            "message": "Family tree validation failed",
+            "errors": [issue.model_dump() for issue in report.errors],
+        },
+    )
+
+
+def build_validation_report(
+    case_id: int, issues: List[ValidationIssue]
+) -> ValidationReport:
+    """Split validation issues into errors and warnings"""
+    errors = [issue for issue in issues if issue.severity == "error"]
+    warnings = [issue for issue in issues if issue.severity != "error"]
+    return ValidationReport(
+        case_id=case_id,
+        valid=not errors,
+        errors=errors,
+        warnings=warnings,
+    )
+
+
+async def load_calculation_inputs(
+    session: AsyncSession, case_id: int, revision: Optional[int] = None
+) -> CalculationInputs:
+    """
+    Load persons and the adjacency index of a case and validate them
+
+    Case ownership must be checked by the caller.
+
+    Args:
+        session: Database session
+        case_id: Case ID
+        revision: Current case revision, used to validate the cached index
+
+    Raises:
+        InvalidCalculationInput: 400 if the case has no persons or decedent,
+            422 if the family tree fails validation
+    """
+    # Decedent pointer and counters first: reject before loading persons
+    case_result = await session.execute(
+        select(Case.decedent_person_id, Case.person_count).where(Case.id == case_id)
+    )
+    decedent_id, person_count = case_result.one()
+    if decedent_id is None:
+        if not person_count:
+            raise InvalidCalculationInput(400, "No persons found in this case")
+        raise InvalidCalculationInput(
+            400, "No decedent (被相続人) specified in this case"
+        )
+
+    # Get all persons as compact rows
+    persons = await load_person_rows(session, case_id)
+
+    # Get adjacency index (cached per case)
+    index = await load_graph_index(session, case_id, revision)
+
+    # Reject invalid family trees before calculation
+    report = build_validation_report(case_id, validate_family_tree(persons, index))
+    if not report.valid:
+        raise _validation_failed(report)
+
+    return CalculationInputs(
+        persons=persons, decedent_id=decedent_id, index=index, revision=index.revision
+    )
+
+
+def preview_calculation_inputs(request: CalculationPreviewRequest) -> CalculationInputs:
+    """
+    Build and validate calculation inputs from an inline family tree
+
+    Nothing is read or written: persons keep the client's IDs, relationships
+    are numbered by their 1-based position in the request, and the case ID
+    of the index and validation report is 0.
+
+    Raises:
+        InvalidCalculationInput: 400 if person IDs are not unique,
+            422 if the family tree fails validation
+    """
+    persons = [
+        PersonRow(
+            id=p.id,
+            name=p.name,
+            is_alive=p.is_alive,
+            death_date=p.death_date,
+            birth_date=p.birth_date,
+            gender=p.gender,
+            is_decedent=p.is_decedent,
+            is_spouse=p.is_spouse,
+        )
+        for p in request.persons
+    ]
+    index = CaseGraphIndex(0)
+    for person in persons:
+        if person.id in index:
+            raise InvalidCalculationInput(400, f"Duplicate person ID {person.id}")
+        index.add_person(person.id)
+
+    # The index only holds edges between known persons
+    issues: List[ValidationIssue] = []
+    for rel_id, rel in enumerate(request.relationships, start=1):
+        if rel.from_person_id not in index or rel.to_person_id not in index:
+            issues.append(
+                ValidationIssue(
+                    code="unknown_person",
+                    message="Relationship references a person outside this tree",
+                    person_ids=[rel.from_person_id, rel.to_person_id],
+                    relationship_id=rel_id,
+                )
+            )
+            continue
+        index.add_relationship(
+            rel_id,
+            rel.from_person_id,
+            rel.to_person_id,
+            rel.relationship_type,
+            rel.is_biological,
+            rel.is_adopted,
+            rel.blood_type,
+        )
+
+    report = build_validation_report(0, issues + validate_family_tree(persons, index))
+    if not report.valid:
+        raise _validation_failed(report)
+
+    decedent_id = next(person.id for person in persons if person.is_decedent)
+    return CalculationInputs(persons=persons, decedent_id=decedent_id, index=index)
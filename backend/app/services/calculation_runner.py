@@ -0,0 +1,247 @@
+"""Bounded-time calculation execution in killable worker processes"""
+import asyncio
+import logging
+import multiprocessing
+from multiprocessing.connection import Connection
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from app.config import settings
+from app.services.graph_index import CaseGraphIndex
+from app.services.person_rows import PersonRow
+from app.services.metrics import case_size_bucket, metrics
+
+logger = logging.getLogger(__name__)
+
+# How often a waiting request checks for client disconnects (seconds)
+POLL_INTERVAL = 0.2
+
+calculation_timeouts = metrics.counter(
+    "calculation_timeouts_total",
+    "Calculations aborted because they exceeded the deadline",
+    label="case_size",
+)
+calculation_cancellations = metrics.counter(
+    "calculation_cancellations_total",
+    "Calculations aborted because the client disconnected",
+    label="case_size",
+)
+calculation_workers_busy = metrics.gauge(
+    "calculation_workers_busy",
+    "Calculation worker processes currently running a calculation",
+)
+
+
+class CalculationTimeout(Exception):
+    """Raised when a calculation exceeds its deadline"""
+
+
+class CalculationCancelled(Exception):
+    """Raised when the client disconnected before the calculation finished"""
+
+
+class CalculationError(Exception):
+    """Raised when the calculation itself failed in the worker"""
+
+
+def _worker_main(conn: Connection) -> None:
+    """Worker process loop: receive tasks, run them, send results back"""
+    from app.services.calculation_service import execute_calculation
+
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            result = execute_calculation(
+                **task, progress=lambda phase: conn.send(("progress", phase))
+            )
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+        else:
+            conn.send(("ok", result))
+
+
+class _Worker:
+    """A single calculation worker process"""
+
+    def __init__(self, ctx: multiprocessing.context.BaseContext):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    @property
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def kill(self) -> None:
+        """Terminate the process immediately"""
+        self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+
+class CalculationRunner:
+    """
+    Runs calculations in a bounded pool of worker processes
+
+    At most ``max_workers`` calculations run at once. A calculation that
+    passes its deadline, or whose client disconnects, has its worker process
+    killed so it cannot keep consuming CPU; a fresh worker replaces it.
+    """
+
+    def __init__(self, max_workers: int, timeout: float):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._ctx = multiprocessing.get_context("spawn")
+        self._slots = asyncio.Semaphore(max_workers)
+        self._idle: List[_Worker] = []
+        self._busy = 0
+
+    async def run(
+        self,
+        persons: Sequence[PersonRow],
+        decedent_id: int,
+        index: CaseGraphIndex,
+        include_tree: bool = False,
+        timeout: Optional[float] = None,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+        on_progress: Optional[Callable[[str], Awaitable[None]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run a calculation with a deadline
+
+        Args:
+            persons: Persons of the case as compact rows (sent as-is)
+            decedent_id: ID of the decedent (被相続人)
+            index: Adjacency index of the case
+            include_tree: Also render the ASCII tree
+            timeout: Deadline in seconds (defaults to the runner timeout)
+            is_disconnected: Callback reporting whether the client went away
+            on_progress: Called with each phase reported by the worker
+
+        Returns:
+            Dict with "summary" and optionally "ascii_tree"
+
+        Raises:
+            CalculationTimeout: Deadline passed (including time spent queued)
+            CalculationCancelled: Client disconnected
+            CalculationError: The calculation raised an error
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (timeout or self.timeout)
+        task = {
+            "persons": persons,
+            "decedent_id": decedent_id,
+            "index": index,
+            "include_tree": include_tree,
+        }
+        size = case_size_bucket(len(task["persons"]))
+
+        try:
+            await asyncio.wait_for(self._slots.acquire(), deadline - loop.time())
+        except asyncio.TimeoutError:
+            calculation_timeouts.inc(size)
+            raise CalculationTimeout("No calculation worker became available in time")
+
+        worker: Optional[_Worker] = None
+        calculation_workers_busy.inc()
+        self._busy += 1
+        try:
+            worker = self._idle.pop() if self._idle else _Worker(self._ctx)
+            # Pickling and writing a large case would block the event loop
+            await asyncio.to_thread(worker.conn.send, task)
+            status, payload = await self._wait(
+                worker, deadline, is_disconnected, on_progress
+            )
+        except CalculationTimeout:
+            calculation_timeouts.inc(size)
+            self._discard(worker)
+            worker = None
+            raise
+        except (CalculationCancelled, asyncio.CancelledError):
+            calculation_cancellations.inc(size)
+            self._discard(worker)
+            worker = None
+            raise
+        except BaseException:
+            self._discard(worker)
+            worker = None
+            raise
+        finally:
+            if worker is not None and worker.alive:
+                self._idle.append(worker)
+            calculation_workers_busy.dec()
+            self._busy -= 1
+            self._slots.release()
+
+        if status == "error":
+            raise CalculationError(payload)
+        return payload
+
+    async def _wait(
+        self,
+        worker: _Worker,
+        deadline: float,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]],
+        on_progress: Optional[Callable[[str], Awaitable[None]]],
+    ) -> Any:
+        loop = asyncio.get_running_loop()
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise CalculationTimeout("Calculation exceeded its deadline")
+            ready = await asyncio.to_thread(
+                worker.conn.poll, min(remaining, POLL_INTERVAL)
+            )
+            if ready:
+                try:
+                    message = await asyncio.to_thread(worker.conn.recv)
+                except (EOFError, OSError):
+                    raise CalculationError("Calculation worker exited unexpectedly")
+                if message[0] != "progress":
+                    return message
+                if on_progress is not None:
+                    await on_progress(message[1])
+                continue
+            if not worker.alive:
+                raise CalculationError("Calculation worker exited unexpectedly")
+            if is_disconnected is not None and await is_disconnected():
+                raise CalculationCancelled("Client disconnected")
+
+    def _discard(self, worker: Optional[_Worker]) -> None:
+        if worker is None:
+            return
+        logger.warning("Killing calculation worker pid=%s", worker.process.pid)
+        worker.kill()
+
+    async def drain(self, timeout: float) -> bool:
+        """
+        Wait for running calculations to finish
+
+        Returns:
+            True if none are left running, False if the timeout passed first
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self._busy and loop.time() < deadline:
+            await asyncio.sleep(POLL_INTERVAL)
+        return not self._busy
+
+    def shutdown(self) -> None:
+        """Stop all idle workers"""
+        while self._idle:
+            self._idle.pop().kill()
+
+
+# Global calculation runner instance
+calculation_runner = CalculationRunner(
+    max_workers=settings.calculation_workers,
+    timeout=settings.calculation_timeout_seconds,
+)
+
+
+def get_calculation_runner() -> CalculationRunner:
+    """Dependency for getting calculation runner"""
+    return calculation_runner
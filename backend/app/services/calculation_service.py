@@ -1,38 +1,68 @@
 """Inheritance Calculation Service using inheritance-calculator-core"""
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional, Sequence
 from datetime import datetime
+from fractions import Fraction
 
-try:
-    from inheritance_calculator_core.models import (
-        Person as CorePerson,
-        Relationship as CoreRelationship,
-        RelationshipType as CoreRelationshipType,
-        InheritanceResult,
-    )
-    from inheritance_calculator_core.services.inheritance_calculator import InheritanceCalculator
-except ImportError:
-    # Fallback for testing without core library
-    CorePerson = None  # type: ignore
-    CoreRelationship = None  # type: ignore
-    CoreRelationshipType = None  # type: ignore
-    InheritanceResult = None  # type: ignore
-    InheritanceCalculator = None  # type: ignore
+from app.models import RelationshipType
+from app.services.graph_index import CaseGraphIndex
+from app.services.person_rows import PersonRow
+
+# Core library classes, imported on first use by _load_core() so that
+# importing this module stays cheap
+CorePerson = None  # type: ignore
+CoreRelationship = None  # type: ignore
+CoreRelationshipType = None  # type: ignore
+InheritanceResult = None  # type: ignore
+InheritanceCalculator = None  # type: ignore
+ASCIITreeGenerator = None  # type: ignore
+_core_loaded = False
 
-from app.models import Person, PersonRelationship, RelationshipType
+
+def _load_core() -> bool:
+    """Import the core library once; returns False if it is not installed"""
+    global CorePerson, CoreRelationship, CoreRelationshipType, InheritanceResult
+    global InheritanceCalculator, ASCIITreeGenerator, _core_loaded
+    if not _core_loaded:
+        _core_loaded = True
+        try:
+            from inheritance_calculator_core.models import (
+                Person as CorePerson,
+                Relationship as CoreRelationship,
+                RelationshipType as CoreRelationshipType,
+                InheritanceResult,
+            )
+            from inheritance_calculator_core.services.inheritance_calculator import (
+                InheritanceCalculator,
+            )
+            from inheritance_calculator_core.output.ascii_tree import ASCIITreeGenerator
+        except ImportError:
+            # Fallback for testing without core library
+            pass
+    return InheritanceCalculator is not None
 
 
 class CalculationService:
     """Service for calculating inheritance using core library"""
 
     def __init__(self):
-        """Initialize calculation service"""
-        if InheritanceCalculator is not None:
-            self.calculator = InheritanceCalculator()
-        else:
-            self.calculator = None
-
-    def _convert_to_core_person(self, person: Person) -> CorePerson:
-        """Convert web Person model to core Person model"""
+        """Initialize calculation service (the core library loads on first use)"""
+        self._calculator = None
+        self._tree_generator = None
+
+    @property
+    def calculator(self):
+        if self._calculator is None and _load_core():
+            self._calculator = InheritanceCalculator()
+        return self._calculator
+
+    @property
+    def tree_generator(self):
+        if self._tree_generator is None and _load_core():
+            self._tree_generator = ASCIITreeGenerator()
+        return self._tree_generator
+
+    def _convert_to_core_person(self, person: PersonRow) -> CorePerson:
+        """Convert a person row to core Person model"""
         return CorePerson(
             id=str(person.id),
             name=person.name,
@@ -53,42 +83,30 @@ class CalculationService:
         }
         return mapping[rel_type]
 
-    def _convert_to_core_relationship(
-        self,
-        relationship: PersonRelationship,
-        persons_map: Dict[int, CorePerson],
-    ) -> CoreRelationship:
-        """Convert web PersonRelationship to core Relationship"""
-        return CoreRelationship(
-            from_person=persons_map[relationship.from_person_id],
-            to_person=persons_map[relationship.to_person_id],
-            relationship_type=self._convert_relationship_type(
-                relationship.relationship_type
-            ),
-            is_biological=relationship.is_biological,
-            is_adopted=relationship.is_adopted,
-            blood_type=relationship.blood_type,
-        )
-
     def calculate_inheritance(
         self,
-        persons: List[Person],
-        relationships: List[PersonRelationship],
+        persons: Sequence[PersonRow],
         decedent_id: int,
+        index: CaseGraphIndex,
+        progress: Optional[Callable[[str], None]] = None,
     ):
         """
         Calculate inheritance for a case
 
         Args:
-            persons: List of Person models
-            relationships: List of PersonRelationship models
+            persons: Person rows of the case (see load_person_rows)
             decedent_id: ID of the decedent (被相続人)
+            index: Adjacency index of the case (see load_graph_index)
+            progress: Called with the phase name ("converting", "calculating")
 
         Returns:
             InheritanceResult from core library
         """
         if self.calculator is None:
             raise RuntimeError("Inheritance calculator is not available. Core library may not be installed correctly.")
+        if progress:
+            progress("converting")
+
         # Convert persons to core models
         persons_map: Dict[int, CorePerson] = {}
         core_persons: List[CorePerson] = []
@@ -100,9 +118,25 @@ class CalculationService:
 
         # Convert relationships to core models
         core_relationships: List[CoreRelationship] = []
-        for relationship in relationships:
-            core_rel = self._convert_to_core_relationship(relationship, persons_map)
-            core_relationships.append(core_rel)
+        for (
+            _rel_id,
+            from_person_id,
+            to_person_id,
+            rel_type,
+            is_biological,
+            is_adopted,
+            blood_type,
+        ) in index.relationship_rows():
+            core_relationships.append(
+                CoreRelationship(
+                    from_person=persons_map[from_person_id],
+                    to_person=persons_map[to_person_id],
+                    relationship_type=self._convert_relationship_type(rel_type),
+                    is_biological=is_biological,
+                    is_adopted=is_adopted,
+                    blood_type=blood_type,
+                )
+            )
 
         # Find decedent
         decedent = persons_map.get(decedent_id)
@@ -110,6 +144,8 @@ class CalculationService:
             raise ValueError(f"Decedent with ID {decedent_id} not found")
 
         # Calculate inheritance
+        if progress:
+            progress("calculating")
         result = self.calculator.calculate(
             decedent=decedent,
             persons=core_persons,
@@ -130,26 +166,30 @@ class CalculationService:
         Returns:
             Dict with summary information
         """
-        summary = {
-            "decedent": {
-                "id": result.decedent.id,
-                "name": result.decedent.name,
-            },
-            "heirs": [
+        heirs = []
+        for heir in result.heirs:
+            # Exact share; the float forms are derived from it once
+            share = Fraction(heir.share.numerator, heir.share.denominator)
+            share_decimal = float(share)
+            heirs.append(
                 {
                     "id": heir.person.id,
                     "name": heir.person.name,
                     "relationship": heir.relationship,
                     "rank": heir.rank,
-                    "share_numerator": heir.share.numerator,
-                    "share_denominator": heir.share.denominator,
-                    "share_decimal": float(heir.share.numerator) / float(heir.share.denominator),
-                    "share_percentage": (
-                        float(heir.share.numerator) / float(heir.share.denominator) * 100
-                    ),
+                    "share_numerator": share.numerator,
+                    "share_denominator": share.denominator,
+                    "share_decimal": share_decimal,
+                    "share_percentage": share_decimal * 100,
                 }
-                for heir in result.heirs
-            ],
+            )
+
+        summary = {
+            "decedent": {
+                "id": result.decedent.id,
+                "name": result.decedent.name,
+            },
+            "heirs": heirs,
             "has_spouse": result.has_spouse,
             "has_children": result.has_children,
             "calculation_basis": result.calculation_basis,
@@ -167,11 +207,12 @@ class CalculationService:
         Returns:
             ASCII art family tree string
         """
-        from inheritance_calculator_core.output.ascii_tree import ASCIITreeGenerator
-
-        generator = ASCIITreeGenerator()
-        tree = generator.generate(result)
-        return tree
+        if self.tree_generator is None:
+            raise RuntimeError(
+                "ASCII tree generator is not available. "
+                "Core library may not be installed correctly."
+            )
+        return self.tree_generator.generate(result)
 
 
 # Global calculation service instance
@@ -181,3 +222,35 @@ calculation_service = CalculationService()
 def get_calculation_service() -> CalculationService:
     """Dependency for getting calculation service"""
     return calculation_service
+
+
+def execute_calculation(
+    persons: Sequence[PersonRow],
+    decedent_id: int,
+    index: CaseGraphIndex,
+    include_tree: bool = False,
+    progress: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Run a calculation and render its outputs
+
+    Entry point used by calculation worker processes; the result only
+    contains plain data so it can be sent back to the web process.
+
+    Returns:
+        Dict with "summary" and, if requested, "ascii_tree"
+    """
+    result = calculation_service.calculate_inheritance(
+        persons=persons,
+        decedent_id=decedent_id,
+        index=index,
+        progress=progress,
+    )
+    if progress:
+        progress("rendering")
+    output: Dict[str, Any] = {
+        "summary": calculation_service.get_calculation_summary(result),
+    }
+    if include_tree:
+        output["ascii_tree"] = calculation_service.generate_ascii_tree(result)
+    return output
@@ -0,0 +1,49 @@
+"""Per-case write serialization with PostgreSQL advisory locks"""
+from fastapi import HTTPException, status
+from sqlalchemy import func, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+
+# First key of pg_advisory_xact_lock(int, int) for case locks ("CASE")
+CASE_LOCK_CLASS = 0x43415345
+
+# SQLSTATE of lock_timeout expiring
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+async def lock_case(session: AsyncSession, case_id: int) -> None:
+    """
+    Hold the write lock of a case until the current transaction ends
+
+    Writes take it before reading the case, so the If-Match check, the
+    row changes and the graph store calls of concurrent writes to one case
+    run one after another, in commit order. Waiters queue in PostgreSQL;
+    after case_lock_timeout_seconds the write gives up with 409 and
+    Retry-After instead of piling up.
+
+    No-op on other databases (SQLite serializes writing transactions).
+
+    Raises:
+        HTTPException: 409 if the lock was not acquired in time
+    """
+    if session.get_bind().dialect.name != "postgresql":
+        return
+    timeout = f"{int(settings.case_lock_timeout_seconds * 1000)}ms"
+    await session.execute(select(func.set_config("lock_timeout", timeout, True)))
+    try:
+        await session.execute(
+            select(func.pg_advisory_xact_lock(CASE_LOCK_CLASS, case_id))
+        )
+    except DBAPIError as e:
+        if getattr(e.orig, "sqlstate", None) != LOCK_NOT_AVAILABLE:
+            raise
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Case is being modified by another request; retry",
+            headers={"Retry-After": "1"},
+        )
+    # Only the lock wait is bounded, not the statements of the write
+    await session.execute(select(func.set_config("lock_timeout", "0", True)))
@@ -0,0 +1,207 @@
+"""Background purge of soft-deleted cases"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
+
+from sqlalchemy import delete, func, select
+
+from app.config import settings
+from app.db import async_session_maker, engine
+from app.models import CalculationJob, Case, Person, PersonRelationship
+from app.services.metrics import metrics
+from app.services.graph_store import get_graph_store
+
+logger = logging.getLogger(__name__)
+
+# First key of pg_try_advisory_lock(int, int) for purge claims ("PRGE")
+PURGE_LOCK_CLASS = 0x50524745
+
+purge_rows_deleted = metrics.counter(
+    "case_purge_rows_deleted_total",
+    "Rows and nodes removed by the case purge",
+    label="store",
+)
+purges_finished = metrics.counter(
+    "case_purges_finished_total", "Soft-deleted cases fully purged"
+)
+purges_pending = metrics.gauge(
+    "case_purges_pending", "Soft-deleted cases waiting to be purged"
+)
+
+
+class CasePurger:
+    """
+    Deletes the data of soft-deleted cases in bounded batches
+
+    ``DELETE /cases/{id}`` only sets ``Case.deleted_at``; the persons,
+    relationships and Neo4j nodes are removed here, one batch per
+    transaction. Cases still marked deleted at startup are purged again, so
+    an interrupted purge simply resumes. Every server worker re-queues them;
+    a claim per case makes only one of them purge it.
+    """
+
+    def __init__(self, batch_size: int):
+        self.batch_size = batch_size
+        self._queue: "asyncio.Queue[int]" = asyncio.Queue()
+        self._scheduled: set = set()
+        self._task: Optional[asyncio.Task] = None
+
+    # ---------- Lifecycle ----------
+
+    async def start(self) -> None:
+        """Start the purge worker, re-queueing cases left soft-deleted"""
+        if self._task:
+            return
+        async with async_session_maker() as session:
+            result = await session.execute(
+                select(Case.id)
+                .where(Case.deleted_at.is_not(None))
+                .order_by(Case.deleted_at)
+            )
+            case_ids = list(result.scalars().all())
+        for case_id in case_ids:
+            self.schedule(case_id)
+        if case_ids:
+            logger.info("Resuming purge of %d deleted cases", len(case_ids))
+        self._task = asyncio.create_task(self._worker_loop(), name="case-purge-worker")
+
+    async def stop(self) -> None:
+        """Stop the purge worker; unfinished purges resume on next start"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    # ---------- Public API ----------
+
+    def schedule(self, case_id: int) -> None:
+        """Queue a soft-deleted case for purging"""
+        if case_id in self._scheduled:
+            return
+        self._scheduled.add(case_id)
+        self._queue.put_nowait(case_id)
+        purges_pending.inc()
+
+    # ---------- Internals ----------
+
+    async def _worker_loop(self) -> None:
+        while True:
+            case_id = await self._queue.get()
+            try:
+                async with self._claim(case_id) as claimed:
+                    if claimed:
+                        await self.purge(case_id)
+                    else:
+                        logger.info("Case %s is purged by another process", case_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Left soft-deleted; retried on next start
+                logger.exception("Purge of case %s failed", case_id)
+            finally:
+                self._scheduled.discard(case_id)
+                purges_pending.dec()
+                self._queue.task_done()
+
+    @asynccontextmanager
+    async def _claim(self, case_id: int) -> AsyncIterator[bool]:
+        """
+        Hold the purge claim of a case; yields False if another process has it
+
+        The claim is a session-level advisory lock on a connection of its own
+        in autocommit mode, so it spans the purge's transactions and is
+        released when the purge ends or the process dies. Always granted on
+        other databases, which run a single server process.
+        """
+        if engine.dialect.name != "postgresql":
+            yield True
+            return
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            claimed = await conn.scalar(
+                select(func.pg_try_advisory_lock(PURGE_LOCK_CLASS, case_id))
+            )
+            try:
+                yield bool(claimed)
+            finally:
+                if claimed:
+                    await conn.scalar(
+                        select(func.pg_advisory_unlock(PURGE_LOCK_CLASS, case_id))
+                    )
+
+    async def purge(self, case_id: int) -> None:
+        """Delete everything belonging to a soft-deleted case"""
+        async with async_session_maker() as session:
+            pending = await session.scalar(
+                select(Case.id).where(Case.id == case_id, Case.deleted_at.is_not(None))
+            )
+        if pending is None:
+            # Purged by another process before this one got the claim
+            return
+        logger.info("Purging case %s", case_id)
+
+        # Graph store: nodes tagged with the case, in batched transactions
+        graph_store = await get_graph_store()
+        deleted = await graph_store.purge_case_graph(case_id, self.batch_size)
+        purge_rows_deleted.inc("neo4j", deleted)
+
+        # PostgreSQL: relationships first, so person deletes cascade to nothing
+        total = 0
+        while True:
+            async with async_session_maker() as session:
+                ids_result = await session.execute(
+                    select(PersonRelationship.id)
+                    .where(PersonRelationship.case_id == case_id)
+                    .limit(self.batch_size)
+                )
+                ids = list(ids_result.scalars().all())
+                if not ids:
+                    break
+                await session.execute(
+                    delete(PersonRelationship).where(PersonRelationship.id.in_(ids))
+                )
+                await session.commit()
+            total += len(ids)
+            purge_rows_deleted.inc("relationships", len(ids))
+            logger.info("Case %s: deleted %d relationships", case_id, total)
+
+        total = 0
+        while True:
+            async with async_session_maker() as session:
+                rows_result = await session.execute(
+                    select(Person.id, Person.neo4j_node_id)
+                    .where(Person.case_id == case_id)
+                    .limit(self.batch_size)
+                )
+                rows = rows_result.all()
+                if not rows:
+                    break
+                # Nodes created before they were tagged with case_id
+                node_ids: List[str] = [node_id for _, node_id in rows if node_id]
+                await graph_store.delete_person_nodes(node_ids)
+                await session.execute(
+                    delete(Person).where(
+                        Person.id.in_([person_id for person_id, _ in rows])
+                    )
+                )
+                await session.commit()
+            total += len(rows)
+            purge_rows_deleted.inc("persons", len(rows))
+            logger.info("Case %s: deleted %d persons", case_id, total)
+
+        async with async_session_maker() as session:
+            await session.execute(
+                delete(CalculationJob).where(CalculationJob.case_id == case_id)
+            )
+            await session.execute(
+                delete(Case).where(Case.id == case_id, Case.deleted_at.is_not(None))
+            )
+            await session.commit()
+
+        purges_finished.inc()
+        logger.info("Purged case %s", case_id)
+
+
+# Global case purger
+case_purger = CasePurger(batch_size=settings.case_purge_batch_size)
@@ -0,0 +1,146 @@
+"""Case revision tracking and revision-based HTTP caching"""
+import hashlib
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Case
+from app.services.case_stats import decedent_stats, recounted_stats
+
+# Cases (archived ones included) can still change, so clients must
+# revalidate with If-None-Match on every use
+DEFAULT_CACHE_CONTROL = "private, no-cache"
+
+
+async def touch_case(
+    session: AsyncSession,
+    case_id: int,
+    persons: int = 0,
+    relationships: int = 0,
+    decedent: bool = False,
+    recount: bool = False,
+    response: Optional[Response] = None,
+) -> int:
+    """
+    Bump the revision and updated_at of a case in the current transaction
+
+    Must be called by every write to the case, its persons or its
+    relationships so that ETags and revision-keyed caches change. The
+    per-case counters are maintained in the same UPDATE.
+
+    Args:
+        persons: Change in the number of persons
+        relationships: Change in the number of relationships
+        decedent: Whether the decedent flag of some person may have changed
+            (refreshes decedent_person_id and has_decedent)
+        recount: Recompute all counters from rows (e.g. after cascading deletes)
+        response: If given, gets the case ETag after this write, for the
+            client's next If-Match
+
+    Returns:
+        The new revision
+    """
+    now = datetime.utcnow()
+    values: Dict[str, Any] = {"revision": Case.revision + 1, "updated_at": now}
+    if recount:
+        values.update(recounted_stats(case_id))
+    else:
+        if persons:
+            values["person_count"] = Case.person_count + persons
+        if relationships:
+            values["relationship_count"] = Case.relationship_count + relationships
+        if decedent:
+            values.update(decedent_stats(case_id))
+    result = await session.execute(
+        update(Case)
+        .where(Case.id == case_id)
+        .values(**values)
+        .returning(Case.revision, Case.last_calculated_at)
+        .execution_options(synchronize_session=False)
+    )
+    revision, last_calculated_at = result.one()
+    if response is not None:
+        response.headers["ETag"] = case_etag(
+            case_id, revision, now, last_calculated_at=last_calculated_at
+        )
+    return revision
+
+
+def make_etag(*parts: object) -> str:
+    """Build a strong ETag from the given parts"""
+    digest = hashlib.blake2b(
+        "|".join(str(part) for part in parts).encode(), digest_size=12
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def case_etag(
+    case_id: int,
+    revision: int,
+    updated_at: datetime,
+    variant: str = "case",
+    last_calculated_at: Optional[datetime] = None,
+) -> str:
+    """
+    ETag of a case representation (variant distinguishes endpoints)
+
+    Representations that include the case itself (CaseRead) must pass
+    last_calculated_at: calculations change it without bumping the revision.
+    """
+    return make_etag(
+        variant,
+        case_id,
+        revision,
+        updated_at.isoformat(),
+        last_calculated_at.isoformat() if last_calculated_at else "",
+    )
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def check_if_match(if_match: Optional[str], case: Case) -> None:
+    """
+    Reject a write unless If-Match (when sent) names the current case ETag
+
+    Uses strong comparison, as RFC 9110 requires for If-Match.
+
+    Raises:
+        HTTPException: 412 if the case changed since the client read it
+    """
+    if not if_match or if_match.strip() == "*":
+        return
+    etag = case_etag(
+        case.id,
+        case.revision,
+        case.updated_at,
+        last_calculated_at=case.last_calculated_at,
+    )
+    if etag not in (tag.strip() for tag in if_match.split(",")):
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Case has changed since it was read; reload and retry",
+        )
+
+
+def set_cache_headers(response: Response, etag: str, cache_control: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    """Build an empty 304 response carrying the validators"""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": cache_control},
+    )
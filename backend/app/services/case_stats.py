@@ -0,0 +1,186 @@
+"""
+Denormalized per-case counters (persons, relationships, decedent, last calculation)
+
+The counters on Case are maintained by touch_case in the same transaction
+as each write. repair_case_stats recomputes them from the rows:
+
+    python -m app.services.case_stats            # report and fix drift
+    python -m app.services.case_stats --dry-run  # only report
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import and_, exists, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Case, Person, PersonRelationship
+
+logger = logging.getLogger(__name__)
+
+REPAIR_BATCH_SIZE = 1000
+
+
+def person_count_of(case_id: Any):
+    """Scalar subquery counting a case's persons (case_id may be a column)"""
+    return (
+        select(func.count(Person.id)).where(Person.case_id == case_id).scalar_subquery()
+    )
+
+
+def relationship_count_of(case_id: Any):
+    """Scalar subquery counting a case's relationships"""
+    return (
+        select(func.count(PersonRelationship.id))
+        .where(PersonRelationship.case_id == case_id)
+        .scalar_subquery()
+    )
+
+
+def has_decedent_of(case_id: Any):
+    """EXISTS clause: whether a case has a person marked as decedent"""
+    return exists().where(and_(Person.case_id == case_id, Person.is_decedent.is_(True)))
+
+
+def decedent_of(case_id: Any):
+    """Scalar subquery: ID of the case's decedent (unique index lookup)"""
+    return (
+        select(Person.id)
+        .where(and_(Person.case_id == case_id, Person.is_decedent.is_(True)))
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+def decedent_stats(case_id: Any) -> Dict[str, Any]:
+    """UPDATE values refreshing the decedent pointer and flag of a case"""
+    return {
+        "decedent_person_id": decedent_of(case_id),
+        "has_decedent": has_decedent_of(case_id),
+    }
+
+
+def recounted_stats(case_id: Any) -> Dict[str, Any]:
+    """UPDATE values recomputing every row-derived counter of a case"""
+    return {
+        "person_count": person_count_of(case_id),
+        "relationship_count": relationship_count_of(case_id),
+        **decedent_stats(case_id),
+    }
+
+
+def result_fingerprint(summary: Dict[str, Any]) -> str:
+    """Digest of a calculation's outcome (decedent, heirs and their shares)"""
+    outcome = {
+        "decedent": summary["decedent"]["id"],
+        "heirs": sorted(
+            (str(heir["id"]), heir["share_numerator"], heir["share_denominator"])
+            for heir in summary["heirs"]
+        ),
+    }
+    payload = json.dumps(outcome, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+async def record_calculation(
+    session: AsyncSession, case_id: int, revision: int, summary: Dict[str, Any]
+) -> None:
+    """
+    Store when a case was last calculated and a fingerprint of the result
+
+    Only applies if the case is still at the calculated revision, and keeps
+    updated_at and the revision unchanged (a calculation does not change
+    the case), so last_calculated_at >= updated_at means "up to date".
+    """
+    await session.execute(
+        update(Case)
+        .where(and_(Case.id == case_id, Case.revision == revision))
+        .values(
+            last_calculated_at=datetime.utcnow(),
+            last_result_fingerprint=result_fingerprint(summary),
+            updated_at=Case.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+
+
+async def repair_case_stats(
+    session: AsyncSession, case_id: Optional[int] = None, dry_run: bool = False
+) -> int:
+    """
+    Recompute counters from rows for every case (or one), in id batches
+
+    Returns:
+        Number of cases whose counters were wrong
+    """
+    drifted = or_(
+        Case.person_count != person_count_of(Case.id),
+        Case.relationship_count != relationship_count_of(Case.id),
+        Case.has_decedent != has_decedent_of(Case.id),
+        # NULL-safe: pointer set without a decedent, or the other way round
+        func.coalesce(Case.decedent_person_id, 0)
+        != func.coalesce(decedent_of(Case.id), 0),
+    )
+    fixed = 0
+    last_id = 0
+    while True:
+        batch = (
+            select(Case.id)
+            .where(Case.id > last_id)
+            .order_by(Case.id)
+            .limit(REPAIR_BATCH_SIZE)
+        )
+        if case_id is not None:
+            batch = batch.where(Case.id == case_id)
+        ids = list((await session.execute(batch)).scalars().all())
+        if not ids:
+            break
+        last_id = ids[-1]
+
+        wrong_result = await session.execute(
+            select(Case.id).where(and_(Case.id.in_(ids), drifted))
+        )
+        wrong = list(wrong_result.scalars().all())
+        if wrong:
+            logger.warning("Case counters out of date: %s", wrong)
+            if not dry_run:
+                await session.execute(
+                    update(Case)
+                    .where(Case.id.in_(wrong))
+                    .values(**recounted_stats(Case.id), updated_at=Case.updated_at)
+                    .execution_options(synchronize_session=False)
+                )
+                await session.commit()
+        fixed += len(wrong)
+    return fixed
+
+
+async def _repair(case_id: Optional[int], dry_run: bool) -> int:
+    from app.db import async_session_maker, engine
+
+    try:
+        async with async_session_maker() as session:
+            return await repair_case_stats(session, case_id, dry_run)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check and repair per-case counters")
+    parser.add_argument("--case-id", type=int, help="Only this case")
+    parser.add_argument("--dry-run", action="store_true", help="Report without fixing")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    count = asyncio.run(_repair(args.case_id, args.dry_run))
+    verb = "found" if args.dry_run else "repaired"
+    print(f"{verb} {count} case(s) with out-of-date counters")
+
+
+if __name__ == "__main__":
+    main()
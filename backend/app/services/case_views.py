@@ -0,0 +1,189 @@
+"""Reduced representations of a case: field selection and the compact graph view"""
+import enum
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Person, PersonRelationship
+from app.schemas import PersonRead, RelationshipRead
+
+VIEWS = ("full", "graph")
+
+PERSON_FIELDS: Tuple[str, ...] = tuple(PersonRead.model_fields)
+RELATIONSHIP_FIELDS: Tuple[str, ...] = tuple(RelationshipRead.model_fields)
+
+# Fields of the graph view unless selected otherwise; persons are referred
+# to by their position in the persons array
+GRAPH_PERSON_FIELDS = (
+    "id", "name", "is_alive", "death_date", "birth_date", "gender",
+    "is_decedent", "is_spouse",
+)
+GRAPH_RELATIONSHIP_FIELDS = (
+    "relationship_type", "is_biological", "is_adopted", "blood_type",
+)
+
+
+class FieldSelection(NamedTuple):
+    """Person and relationship fields to return, in schema order"""
+    persons: Tuple[str, ...]
+    relationships: Tuple[str, ...]
+
+
+def _split(text: Optional[str]) -> List[str]:
+    return [name.strip() for name in (text or "").split(",") if name.strip()]
+
+
+def _resolve(names: List[str]) -> Tuple[set, set]:
+    """
+    Map field names to (person fields, relationship fields)
+
+    A bare name applies to persons and relationships wherever it exists;
+    "persons.<name>" or "relationships.<name>" applies to one of them.
+
+    Raises:
+        ValueError: For a name that is no field of either
+    """
+    persons: set = set()
+    relationships: set = set()
+    for name in names:
+        scope, _, field = name.rpartition(".")
+        in_persons = field in PERSON_FIELDS and scope in ("", "persons")
+        in_relationships = (
+            field in RELATIONSHIP_FIELDS and scope in ("", "relationships")
+        )
+        if not (in_persons or in_relationships):
+            raise ValueError(f"Unknown field: {name}")
+        if in_persons:
+            persons.add(field)
+        if in_relationships:
+            relationships.add(field)
+    return persons, relationships
+
+
+def parse_field_selection(
+    fields: Optional[str], exclude: Optional[str], view: str = "full"
+) -> FieldSelection:
+    """
+    Resolve fields= / exclude= query parameters for a view
+
+    Without fields=, the view's defaults are used (everything for the full
+    view). In the full view persons and relationships always keep their id.
+
+    Raises:
+        ValueError: For an unknown field
+    """
+    selected = _split(fields)
+    if selected:
+        persons, relationships = _resolve(selected)
+    elif view == "graph":
+        persons = set(GRAPH_PERSON_FIELDS)
+        relationships = set(GRAPH_RELATIONSHIP_FIELDS)
+    else:
+        persons, relationships = set(PERSON_FIELDS), set(RELATIONSHIP_FIELDS)
+    excluded_persons, excluded_relationships = _resolve(_split(exclude))
+    persons -= excluded_persons
+    relationships -= excluded_relationships
+    if view == "full":
+        persons.add("id")
+        relationships.add("id")
+    return FieldSelection(
+        persons=tuple(name for name in PERSON_FIELDS if name in persons),
+        relationships=tuple(
+            name for name in RELATIONSHIP_FIELDS if name in relationships
+        ),
+    )
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+async def load_case_view(
+    session: AsyncSession, case_id: int, view: str, selection: FieldSelection
+) -> Dict[str, Any]:
+    """
+    Load persons and relationships of a case in a reduced representation
+
+    Only the selected columns are queried. The full view returns objects
+    with the selected fields. The graph view returns each person as an
+    array of values (see "person_fields") and each relationship as
+    [from index, to index, values...] into the persons array (see
+    "relationship_fields").
+
+    Returns:
+        Dict with the "persons" and "relationships" parts of the response
+    """
+    person_columns = [getattr(Person, name) for name in selection.persons]
+    relationship_columns = [
+        getattr(PersonRelationship, name) for name in selection.relationships
+    ]
+
+    if view == "full":
+        persons_result = await session.execute(
+            select(*person_columns)
+            .where(Person.case_id == case_id)
+            .order_by(Person.id)
+        )
+        rels_result = await session.execute(
+            select(*relationship_columns)
+            .where(PersonRelationship.case_id == case_id)
+            .order_by(PersonRelationship.id)
+        )
+        return {
+            "persons": [
+                {
+                    name: _json_value(value)
+                    for name, value in zip(selection.persons, row)
+                }
+                for row in persons_result.tuples()
+            ],
+            "relationships": [
+                {
+                    name: _json_value(value)
+                    for name, value in zip(selection.relationships, row)
+                }
+                for row in rels_result.tuples()
+            ],
+        }
+
+    # Graph view: the person ID and endpoints are always read to build indices
+    persons_result = await session.execute(
+        select(Person.id, *person_columns)
+        .where(Person.case_id == case_id)
+        .order_by(Person.id)
+    )
+    positions: Dict[int, int] = {}
+    persons: List[List[Any]] = []
+    for position, (person_id, *values) in enumerate(persons_result.tuples()):
+        positions[person_id] = position
+        persons.append([_json_value(value) for value in values])
+
+    rels_result = await session.execute(
+        select(
+            PersonRelationship.from_person_id,
+            PersonRelationship.to_person_id,
+            *relationship_columns,
+        )
+        .where(PersonRelationship.case_id == case_id)
+        .order_by(PersonRelationship.id)
+    )
+    relationships = [
+        [
+            positions[from_id],
+            positions[to_id],
+            *(_json_value(value) for value in values),
+        ]
+        for from_id, to_id, *values in rels_result.tuples()
+    ]
+    return {
+        "person_fields": list(selection.persons),
+        "persons": persons,
+        "relationship_fields": ["from", "to", *selection.relationships],
+        "relationships": relationships,
+    }
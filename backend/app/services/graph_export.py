@@ -0,0 +1,295 @@
+"""Server-side family tree export as Graphviz DOT, Mermaid and SVG"""
+from html import escape
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from app.config import settings
+from app.models import RelationshipType
+from app.services.graph_index import CaseGraphIndex
+from app.services.result_cache import LRUCache
+from app.services.validation_service import topological_order
+
+EXPORT_FORMATS = ("dot", "mermaid", "svg")
+EXPORT_MEDIA_TYPES = {
+    "dot": "text/vnd.graphviz; charset=utf-8",
+    "mermaid": "text/plain; charset=utf-8",
+    "svg": "image/svg+xml",
+}
+
+# Crossing-reduction sweeps; fixed so layout time stays bounded
+BARYCENTER_SWEEPS = 4
+
+# SVG geometry (px)
+NODE_WIDTH = 140
+NODE_HEIGHT = 44
+H_GAP = 30
+V_GAP = 60
+MARGIN = 20
+
+
+class PersonNode(NamedTuple):
+    """What the exporters show for one person"""
+    label: str
+    is_decedent: bool
+    share: Optional[str]
+
+
+class Layout(NamedTuple):
+    """Generation-ranked layout: rows[rank] lists person IDs left to right"""
+    rank: Dict[int, int]
+    rows: List[List[int]]
+
+
+def _rank_generations(index: CaseGraphIndex) -> Dict[int, int]:
+    """Longest-path generation ranks, with spouses pulled onto the same rank"""
+    ordered, cyclic = topological_order(index)
+    rank: Dict[int, int] = {person_id: 0 for person_id in cyclic}
+
+    def propagate() -> None:
+        for person_id in ordered:
+            parents = [
+                p for p in index.parents(person_id) if p in rank and p != person_id
+            ]
+            rank[person_id] = max(
+                [rank.get(person_id, 0)] + [rank[p] + 1 for p in parents]
+            )
+
+    propagate()
+    # Spouses share a row; one more pass keeps children below both
+    for person_id in ordered:
+        for spouse_id in index.spouses(person_id):
+            level = max(rank[person_id], rank[spouse_id])
+            rank[person_id] = rank[spouse_id] = level
+    propagate()
+    return rank
+
+
+def _keep_spouses_adjacent(row: List[int], index: CaseGraphIndex) -> List[int]:
+    placed: List[int] = []
+    done = set()
+    members = set(row)
+    for person_id in row:
+        if person_id in done:
+            continue
+        placed.append(person_id)
+        done.add(person_id)
+        for spouse_id in index.spouses(person_id):
+            if spouse_id in members and spouse_id not in done:
+                placed.append(spouse_id)
+                done.add(spouse_id)
+    return placed
+
+
+def layout_family(index: CaseGraphIndex) -> Layout:
+    """
+    Lay out persons by generation with barycenter crossing reduction
+
+    Runs in O(sweeps * (V + E) log V): each sweep reorders every row by
+    the mean position of the person's neighbours in the adjacent row.
+    """
+    rank = _rank_generations(index)
+    depth = max(rank.values(), default=-1) + 1
+    rows: List[List[int]] = [[] for _ in range(depth)]
+    for person_id in sorted(rank):
+        rows[rank[person_id]].append(person_id)
+
+    for sweep in range(BARYCENTER_SWEEPS):
+        downward = sweep % 2 == 0
+        order = range(1, depth) if downward else range(depth - 2, -1, -1)
+        for r in order:
+            reference = rows[r - 1] if downward else rows[r + 1]
+            position = {person_id: i for i, person_id in enumerate(reference)}
+
+            def barycenter(person_id: int, current: int) -> float:
+                neighbours = (
+                    index.parents(person_id)
+                    if downward
+                    else index.children(person_id)
+                )
+                placed = [position[n] for n in neighbours if n in position]
+                return sum(placed) / len(placed) if placed else float(current)
+
+            row = rows[r]
+            keyed = sorted(
+                range(len(row)), key=lambda i: (barycenter(row[i], i), i)
+            )
+            rows[r] = _keep_spouses_adjacent([row[i] for i in keyed], index)
+
+    return Layout(rank=rank, rows=rows)
+
+
+def _pairs(
+    index: CaseGraphIndex, relationship_type: RelationshipType
+) -> List[Tuple[int, int]]:
+    """(from_person_id, to_person_id) of every edge of one type"""
+    table = index.edges[relationship_type]
+    person_ids = index.person_ids
+    return [
+        (person_ids[src], person_ids[dst]) for src, dst in zip(table.src, table.dst)
+    ]
+
+
+def _node_text(node: PersonNode) -> List[str]:
+    lines = [node.label]
+    if node.is_decedent:
+        lines.append("(被相続人)")
+    elif node.share:
+        lines.append(node.share)
+    return lines
+
+
+def render_dot(
+    index: CaseGraphIndex, nodes: Dict[int, PersonNode], layout: Layout
+) -> str:
+    """Graphviz DOT with one rank=same group per generation"""
+
+    def quote(lines: List[str]) -> str:
+        escaped = (line.replace("\\", "\\\\").replace('"', '\\"') for line in lines)
+        return '"' + "\\n".join(escaped) + '"'
+
+    lines = [
+        "digraph family {",
+        "  rankdir=TB;",
+        '  node [shape=box, style="rounded"];',
+    ]
+    for person_id, node in nodes.items():
+        attrs = [f"label={quote(_node_text(node))}"]
+        if node.is_decedent:
+            attrs.append("penwidth=2")
+        elif node.share:
+            attrs.append('style="rounded,filled", fillcolor="#e8f1ff"')
+        lines.append(f"  p{person_id} [{', '.join(attrs)}];")
+    for row in layout.rows:
+        if len(row) > 1:
+            lines.append("  { rank=same; " + " ".join(f"p{p};" for p in row) + " }")
+    for child, parent in _pairs(index, RelationshipType.CHILD_OF):
+        lines.append(f"  p{parent} -> p{child};")
+    for a, b in _pairs(index, RelationshipType.SPOUSE_OF):
+        lines.append(f"  p{a} -> p{b} [dir=none, style=bold, constraint=false];")
+    for a, b in _pairs(index, RelationshipType.SIBLING_OF):
+        lines.append(f"  p{a} -> p{b} [dir=none, style=dashed, constraint=false];")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def render_mermaid(
+    index: CaseGraphIndex, nodes: Dict[int, PersonNode], layout: Layout
+) -> str:
+    """Mermaid flowchart; nodes are declared generation by generation"""
+
+    def quote(lines: List[str]) -> str:
+        escaped = (escape(line, quote=False).replace('"', "#quot;") for line in lines)
+        return '"' + "<br/>".join(escaped) + '"'
+
+    lines = ["flowchart TD"]
+    for row in layout.rows:
+        for person_id in row:
+            node = nodes[person_id]
+            lines.append(f"  p{person_id}[{quote(_node_text(node))}]")
+    for child, parent in _pairs(index, RelationshipType.CHILD_OF):
+        lines.append(f"  p{parent} --> p{child}")
+    for a, b in _pairs(index, RelationshipType.SPOUSE_OF):
+        lines.append(f"  p{a} === p{b}")
+    for a, b in _pairs(index, RelationshipType.SIBLING_OF):
+        lines.append(f"  p{a} -.- p{b}")
+    lines.append("  classDef decedent stroke-width:3px")
+    lines.append("  classDef heir fill:#e8f1ff")
+    decedents = [f"p{p}" for p, n in nodes.items() if n.is_decedent]
+    heirs = [f"p{p}" for p, n in nodes.items() if n.share and not n.is_decedent]
+    if decedents:
+        lines.append(f"  class {','.join(decedents)} decedent")
+    if heirs:
+        lines.append(f"  class {','.join(heirs)} heir")
+    return "\n".join(lines) + "\n"
+
+
+def render_svg(
+    index: CaseGraphIndex, nodes: Dict[int, PersonNode], layout: Layout
+) -> str:
+    """Self-contained SVG drawn from the layout; no client-side layout needed"""
+    widest = max((len(row) for row in layout.rows), default=0)
+    width = max(widest * (NODE_WIDTH + H_GAP) - H_GAP, 0) + 2 * MARGIN
+    height = max(len(layout.rows) * (NODE_HEIGHT + V_GAP) - V_GAP, 0) + 2 * MARGIN
+
+    position: Dict[int, Tuple[float, float]] = {}
+    for r, row in enumerate(layout.rows):
+        row_width = len(row) * (NODE_WIDTH + H_GAP) - H_GAP
+        offset = MARGIN + (width - 2 * MARGIN - row_width) / 2
+        for i, person_id in enumerate(row):
+            position[person_id] = (
+                offset + i * (NODE_WIDTH + H_GAP),
+                MARGIN + r * (NODE_HEIGHT + V_GAP),
+            )
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" '
+        f'width="{width:.0f}" height="{height:.0f}" '
+        f'viewBox="0 0 {width:.0f} {height:.0f}" '
+        'font-family="sans-serif" font-size="12">',
+        "<style>"
+        ".n{fill:#fff;stroke:#555}.h{fill:#e8f1ff}.d{stroke-width:3}"
+        ".c{fill:none;stroke:#555}.s{stroke:#555;stroke-width:3}"
+        ".b{stroke:#999;stroke-dasharray:4 3}"
+        "</style>",
+    ]
+
+    for child, parent in _pairs(index, RelationshipType.CHILD_OF):
+        if parent not in position or child not in position:
+            continue
+        px, py = position[parent]
+        cx, cy = position[child]
+        x1, y1 = px + NODE_WIDTH / 2, py + NODE_HEIGHT
+        x2, y2 = cx + NODE_WIDTH / 2, cy
+        mid = (y1 + y2) / 2
+        parts.append(
+            f'<path class="c" d="M{x1:.0f},{y1:.0f} V{mid:.0f} H{x2:.0f} V{y2:.0f}"/>'
+        )
+    for relationship_type, css in (
+        (RelationshipType.SPOUSE_OF, "s"),
+        (RelationshipType.SIBLING_OF, "b"),
+    ):
+        for a, b in _pairs(index, relationship_type):
+            if a not in position or b not in position:
+                continue
+            (ax, ay), (bx, by) = position[a], position[b]
+            parts.append(
+                f'<line class="{css}" '
+                f'x1="{ax + NODE_WIDTH / 2:.0f}" y1="{ay + NODE_HEIGHT / 2:.0f}" '
+                f'x2="{bx + NODE_WIDTH / 2:.0f}" y2="{by + NODE_HEIGHT / 2:.0f}"/>'
+            )
+
+    for person_id, (x, y) in position.items():
+        node = nodes[person_id]
+        css = "n" + (" d" if node.is_decedent else "") + (" h" if node.share else "")
+        parts.append(
+            f'<rect class="{css}" x="{x:.0f}" y="{y:.0f}" rx="6" '
+            f'width="{NODE_WIDTH}" height="{NODE_HEIGHT}"/>'
+        )
+        text = _node_text(node)
+        for i, line in enumerate(text):
+            ty = y + NODE_HEIGHT / 2 + (i - (len(text) - 1) / 2) * 15 + 4
+            parts.append(
+                f'<text x="{x + NODE_WIDTH / 2:.0f}" y="{ty:.0f}" text-anchor="middle">'
+                f"{escape(line)}</text>"
+            )
+
+    parts.append("</svg>")
+    return "\n".join(parts) + "\n"
+
+
+RENDERERS = {"dot": render_dot, "mermaid": render_mermaid, "svg": render_svg}
+
+
+def export_family_tree(
+    index: CaseGraphIndex, nodes: Dict[int, PersonNode], fmt: str
+) -> str:
+    """Lay out the case graph and render it in the given format"""
+    return RENDERERS[fmt](index, nodes, layout_family(index))
+
+
+ExportKey = Tuple[int, int, str]
+
+
+# Global export cache, keyed by (case_id, revision, format)
+graph_export_cache: LRUCache[ExportKey, str] = LRUCache(
+    max_size=settings.graph_export_cache_size
+)
@@ -0,0 +1,541 @@
+"""Per-case adjacency index for family tree traversal"""
+from array import array
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models import Person, PersonRelationship, RelationshipType
+from app.services.result_cache import LRUCache
+
+# Tri-state encoding for nullable boolean columns
+FLAG_UNKNOWN = -1
+
+# Blood type encoding for sibling edges ("full" / "half")
+BLOOD_UNKNOWN = 0
+BLOOD_FULL = 1
+BLOOD_HALF = 2
+BLOOD_OTHER = 3
+
+_BLOOD_CODES = {"full": BLOOD_FULL, "half": BLOOD_HALF}
+_BLOOD_NAMES = {BLOOD_FULL: "full", BLOOD_HALF: "half"}
+
+RelationshipRow = Tuple[
+    int, int, int, RelationshipType, Optional[bool], Optional[bool], Optional[str]
+]
+
+
+def _encode_flag(value: Optional[bool]) -> int:
+    return FLAG_UNKNOWN if value is None else int(value)
+
+
+def _decode_flag(value: int) -> Optional[bool]:
+    return None if value == FLAG_UNKNOWN else bool(value)
+
+
+class EdgeTable:
+    """Column-oriented storage for the edges of one relationship type"""
+
+    __slots__ = (
+        "rel_ids",
+        "src",
+        "dst",
+        "biological",
+        "adopted",
+        "blood",
+        "_position",
+        "_other_blood",
+    )
+
+    def __init__(self):
+        self.rel_ids = array("q")
+        self.src = array("i")
+        self.dst = array("i")
+        self.biological = array("b")
+        self.adopted = array("b")
+        self.blood = array("b")
+        self._position: Dict[int, int] = {}
+        self._other_blood: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.rel_ids)
+
+    def __contains__(self, rel_id: int) -> bool:
+        return rel_id in self._position
+
+    def add(
+        self,
+        rel_id: int,
+        src: int,
+        dst: int,
+        is_biological: Optional[bool],
+        is_adopted: Optional[bool],
+        blood_type: Optional[str],
+    ) -> None:
+        """Append an edge (src/dst are person slots)"""
+        if rel_id in self._position:
+            raise ValueError(f"Relationship {rel_id} already indexed")
+        if blood_type is None:
+            blood = BLOOD_UNKNOWN
+        else:
+            blood = _BLOOD_CODES.get(blood_type, BLOOD_OTHER)
+            if blood == BLOOD_OTHER:
+                self._other_blood[rel_id] = blood_type
+
+        self._position[rel_id] = len(self.rel_ids)
+        self.rel_ids.append(rel_id)
+        self.src.append(src)
+        self.dst.append(dst)
+        self.biological.append(_encode_flag(is_biological))
+        self.adopted.append(_encode_flag(is_adopted))
+        self.blood.append(blood)
+
+    def remove(self, rel_id: int) -> Tuple[int, int]:
+        """Remove an edge in O(1) by swapping with the last one"""
+        pos = self._position.pop(rel_id)
+        endpoints = (self.src[pos], self.dst[pos])
+        last = len(self.rel_ids) - 1
+
+        if pos != last:
+            moved_id = self.rel_ids[last]
+            for column in (
+                self.rel_ids,
+                self.src,
+                self.dst,
+                self.biological,
+                self.adopted,
+                self.blood,
+            ):
+                column[pos] = column[last]
+            self._position[moved_id] = pos
+
+        for column in (
+            self.rel_ids,
+            self.src,
+            self.dst,
+            self.biological,
+            self.adopted,
+            self.blood,
+        ):
+            column.pop()
+        self._other_blood.pop(rel_id, None)
+        return endpoints
+
+    def copy(self) -> "EdgeTable":
+        """Get an independent copy of the table"""
+        table = EdgeTable()
+        table.rel_ids = self.rel_ids[:]
+        table.src = self.src[:]
+        table.dst = self.dst[:]
+        table.biological = self.biological[:]
+        table.adopted = self.adopted[:]
+        table.blood = self.blood[:]
+        table._position = dict(self._position)
+        table._other_blood = dict(self._other_blood)
+        return table
+
+    def endpoints(self, rel_id: int) -> Tuple[int, int]:
+        """Get (src, dst) slots of an edge"""
+        pos = self._position[rel_id]
+        return self.src[pos], self.dst[pos]
+
+    def blood_type(self, rel_id: int) -> Optional[str]:
+        """Get the decoded blood type of an edge"""
+        code = self.blood[self._position[rel_id]]
+        if code == BLOOD_OTHER:
+            return self._other_blood[rel_id]
+        return _BLOOD_NAMES.get(code)
+
+    def rows(
+        self,
+    ) -> Iterator[Tuple[int, int, int, Optional[bool], Optional[bool], Optional[str]]]:
+        """Iterate edges as (rel_id, src, dst, is_biological, is_adopted, blood_type)"""
+        for pos, rel_id in enumerate(self.rel_ids):
+            code = self.blood[pos]
+            if code == BLOOD_OTHER:
+                blood_type: Optional[str] = self._other_blood[rel_id]
+            else:
+                blood_type = _BLOOD_NAMES.get(code)
+            yield (
+                rel_id,
+                self.src[pos],
+                self.dst[pos],
+                _decode_flag(self.biological[pos]),
+                _decode_flag(self.adopted[pos]),
+                blood_type,
+            )
+
+
+class CaseGraphIndex:
+    """
+    Compact adjacency index of a case's family tree
+
+    Persons are mapped to integer slots. Edges are stored per relationship
+    type in column arrays, and each slot keeps the relationship IDs of its
+    parents, children, spouses and siblings so neighbours are found without
+    scanning the relationship list.
+    """
+
+    __slots__ = (
+        "case_id",
+        "revision",
+        "person_ids",
+        "edges",
+        "_slots",
+        "_free",
+        "_parent_rels",
+        "_child_rels",
+        "_spouse_rels",
+        "_sibling_rels",
+    )
+
+    def __init__(self, case_id: int, revision: Optional[int] = None):
+        self.case_id = case_id
+        self.revision = revision
+        self.person_ids = array("q")
+        self.edges: Dict[RelationshipType, EdgeTable] = {
+            rel_type: EdgeTable() for rel_type in RelationshipType
+        }
+        self._slots: Dict[int, int] = {}
+        self._free: List[int] = []
+        self._parent_rels: List[List[int]] = []
+        self._child_rels: List[List[int]] = []
+        self._spouse_rels: List[List[int]] = []
+        self._sibling_rels: List[List[int]] = []
+
+    @classmethod
+    def from_rows(
+        cls,
+        case_id: int,
+        person_ids: Iterable[int],
+        relationships: Iterable[RelationshipRow],
+        revision: Optional[int] = None,
+    ) -> "CaseGraphIndex":
+        """
+        Build an index from column rows
+
+        Args:
+            case_id: Case ID
+            person_ids: IDs of all persons in the case
+            relationships: (id, from_person_id, to_person_id, relationship_type,
+                is_biological, is_adopted, blood_type) rows
+            revision: Case revision the rows were read at
+        """
+        index = cls(case_id, revision)
+        for person_id in person_ids:
+            index.add_person(person_id)
+        for row in relationships:
+            index.add_relationship(*row)
+        return index
+
+    def copy(self) -> "CaseGraphIndex":
+        """Get an independent copy of the index (cost is linear in its size)"""
+        index = CaseGraphIndex(self.case_id, self.revision)
+        index.person_ids = self.person_ids[:]
+        index.edges = {
+            relationship_type: table.copy()
+            for relationship_type, table in self.edges.items()
+        }
+        index._slots = dict(self._slots)
+        index._free = list(self._free)
+        index._parent_rels = [list(rels) for rels in self._parent_rels]
+        index._child_rels = [list(rels) for rels in self._child_rels]
+        index._spouse_rels = [list(rels) for rels in self._spouse_rels]
+        index._sibling_rels = [list(rels) for rels in self._sibling_rels]
+        return index
+
+    # ---------- Size ----------
+
+    @property
+    def person_count(self) -> int:
+        return len(self._slots)
+
+    @property
+    def relationship_count(self) -> int:
+        return sum(len(table) for table in self.edges.values())
+
+    def __contains__(self, person_id: int) -> bool:
+        return person_id in self._slots
+
+    def slot_of(self, person_id: int) -> int:
+        """Get the integer slot of a person"""
+        return self._slots[person_id]
+
+    def person_slots(self) -> Iterator[Tuple[int, int]]:
+        """Iterate (person_id, slot) pairs"""
+        return iter(self._slots.items())
+
+    # ---------- Mutation ----------
+
+    def add_person(self, person_id: int) -> int:
+        """Register a person and return its slot"""
+        if person_id in self._slots:
+            raise ValueError(f"Person {person_id} already indexed")
+        if self._free:
+            slot = self._free.pop()
+            self.person_ids[slot] = person_id
+        else:
+            slot = len(self.person_ids)
+            self.person_ids.append(person_id)
+            self._parent_rels.append([])
+            self._child_rels.append([])
+            self._spouse_rels.append([])
+            self._sibling_rels.append([])
+        self._slots[person_id] = slot
+        return slot
+
+    def remove_person(self, person_id: int) -> List[int]:
+        """
+        Remove a person and every incident edge
+
+        Returns:
+            IDs of the removed relationships
+        """
+        slot = self._slots[person_id]
+        incident = (
+            self._parent_rels[slot]
+            + self._child_rels[slot]
+            + self._spouse_rels[slot]
+            + self._sibling_rels[slot]
+        )
+        removed: List[int] = []
+        for rel_id in dict.fromkeys(incident):
+            self.remove_relationship(rel_id)
+            removed.append(rel_id)
+
+        del self._slots[person_id]
+        self.person_ids[slot] = -1
+        self._free.append(slot)
+        return removed
+
+    def add_relationship(
+        self,
+        rel_id: int,
+        from_person_id: int,
+        to_person_id: int,
+        relationship_type: RelationshipType,
+        is_biological: Optional[bool] = None,
+        is_adopted: Optional[bool] = None,
+        blood_type: Optional[str] = None,
+    ) -> None:
+        """Register an edge between two indexed persons"""
+        src = self._slots[from_person_id]
+        dst = self._slots[to_person_id]
+        self.edges[relationship_type].add(
+            rel_id, src, dst, is_biological, is_adopted, blood_type
+        )
+
+        if relationship_type == RelationshipType.CHILD_OF:
+            # from_person is the child of to_person
+            self._parent_rels[src].append(rel_id)
+            self._child_rels[dst].append(rel_id)
+        elif relationship_type == RelationshipType.SPOUSE_OF:
+            self._spouse_rels[src].append(rel_id)
+            if dst != src:
+                self._spouse_rels[dst].append(rel_id)
+        else:
+            self._sibling_rels[src].append(rel_id)
+            if dst != src:
+                self._sibling_rels[dst].append(rel_id)
+
+    def remove_relationship(self, rel_id: int) -> None:
+        """Remove an edge by relationship ID"""
+        for relationship_type, table in self.edges.items():
+            if rel_id in table:
+                break
+        else:
+            raise KeyError(rel_id)
+
+        src, dst = table.remove(rel_id)
+        if relationship_type == RelationshipType.CHILD_OF:
+            self._parent_rels[src].remove(rel_id)
+            self._child_rels[dst].remove(rel_id)
+        else:
+            adjacency = (
+                self._spouse_rels
+                if relationship_type == RelationshipType.SPOUSE_OF
+                else self._sibling_rels
+            )
+            adjacency[src].remove(rel_id)
+            if dst != src:
+                adjacency[dst].remove(rel_id)
+
+    # ---------- Traversal ----------
+
+    def _other_end(self, table: EdgeTable, rel_id: int, slot: int) -> int:
+        src, dst = table.endpoints(rel_id)
+        return self.person_ids[dst if src == slot else src]
+
+    def parents(self, person_id: int) -> List[int]:
+        """IDs of the person's parents"""
+        slot = self._slots[person_id]
+        table = self.edges[RelationshipType.CHILD_OF]
+        return [self.person_ids[table.endpoints(r)[1]] for r in self._parent_rels[slot]]
+
+    def children(self, person_id: int) -> List[int]:
+        """IDs of the person's children"""
+        slot = self._slots[person_id]
+        table = self.edges[RelationshipType.CHILD_OF]
+        return [self.person_ids[table.endpoints(r)[0]] for r in self._child_rels[slot]]
+
+    def spouses(self, person_id: int) -> List[int]:
+        """IDs of the person's spouses"""
+        slot = self._slots[person_id]
+        table = self.edges[RelationshipType.SPOUSE_OF]
+        return [self._other_end(table, r, slot) for r in self._spouse_rels[slot]]
+
+    def siblings(self, person_id: int) -> List[Tuple[int, Optional[str]]]:
+        """(person_id, blood_type) of the person's siblings"""
+        slot = self._slots[person_id]
+        table = self.edges[RelationshipType.SIBLING_OF]
+        return [
+            (self._other_end(table, r, slot), table.blood_type(r))
+            for r in self._sibling_rels[slot]
+        ]
+
+    def relationship_rows(self) -> Iterator[RelationshipRow]:
+        """Iterate all edges as relationship rows keyed by person ID"""
+        person_ids = self.person_ids
+        for relationship_type, table in self.edges.items():
+            for rel_id, src, dst, is_biological, is_adopted, blood_type in table.rows():
+                yield (
+                    rel_id,
+                    person_ids[src],
+                    person_ids[dst],
+                    relationship_type,
+                    is_biological,
+                    is_adopted,
+                    blood_type,
+                )
+
+
+class GraphIndexCache:
+    """Process-local LRU cache of case graph indexes"""
+
+    def __init__(self, max_size: int):
+        self._entries: LRUCache[int, CaseGraphIndex] = LRUCache(max_size)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def max_size(self) -> int:
+        return self._entries.max_size
+
+    def get(
+        self, case_id: int, revision: Optional[int] = None
+    ) -> Optional[CaseGraphIndex]:
+        """
+        Get a cached index, marking it as recently used
+
+        If a revision is given, an index built at another revision is
+        treated as missing (it was changed by another process).
+        """
+        index = self._entries.get(case_id)
+        if index is None:
+            return None
+        if revision is not None and index.revision != revision:
+            self.invalidate(case_id)
+            return None
+        return index
+
+    def put(self, index: CaseGraphIndex) -> None:
+        """Store an index, evicting the least recently used one if full"""
+        self._entries.put(index.case_id, index)
+
+    def invalidate(self, case_id: int) -> None:
+        """Drop a cached index"""
+        self._entries.pop(case_id)
+
+    def apply(
+        self,
+        case_id: int,
+        mutate: Callable[[CaseGraphIndex], object],
+        revision: Optional[int] = None,
+    ) -> None:
+        """
+        Apply an incremental update to a cached index
+
+        Does nothing if the case is not cached. If the update does not fit
+        the cached state, or the cached index missed a revision in between,
+        the entry is dropped and rebuilt on next use.
+
+        Cached indexes are never changed in place, since callers may still
+        be using them across awaits: the change is applied to a copy, which
+        then replaces the cached entry.
+
+        Args:
+            case_id: Case ID
+            mutate: Function applying the change to the index
+            revision: Case revision produced by the change
+        """
+        index = self._entries.get(case_id)
+        if index is None:
+            return
+        if (
+            revision is not None
+            and index.revision is not None
+            and index.revision != revision - 1
+        ):
+            self.invalidate(case_id)
+            return
+        updated = index.copy()
+        try:
+            mutate(updated)
+        except (KeyError, ValueError):
+            self.invalidate(case_id)
+            return
+        if revision is not None:
+            updated.revision = revision
+        self._entries.put(case_id, updated)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+async def build_graph_index(
+    session: AsyncSession, case_id: int, revision: Optional[int] = None
+) -> CaseGraphIndex:
+    """Build an index from the database using column-only queries"""
+    persons_result = await session.execute(
+        select(Person.id).where(Person.case_id == case_id)
+    )
+    rels_result = await session.execute(
+        select(
+            PersonRelationship.id,
+            PersonRelationship.from_person_id,
+            PersonRelationship.to_person_id,
+            PersonRelationship.relationship_type,
+            PersonRelationship.is_biological,
+            PersonRelationship.is_adopted,
+            PersonRelationship.blood_type,
+        ).where(PersonRelationship.case_id == case_id)
+    )
+    return CaseGraphIndex.from_rows(
+        case_id,
+        persons_result.scalars().all(),
+        [tuple(row) for row in rels_result.all()],
+        revision,
+    )
+
+
+async def load_graph_index(
+    session: AsyncSession, case_id: int, revision: Optional[int] = None
+) -> CaseGraphIndex:
+    """
+    Get the index for a case, building and caching it on first use
+
+    Pass the current case revision to detect indexes made stale by writes
+    from other processes. The returned index is shared and must be treated
+    as read-only.
+    """
+    index = graph_index_cache.get(case_id, revision)
+    if index is None:
+        index = await build_graph_index(session, case_id, revision)
+        graph_index_cache.put(index)
+    return index
+
+
+# Global graph index cache
+graph_index_cache = GraphIndexCache(max_size=settings.graph_index_cache_size)
@@ -0,0 +1,132 @@
+"""
+Graph store repair: Neo4j relationships no PostgreSQL row links to
+
+PostgreSQL is the source of truth. Relationships left in Neo4j after their
+rows were deleted outside the API (e.g. duplicate edges removed by
+migration a93d27e1f5c0) are found and deleted per case:
+
+    python -m app.services.graph_repair            # report and delete orphans
+    python -m app.services.graph_repair --dry-run  # only report
+"""
+import argparse
+import asyncio
+import logging
+from typing import List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models import Case, PersonRelationship
+from app.services.case_lock import lock_case
+from app.services.case_stats import REPAIR_BATCH_SIZE
+from app.services.graph_store import GraphStore, configured_graph_store
+
+logger = logging.getLogger(__name__)
+
+
+async def orphan_graph_relationships(
+    session: AsyncSession, graph_store: GraphStore, case_id: int
+) -> List[str]:
+    """IDs of the case's graph store relationships that no row links to"""
+    linked_result = await session.execute(
+        select(PersonRelationship.neo4j_relationship_id).where(
+            PersonRelationship.case_id == case_id,
+            PersonRelationship.neo4j_relationship_id.is_not(None),
+        )
+    )
+    linked = set(linked_result.scalars().all())
+    tree = await graph_store.get_family_tree(case_id)
+    return [rel["id"] for rel in tree["relationships"] if rel["id"] not in linked]
+
+
+async def repair_graph_relationships(
+    session: AsyncSession,
+    graph_store: GraphStore,
+    case_id: Optional[int] = None,
+    dry_run: bool = False,
+) -> int:
+    """
+    Delete orphaned graph store relationships of every case (or one)
+
+    Each case is checked under its write lock, so relationships being
+    created by a concurrent write are not mistaken for orphans. Cases whose
+    lock is not available in time are skipped with a warning.
+
+    Returns:
+        Number of orphaned relationships found
+    """
+    found = 0
+    last_id = 0
+    while True:
+        batch = (
+            select(Case.id)
+            .where(Case.id > last_id, Case.deleted_at.is_(None))
+            .order_by(Case.id)
+            .limit(REPAIR_BATCH_SIZE)
+        )
+        if case_id is not None:
+            batch = batch.where(Case.id == case_id)
+        ids = list((await session.execute(batch)).scalars().all())
+        await session.commit()
+        if not ids:
+            break
+        last_id = ids[-1]
+
+        for batch_case_id in ids:
+            try:
+                await lock_case(session, batch_case_id)
+            except HTTPException:
+                logger.warning("Case %s is busy; skipped", batch_case_id)
+                continue
+            orphans = await orphan_graph_relationships(
+                session, graph_store, batch_case_id
+            )
+            if orphans:
+                logger.warning(
+                    "Case %s has %d orphaned graph relationships",
+                    batch_case_id,
+                    len(orphans),
+                )
+                if not dry_run:
+                    await graph_store.delete_relationships(orphans)
+            await session.commit()
+            found += len(orphans)
+    return found
+
+
+async def _repair(case_id: Optional[int], dry_run: bool) -> int:
+    from app.db import async_session_maker, engine
+
+    if settings.graph_backend != "neo4j":
+        logger.info("The in-process graph store is built from rows; nothing to do")
+        return 0
+    graph_store = configured_graph_store()
+    await graph_store.connect()
+    try:
+        async with async_session_maker() as session:
+            return await repair_graph_relationships(
+                session, graph_store, case_id, dry_run
+            )
+    finally:
+        await graph_store.close()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Find and delete graph store relationships without a row"
+    )
+    parser.add_argument("--case-id", type=int, help="Only this case")
+    parser.add_argument("--dry-run", action="store_true", help="Report without fixing")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    count = asyncio.run(_repair(args.case_id, args.dry_run))
+    verb = "found" if args.dry_run else "deleted"
+    print(f"{verb} {count} orphaned graph relationship(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""Graph store abstraction: Neo4j or in-process over PostgreSQL rows"""
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.config import settings
+
+
+class GraphStore(ABC):
+    """
+    Interface of the family tree graph store
+
+    PostgreSQL is the source of truth; the graph store mirrors persons and
+    relationships for graph queries. IDs returned by the create methods are
+    stored in Person.neo4j_node_id / PersonRelationship.neo4j_relationship_id;
+    None means the store keeps no separate object to link to.
+    """
+
+    async def connect(self) -> None:
+        """Open connections, if any"""
+
+    async def close(self) -> None:
+        """Release connections, if any"""
+
+    @abstractmethod
+    async def create_person_node(
+        self,
+        case_id: int,
+        person_id: int,
+        name: str,
+        is_alive: bool = True,
+        death_date: Optional[datetime] = None,
+        birth_date: Optional[datetime] = None,
+        gender: Optional[str] = None,
+        is_decedent: bool = False,
+        is_spouse: bool = False,
+    ) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    async def update_person_node(
+        self, node_id: str, **properties: Dict[str, Any]
+    ) -> bool:
+        ...
+
+    @abstractmethod
+    async def update_person_nodes(self, updates: List[Dict[str, Any]]) -> int:
+        ...
+
+    @abstractmethod
+    async def delete_person_nodes(self, node_ids: List[str]) -> bool:
+        ...
+
+    @abstractmethod
+    async def delete_person_node(self, node_id: str) -> bool:
+        ...
+
+    @abstractmethod
+    async def create_relationship(
+        self,
+        from_node_id: str,
+        to_node_id: str,
+        relationship_type: str,
+        properties: Optional[Dict[str, Any]] = None,
+    ) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    async def create_case_subgraph(
+        self,
+        case_id: int,
+        persons: List[Dict[str, Any]],
+        relationships: List[Dict[str, Any]],
+    ) -> Tuple[Dict[int, str], Dict[int, str]]:
+        ...
+
+    @abstractmethod
+    async def delete_relationship(self, relationship_id: str) -> bool:
+        ...
+
+    @abstractmethod
+    async def delete_relationships(self, relationship_ids: List[str]) -> bool:
+        ...
+
+    @abstractmethod
+    async def get_family_tree(self, case_id: int) -> Dict[str, Any]:
+        """
+        Get complete family tree for a case
+        Returns: {"persons": [{"id", "person_id", "case_id", "name", ...}],
+            "relationships": [{"id", "from_id", "to_id", "type", "properties"}]}
+        """
+
+    @abstractmethod
+    async def clear_case_graph(self, case_id: int) -> bool:
+        ...
+
+    @abstractmethod
+    async def purge_case_graph(self, case_id: int, batch_size: int) -> int:
+        ...
+
+
+class InProcessGraphStore(GraphStore):
+    """
+    Graph store without an external service
+
+    Writes are no-ops, since PostgreSQL already holds every person and
+    relationship; no node IDs are issued, so callers skip storing them.
+    Reads build the graph from PostgreSQL rows in the same shape as the
+    Neo4j store, with "person:<id>" / "relationship:<id>" as IDs.
+    """
+
+    async def create_person_node(
+        self,
+        case_id: int,
+        person_id: int,
+        name: str,
+        is_alive: bool = True,
+        death_date: Optional[datetime] = None,
+        birth_date: Optional[datetime] = None,
+        gender: Optional[str] = None,
+        is_decedent: bool = False,
+        is_spouse: bool = False,
+    ) -> Optional[str]:
+        return None
+
+    async def update_person_node(
+        self, node_id: str, **properties: Dict[str, Any]
+    ) -> bool:
+        return True
+
+    async def update_person_nodes(self, updates: List[Dict[str, Any]]) -> int:
+        return 0
+
+    async def delete_person_nodes(self, node_ids: List[str]) -> bool:
+        return True
+
+    async def delete_person_node(self, node_id: str) -> bool:
+        return True
+
+    async def create_relationship(
+        self,
+        from_node_id: str,
+        to_node_id: str,
+        relationship_type: str,
+        properties: Optional[Dict[str, Any]] = None,
+    ) -> Optional[str]:
+        return None
+
+    async def create_case_subgraph(
+        self,
+        case_id: int,
+        persons: List[Dict[str, Any]],
+        relationships: List[Dict[str, Any]],
+    ) -> Tuple[Dict[int, str], Dict[int, str]]:
+        return {}, {}
+
+    async def delete_relationship(self, relationship_id: str) -> bool:
+        return True
+
+    async def delete_relationships(self, relationship_ids: List[str]) -> bool:
+        return True
+
+    async def get_family_tree(self, case_id: int) -> Dict[str, Any]:
+        from app.db import async_session_maker
+        from app.models import Person, PersonRelationship
+
+        async with async_session_maker() as session:
+            persons_result = await session.execute(
+                select(
+                    Person.id, Person.name, Person.is_alive, Person.death_date,
+                    Person.birth_date, Person.gender, Person.is_decedent,
+                    Person.is_spouse,
+                ).where(Person.case_id == case_id)
+            )
+            rels_result = await session.execute(
+                select(
+                    PersonRelationship.id,
+                    PersonRelationship.from_person_id,
+                    PersonRelationship.to_person_id,
+                    PersonRelationship.relationship_type,
+                    PersonRelationship.is_biological,
+                    PersonRelationship.is_adopted,
+                    PersonRelationship.blood_type,
+                ).where(PersonRelationship.case_id == case_id)
+            )
+            persons = [
+                {
+                    "id": f"person:{row.id}",
+                    "case_id": case_id,
+                    "person_id": row.id,
+                    "name": row.name,
+                    "is_alive": row.is_alive,
+                    "death_date": (
+                        row.death_date.isoformat() if row.death_date else None
+                    ),
+                    "birth_date": (
+                        row.birth_date.isoformat() if row.birth_date else None
+                    ),
+                    "gender": row.gender,
+                    "is_decedent": row.is_decedent,
+                    "is_spouse": row.is_spouse,
+                }
+                for row in persons_result
+            ]
+            relationships = [
+                {
+                    "id": f"relationship:{row.id}",
+                    "from_id": f"person:{row.from_person_id}",
+                    "to_id": f"person:{row.to_person_id}",
+                    "type": row.relationship_type.value.upper(),
+                    "properties": {
+                        "is_biological": row.is_biological,
+                        "is_adopted": row.is_adopted,
+                        "blood_type": row.blood_type,
+                    },
+                }
+                for row in rels_result
+            ]
+        return {"persons": persons, "relationships": relationships}
+
+    async def clear_case_graph(self, case_id: int) -> bool:
+        return True
+
+    async def purge_case_graph(self, case_id: int, batch_size: int) -> int:
+        return 0
+
+
+# Global in-process graph store
+in_process_graph_store = InProcessGraphStore()
+
+
+def configured_graph_store() -> GraphStore:
+    """The graph store selected by settings.graph_backend (not connected)"""
+    if settings.graph_backend == "memory":
+        return in_process_graph_store
+    from app.services.neo4j_service import neo4j_service
+
+    return neo4j_service
+
+
+async def get_graph_store() -> GraphStore:
+    """Dependency for getting the configured graph store"""
+    if settings.graph_backend == "memory":
+        return in_process_graph_store
+    from app.services.neo4j_service import get_neo4j_service
+
+    return await get_neo4j_service()
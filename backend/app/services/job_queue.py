@@ -0,0 +1,422 @@
+"""Asynchronous calculation job queue with progress notifications"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select, update
+
+from app.config import settings
+from app.db import async_session_maker, snapshot_session
+from app.models import CalculationJob, Case
+from app.services.calculation_inputs import (
+    InvalidCalculationInput,
+    load_calculation_inputs,
+)
+from app.services.calculation_runner import (
+    CalculationError,
+    CalculationTimeout,
+    calculation_runner,
+)
+from app.services.case_stats import record_calculation
+from app.services.metrics import metrics
+from app.services.result_cache import calculation_result_cache
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+TERMINAL_STATUSES = frozenset({JOB_SUCCEEDED, JOB_FAILED})
+
+# How often durable queues look for jobs orphaned by a dead process (seconds)
+RECOVERY_INTERVAL = 60.0
+# A running job not updated for longer than its timeout plus this is orphaned
+ORPHAN_GRACE_SECONDS = 60.0
+
+jobs_submitted = metrics.counter(
+    "calculation_jobs_submitted_total", "Calculation jobs submitted"
+)
+jobs_finished = metrics.counter(
+    "calculation_jobs_finished_total", "Calculation jobs finished", label="status"
+)
+jobs_queued = metrics.gauge(
+    "calculation_jobs_queued", "Calculation jobs waiting for a job worker"
+)
+
+
+class JobRecord:
+    """In-memory state of a calculation job"""
+
+    __slots__ = (
+        "id",
+        "case_id",
+        "user_id",
+        "include_tree",
+        "status",
+        "phase",
+        "result",
+        "error",
+        "created_at",
+        "updated_at",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        case_id: int,
+        user_id: int,
+        include_tree: bool,
+        status: str = JOB_QUEUED,
+        phase: Optional[str] = None,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[Dict[str, Any]] = None,
+        created_at: Optional[datetime] = None,
+        updated_at: Optional[datetime] = None,
+    ):
+        now = datetime.utcnow()
+        self.id = id
+        self.case_id = case_id
+        self.user_id = user_id
+        self.include_tree = include_tree
+        self.status = status
+        self.phase = phase
+        self.result = result
+        self.error = error
+        self.created_at = created_at or now
+        self.updated_at = updated_at or now
+
+    @classmethod
+    def from_model(cls, job: CalculationJob) -> "JobRecord":
+        return cls(
+            id=job.id,
+            case_id=job.case_id,
+            user_id=job.user_id,
+            include_tree=job.include_tree,
+            status=job.status,
+            phase=job.phase,
+            result=job.result,
+            error=job.error,
+            created_at=job.created_at,
+            updated_at=job.updated_at,
+        )
+
+    @property
+    def finished(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "case_id": self.case_id,
+            "status": self.status,
+            "phase": self.phase,
+            "include_tree": self.include_tree,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat(),
+        }
+
+
+class CalculationJobQueue:
+    """
+    In-process calculation job queue
+
+    A fixed number of job workers take jobs from an asyncio queue and run
+    them through the calculation runner. With ``durable=True`` every job is
+    also written to the ``calculation_jobs`` table, so it can be read from
+    any API process, and the table is shared explicitly between processes:
+    a job is claimed with a conditional UPDATE before it runs, so it runs
+    once even if several processes queue it, and jobs orphaned by a dead
+    process are re-queued by the others.
+    """
+
+    def __init__(
+        self, workers: int, durable: bool, timeout: float, retention_seconds: int
+    ):
+        self.workers = workers
+        self.durable = durable
+        self.timeout = timeout
+        self.retention = timedelta(seconds=retention_seconds)
+        self._jobs: Dict[str, JobRecord] = {}
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue()
+        self._listeners: Dict[str, List["asyncio.Queue[Dict[str, Any]]"]] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._active = 0
+        self._draining = False
+
+    # ---------- Lifecycle ----------
+
+    async def start(self) -> None:
+        """Start job workers, re-queueing unfinished durable jobs"""
+        if self._tasks:
+            return
+        self._draining = False
+        if self.durable:
+            await self._recover()
+        self._tasks = [
+            asyncio.create_task(self._worker_loop(), name=f"calculation-job-worker-{i}")
+            for i in range(self.workers)
+        ]
+        if self.durable:
+            self._tasks.append(
+                asyncio.create_task(
+                    self._recovery_loop(), name="calculation-job-recovery"
+                )
+            )
+
+    async def stop(self, drain_timeout: float = 0.0) -> None:
+        """
+        Stop job workers
+
+        Running jobs get up to ``drain_timeout`` seconds to finish and no new
+        jobs are started meanwhile. Durable jobs that did not finish are
+        resumed by another process or on next start.
+        """
+        self._draining = True
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + drain_timeout
+        while self._active and loop.time() < deadline:
+            await asyncio.sleep(0.1)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    # ---------- Public API ----------
+
+    async def submit(
+        self, case_id: int, user_id: int, include_tree: bool = False
+    ) -> JobRecord:
+        """Create a job and queue it"""
+        self._sweep()
+        job = JobRecord(
+            id=str(uuid.uuid4()),
+            case_id=case_id,
+            user_id=user_id,
+            include_tree=include_tree,
+        )
+        if self.durable:
+            async with async_session_maker() as session:
+                session.add(
+                    CalculationJob(
+                        id=job.id,
+                        case_id=job.case_id,
+                        user_id=job.user_id,
+                        status=job.status,
+                        include_tree=job.include_tree,
+                        created_at=job.created_at,
+                        updated_at=job.updated_at,
+                    )
+                )
+                await session.commit()
+
+        self._jobs[job.id] = job
+        self._queue.put_nowait(job.id)
+        jobs_submitted.inc()
+        jobs_queued.inc()
+        return job
+
+    async def get(self, job_id: str) -> Optional[JobRecord]:
+        """Get a job from memory, falling back to the job table"""
+        job = self._jobs.get(job_id)
+        if job is not None or not self.durable:
+            return job
+        async with async_session_maker() as session:
+            row = await session.get(CalculationJob, job_id)
+            return JobRecord.from_model(row) if row else None
+
+    def subscribe(self, job_id: str) -> "asyncio.Queue[Dict[str, Any]]":
+        """Get a queue receiving the job's state after every change"""
+        listener: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+        self._listeners.setdefault(job_id, []).append(listener)
+        return listener
+
+    def unsubscribe(
+        self, job_id: str, listener: "asyncio.Queue[Dict[str, Any]]"
+    ) -> None:
+        listeners = self._listeners.get(job_id, [])
+        if listener in listeners:
+            listeners.remove(listener)
+        if not listeners:
+            self._listeners.pop(job_id, None)
+
+    # ---------- Internals ----------
+
+    async def _set(self, job: JobRecord, persist: bool = True, **changes: Any) -> None:
+        """Update a job, persist it (unless told not to) and notify listeners"""
+        changes["updated_at"] = datetime.utcnow()
+        for key, value in changes.items():
+            setattr(job, key, value)
+
+        if self.durable and persist:
+            async with async_session_maker() as session:
+                await session.execute(
+                    update(CalculationJob)
+                    .where(CalculationJob.id == job.id)
+                    .values(**changes)
+                )
+                await session.commit()
+
+        state = job.to_dict()
+        for listener in self._listeners.get(job.id, []):
+            listener.put_nowait(state)
+
+    async def _recover(self) -> None:
+        """Queue unclaimed durable jobs, resetting running jobs whose process died"""
+        cutoff = datetime.utcnow() - timedelta(
+            seconds=self.timeout + ORPHAN_GRACE_SECONDS
+        )
+        async with async_session_maker() as session:
+            await session.execute(
+                update(CalculationJob)
+                .where(
+                    CalculationJob.status == JOB_RUNNING,
+                    CalculationJob.updated_at < cutoff,
+                )
+                .values(status=JOB_QUEUED, phase=None)
+            )
+            await session.commit()
+            result = await session.execute(
+                select(CalculationJob)
+                .where(CalculationJob.status == JOB_QUEUED)
+                .order_by(CalculationJob.created_at)
+            )
+            rows = result.scalars().all()
+
+        requeued = 0
+        for row in rows:
+            if row.id in self._jobs:
+                continue
+            self._jobs[row.id] = JobRecord.from_model(row)
+            self._queue.put_nowait(row.id)
+            jobs_queued.inc()
+            requeued += 1
+        if requeued:
+            logger.info("Queued %d unclaimed calculation jobs", requeued)
+
+    async def _recovery_loop(self) -> None:
+        while True:
+            await asyncio.sleep(RECOVERY_INTERVAL)
+            try:
+                await self._recover()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Calculation job recovery failed")
+
+    async def _claim(self, job: JobRecord) -> bool:
+        """Atomically mark a durable job running; False if another process has it"""
+        async with async_session_maker() as session:
+            result = await session.execute(
+                update(CalculationJob)
+                .where(CalculationJob.id == job.id, CalculationJob.status == JOB_QUEUED)
+                .values(
+                    status=JOB_RUNNING, phase="loading", updated_at=datetime.utcnow()
+                )
+            )
+            await session.commit()
+        return result.rowcount == 1
+
+    def _sweep(self) -> None:
+        """Forget finished jobs past the retention period"""
+        cutoff = datetime.utcnow() - self.retention
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished and job.updated_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    async def _worker_loop(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            jobs_queued.dec()
+            job = self._jobs.get(job_id)
+            self._active += 1
+            try:
+                if job is not None and not job.finished and not self._draining:
+                    if self.durable and not await self._claim(job):
+                        # Another process runs it; read its state from the table
+                        self._jobs.pop(job_id, None)
+                    else:
+                        await self._process(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Calculation job %s crashed", job_id)
+            finally:
+                self._active -= 1
+                self._queue.task_done()
+
+    async def _process(self, job: JobRecord) -> None:
+        # _claim already stored the running state of durable jobs
+        await self._set(
+            job, persist=not self.durable, status=JOB_RUNNING, phase="loading"
+        )
+        try:
+            async with snapshot_session() as session:
+                case = await session.get(Case, job.case_id)
+                if case is None or case.deleted_at is not None:
+                    raise InvalidCalculationInput(404, "Case not found")
+                revision = case.revision
+                output = calculation_result_cache.get(
+                    job.case_id, revision, include_tree=job.include_tree
+                )
+                if output is None:
+                    inputs = await load_calculation_inputs(
+                        session, job.case_id, revision
+                    )
+
+            if output is None:
+                output = await calculation_runner.run(
+                    persons=inputs.persons,
+                    decedent_id=inputs.decedent_id,
+                    index=inputs.index,
+                    include_tree=job.include_tree,
+                    timeout=self.timeout,
+                    on_progress=lambda phase: self._set(job, phase=phase),
+                )
+                calculation_result_cache.put(
+                    job.case_id, inputs.revision, None, output
+                )
+                async with async_session_maker() as session:
+                    await record_calculation(
+                        session, job.case_id, inputs.revision, output["summary"]
+                    )
+        except InvalidCalculationInput as e:
+            error = {"status_code": e.status_code, "detail": e.detail}
+        except CalculationTimeout as e:
+            error = {"status_code": 504, "detail": f"Calculation timed out: {e}"}
+        except CalculationError as e:
+            error = {"status_code": 500, "detail": f"Calculation failed: {e}"}
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.exception("Calculation job %s failed", job.id)
+            error = {"status_code": 500, "detail": f"Calculation failed: {e}"}
+        else:
+            await self._set(job, status=JOB_SUCCEEDED, phase=None, result=output)
+            jobs_finished.inc(JOB_SUCCEEDED)
+            return
+
+        await self._set(job, status=JOB_FAILED, phase=None, error=error)
+        jobs_finished.inc(JOB_FAILED)
+
+
+# Global calculation job queue
+calculation_job_queue = CalculationJobQueue(
+    workers=settings.calculation_job_workers,
+    durable=settings.calculation_job_store == "database",
+    timeout=settings.calculation_job_timeout_seconds,
+    retention_seconds=settings.calculation_job_retention_seconds,
+)
+
+
+def get_calculation_job_queue() -> CalculationJobQueue:
+    """Dependency for getting calculation job queue"""
+    return calculation_job_queue
@@ -0,0 +1,100 @@
+"""In-process metrics exposed in Prometheus text format"""
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+
+class _Metric:
+    """Base class for labelled metrics"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, label: Optional[str] = None):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self._values: Dict[str, float] = {}
+        self._lock = Lock()
+
+    def value(self, label_value: str = "") -> float:
+        return self._values.get(label_value, 0.0)
+
+    def samples(self) -> List[Tuple[str, float]]:
+        with self._lock:
+            return sorted(self._values.items())
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for label_value, value in self.samples():
+            if self.label:
+                lines.append(f'{self.name}{{{self.label}="{label_value}"}} {value:g}')
+            else:
+                lines.append(f"{self.name} {value:g}")
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter"""
+
+    kind = "counter"
+
+    def inc(self, label_value: str = "", amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[label_value] = self._values.get(label_value, 0.0) + amount
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+
+    kind = "gauge"
+
+    def set(self, value: float, label_value: str = "") -> None:
+        with self._lock:
+            self._values[label_value] = value
+
+    def inc(self, label_value: str = "", amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[label_value] = self._values.get(label_value, 0.0) + amount
+
+    def dec(self, label_value: str = "", amount: float = 1.0) -> None:
+        self.inc(label_value, -amount)
+
+
+class MetricsRegistry:
+    """Registry of process-local metrics"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def counter(
+        self, name: str, help_text: str, label: Optional[str] = None
+    ) -> Counter:
+        metric = Counter(name, help_text, label)
+        self._metrics[name] = metric
+        return metric
+
+    def gauge(self, name: str, help_text: str, label: Optional[str] = None) -> Gauge:
+        metric = Gauge(name, help_text, label)
+        self._metrics[name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text exposition format"""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def case_size_bucket(person_count: int) -> str:
+    """Bucket a case by number of persons for metric labels"""
+    for upper in (10, 50, 200, 1000):
+        if person_count <= upper:
+            return f"le_{upper}"
+    return "gt_1000"
+
+
+# Global metrics registry
+metrics = MetricsRegistry()
@@ -1,22 +1,27 @@
 """Neo4j Service for Family Tree Graph Management"""
-from typing import List, Optional, Dict, Any
+from typing import TYPE_CHECKING, List, Optional, Dict, Any, Tuple
 from datetime import datetime
 
-from neo4j import AsyncGraphDatabase, AsyncDriver
-from neo4j.exceptions import ServiceUnavailable
-
 from app.config import settings
+from app.services.graph_store import GraphStore
+
+if TYPE_CHECKING:
+    from neo4j import AsyncDriver
 
 
-class Neo4jService:
+class Neo4jService(GraphStore):
     """Service for managing family tree data in Neo4j"""
 
     def __init__(self):
         """Initialize Neo4j driver"""
-        self.driver: Optional[AsyncDriver] = None
+        self.driver: Optional["AsyncDriver"] = None
 
     async def connect(self):
         """Connect to Neo4j database"""
+        # The driver package is heavy; import it on first connection
+        from neo4j import AsyncGraphDatabase
+        from neo4j.exceptions import ServiceUnavailable
+
         try:
             self.driver = AsyncGraphDatabase.driver(
                 settings.neo4j_uri,
@@ -34,6 +39,7 @@ class Neo4jService:
 
     async def create_person_node(
         self,
+        case_id: int,
         person_id: int,
         name: str,
         is_alive: bool = True,
@@ -50,6 +56,7 @@ class Neo4jService:
         async with self.driver.session() as session:
             query = """
             CREATE (p:Person {
+                case_id: $case_id,
                 person_id: $person_id,
                 name: $name,
                 is_alive: $is_alive,
@@ -63,6 +70,7 @@ class Neo4jService:
             """
             result = await session.run(
                 query,
+                case_id=case_id,
                 person_id=person_id,
                 name=name,
                 is_alive=is_alive,
@@ -109,6 +117,57 @@ class Neo4jService:
             record = await result.single()
             return record is not None
 
+    async def update_person_nodes(self, updates: List[Dict[str, Any]]) -> int:
+        """
+        Update many person nodes in one query
+
+        Args:
+            updates: [{"node_id": ..., "properties": {...}}, ...]; None values
+                are skipped as in update_person_node
+
+        Returns: Number of nodes updated
+        """
+        rows = []
+        for item in updates:
+            properties = {
+                key: value.isoformat() if isinstance(value, datetime) else value
+                for key, value in item["properties"].items()
+                if value is not None
+            }
+            if properties:
+                rows.append({"node_id": item["node_id"], "properties": properties})
+        if not rows:
+            return 0
+
+        async with self.driver.session() as session:
+            query = """
+            UNWIND $rows AS row
+            MATCH (p:Person)
+            WHERE elementId(p) = row.node_id
+            SET p += row.properties
+            RETURN count(p) AS updated
+            """
+            result = await session.run(query, rows=rows)
+            record = await result.single()
+            return record["updated"]
+
+    async def delete_person_nodes(self, node_ids: List[str]) -> bool:
+        """
+        Delete many person nodes and their relationships in one query
+        Returns: True if successful
+        """
+        if not node_ids:
+            return True
+        async with self.driver.session() as session:
+            query = """
+            UNWIND $node_ids AS node_id
+            MATCH (p:Person)
+            WHERE elementId(p) = node_id
+            DETACH DELETE p
+            """
+            await session.run(query, node_ids=node_ids)
+            return True
+
     async def delete_person_node(self, node_id: str) -> bool:
         """
         Delete a person node and all its relationships
@@ -151,6 +210,71 @@ class Neo4jService:
             record = await result.single()
             return record["rel_id"]
 
+    async def create_case_subgraph(
+        self,
+        case_id: int,
+        persons: List[Dict[str, Any]],
+        relationships: List[Dict[str, Any]],
+    ) -> Tuple[Dict[int, str], Dict[int, str]]:
+        """
+        Create all nodes and relationships of a case in one transaction
+
+        Args:
+            persons: [{"person_id": ..., "properties": {...}}, ...]
+            relationships: [{"relationship_id": ..., "from_person_id": ...,
+                "to_person_id": ..., "type": "CHILD_OF", "properties": {...}}, ...]
+
+        Returns: (person_id -> node ID, relationship_id -> Neo4j relationship ID)
+        """
+        by_type: Dict[str, List[Dict[str, Any]]] = {}
+        for rel in relationships:
+            by_type.setdefault(rel["type"], []).append(rel)
+
+        async def write(tx) -> Tuple[Dict[int, str], Dict[int, str]]:
+            result = await tx.run(
+                """
+                UNWIND $rows AS row
+                CREATE (p:Person)
+                SET p = row.properties,
+                    p.case_id = $case_id,
+                    p.person_id = row.person_id
+                RETURN row.person_id AS person_id, elementId(p) AS node_id
+                """,
+                rows=persons,
+                case_id=case_id,
+            )
+            node_ids = {
+                record["person_id"]: record["node_id"] async for record in result
+            }
+
+            rel_ids: Dict[int, str] = {}
+            # Relationship types cannot be parameterized: one query per type
+            for relationship_type, rows in by_type.items():
+                result = await tx.run(
+                    f"""
+                    UNWIND $rows AS row
+                    MATCH (from:Person
+                        {{case_id: $case_id, person_id: row.from_person_id}})
+                    MATCH (to:Person {{case_id: $case_id, person_id: row.to_person_id}})
+                    CREATE (from)-[r:{relationship_type}]->(to)
+                    SET r = row.properties
+                    RETURN row.relationship_id AS relationship_id,
+                        elementId(r) AS rel_id
+                    """,
+                    rows=rows,
+                    case_id=case_id,
+                )
+                rel_ids.update(
+                    {
+                        record["relationship_id"]: record["rel_id"]
+                        async for record in result
+                    }
+                )
+            return node_ids, rel_ids
+
+        async with self.driver.session() as session:
+            return await session.execute_write(write)
+
     async def delete_relationship(self, relationship_id: str) -> bool:
         """
         Delete a relationship
@@ -165,6 +289,23 @@ class Neo4jService:
             await session.run(query, relationship_id=relationship_id)
             return True
 
+    async def delete_relationships(self, relationship_ids: List[str]) -> bool:
+        """
+        Delete many relationships in one query
+        Returns: True if successful
+        """
+        if not relationship_ids:
+            return True
+        async with self.driver.session() as session:
+            query = """
+            UNWIND $relationship_ids AS relationship_id
+            MATCH ()-[r]->()
+            WHERE elementId(r) = relationship_id
+            DELETE r
+            """
+            await session.run(query, relationship_ids=relationship_ids)
+            return True
+
     async def get_family_tree(self, case_id: int) -> Dict[str, Any]:
         """
         Get complete family tree for a case
@@ -215,6 +356,29 @@ class Neo4jService:
             await session.run(query, case_id=case_id)
             return True
 
+    async def purge_case_graph(self, case_id: int, batch_size: int) -> int:
+        """
+        Delete all nodes of a case in batches of separate transactions
+
+        Unlike clear_case_graph this keeps each transaction bounded, so
+        large cases cannot exhaust Neo4j transaction memory.
+
+        Returns: Number of nodes deleted
+        """
+        async with self.driver.session() as session:
+            # CALL { ... } IN TRANSACTIONS needs an auto-commit transaction
+            query = """
+            MATCH (p:Person {case_id: $case_id})
+            CALL {
+                WITH p
+                DETACH DELETE p
+            } IN TRANSACTIONS OF $batch_size ROWS
+            RETURN count(p) AS deleted
+            """
+            result = await session.run(query, case_id=case_id, batch_size=batch_size)
+            record = await result.single()
+            return record["deleted"] if record else 0
+
 
 # Global Neo4j service instance
 neo4j_service = Neo4jService()
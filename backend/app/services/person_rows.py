@@ -0,0 +1,46 @@
+"""Compact person rows: the calculation pipeline's view of a person"""
+from datetime import datetime
+from typing import List, NamedTuple, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Person
+
+
+class PersonRow(NamedTuple):
+    """
+    The person columns read by validation and the core conversion
+
+    A plain tuple: no ORM instrumentation, identity map or per-instance
+    __dict__, and it pickles to worker processes as a bare tuple.
+    """
+    id: int
+    name: str
+    is_alive: bool
+    death_date: Optional[datetime]
+    birth_date: Optional[datetime]
+    gender: Optional[str]
+    is_decedent: bool
+    is_spouse: bool
+
+
+# Selected in PersonRow field order
+PERSON_ROW_COLUMNS = (
+    Person.id,
+    Person.name,
+    Person.is_alive,
+    Person.death_date,
+    Person.birth_date,
+    Person.gender,
+    Person.is_decedent,
+    Person.is_spouse,
+)
+
+
+async def load_person_rows(session: AsyncSession, case_id: int) -> List[PersonRow]:
+    """Load a case's persons with a column-only query (no ORM instances)"""
+    result = await session.execute(
+        select(*PERSON_ROW_COLUMNS).where(Person.case_id == case_id)
+    )
+    return [PersonRow._make(row) for row in result.tuples()]
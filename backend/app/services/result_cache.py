@@ -0,0 +1,103 @@
+"""Revision-keyed caches of calculation outputs and other per-case data"""
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+from app.config import settings
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+CacheKey = Tuple[int, int, Optional[int]]
+
+
+class LRUCache(Generic[K, V]):
+    """
+    Process-local LRU cache
+
+    Backs every cache of data derived from a case: keys (or the cached
+    values) carry the case revision, so entries of older revisions are
+    never used and simply age out.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[K, V]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> Optional[V]:
+        """Get a cached value, marking it as recently used"""
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: K, value: V) -> None:
+        """Store a value, evicting the least recently used ones if full"""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: K) -> Optional[V]:
+        """Drop a cached value, returning it if there was one"""
+        return self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class CalculationResultCache:
+    """
+    Process-local LRU cache of calculation outputs
+
+    Entries are keyed by (case_id, revision, decedent_id), where a
+    decedent_id of None stands for the case's own decedent. Any write to a
+    case bumps its revision, so stale entries are never returned and simply
+    age out; no cross-process invalidation is needed.
+    """
+
+    def __init__(self, max_size: int):
+        self._entries: LRUCache[CacheKey, Dict[str, Any]] = LRUCache(max_size)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def max_size(self) -> int:
+        return self._entries.max_size
+
+    def get(
+        self,
+        case_id: int,
+        revision: int,
+        decedent_id: Optional[int] = None,
+        include_tree: bool = False,
+    ) -> Optional[Dict[str, Any]]:
+        """Get a cached output; with include_tree only if it has the ASCII tree"""
+        output = self._entries.get((case_id, revision, decedent_id))
+        if output is None or (include_tree and "ascii_tree" not in output):
+            return None
+        return output
+
+    def put(
+        self,
+        case_id: int,
+        revision: int,
+        decedent_id: Optional[int],
+        output: Dict[str, Any],
+    ) -> None:
+        """Store an output, merging with what is cached for the same key"""
+        key = (case_id, revision, decedent_id)
+        existing = self._entries.get(key)
+        self._entries.put(key, {**existing, **output} if existing else output)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Global calculation result cache
+calculation_result_cache = CalculationResultCache(
+    max_size=settings.calculation_result_cache_size
+)
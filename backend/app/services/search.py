@@ -0,0 +1,289 @@
+"""Search over persons and cases of a user"""
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import (
+    Float,
+    Integer,
+    String,
+    and_,
+    case,
+    func,
+    literal,
+    null,
+    or_,
+    select,
+    union_all,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models import Case, Person
+from app.search_text import normalize_search_text
+from app.services.result_cache import LRUCache
+
+# Description matches rank below name and title matches
+DESCRIPTION_WEIGHT = 0.5
+
+
+class SearchHit(NamedTuple):
+    """One search result; person_id is None for a case title / description hit"""
+    kind: str
+    case_id: int
+    case_title: str
+    person_id: Optional[int]
+    person_name: Optional[str]
+    score: float
+
+
+def match_score(field: Optional[str], query: str) -> float:
+    """
+    Rank a normalized field against a normalized query
+
+    Exact match > prefix > substring; within a tier, the larger the part
+    of the field the query covers, the higher the score. 0 if no match.
+    """
+    if not field or query not in field:
+        return 0.0
+    if field == query:
+        return 4.0
+    coverage = len(query) / len(field)
+    return (2.0 if field.startswith(query) else 1.0) + coverage
+
+
+def _sort_key(hit: SearchHit) -> tuple:
+    return (-hit.score, hit.case_id, hit.person_id or 0)
+
+
+# ==================== PostgreSQL ====================
+
+
+def _score_expr(column, query: str):
+    """match_score as SQL; LIKE '%q%' is served by the trigram index"""
+    coverage = literal(float(len(query)), Float) / func.nullif(
+        func.char_length(column), 0
+    )
+    return case(
+        (column == query, 4.0),
+        (column.startswith(query, autoescape=True), 2.0 + coverage),
+        (column.contains(query, autoescape=True), 1.0 + coverage),
+        else_=0.0,
+    )
+
+
+async def search_database(
+    session: AsyncSession, user_id: int, query: str, limit: int, offset: int
+) -> Tuple[int, List[SearchHit]]:
+    """
+    Search with SQL over the normalized columns
+
+    Ranking and pagination happen in the database; with pg_trgm GIN
+    indexes, substring filters stay index-backed for queries of three or
+    more characters.
+    """
+    owned = and_(Case.user_id == user_id, Case.deleted_at.is_(None))
+    person_hits = (
+        select(
+            literal("person", String).label("kind"),
+            Person.case_id.label("case_id"),
+            Case.title.label("case_title"),
+            Person.id.label("person_id"),
+            Person.name.label("person_name"),
+            _score_expr(Person.name_search, query).label("score"),
+        )
+        .join(Case, Case.id == Person.case_id)
+        .where(and_(owned, Person.name_search.contains(query, autoescape=True)))
+    )
+    case_hits = select(
+        literal("case", String).label("kind"),
+        Case.id.label("case_id"),
+        Case.title.label("case_title"),
+        null().cast(Integer).label("person_id"),
+        null().cast(String).label("person_name"),
+        func.greatest(
+            _score_expr(Case.title_search, query),
+            _score_expr(Case.description_search, query) * DESCRIPTION_WEIGHT,
+        ).label("score"),
+    ).where(
+        and_(
+            owned,
+            or_(
+                Case.title_search.contains(query, autoescape=True),
+                Case.description_search.contains(query, autoescape=True),
+            ),
+        )
+    )
+    hits = union_all(person_hits, case_hits).subquery()
+
+    total = (await session.execute(select(func.count()).select_from(hits))).scalar_one()
+    rows = await session.execute(
+        select(hits)
+        .order_by(
+            hits.c.score.desc(),
+            hits.c.case_id,
+            hits.c.person_id.nulls_first(),
+        )
+        .limit(limit)
+        .offset(offset)
+    )
+    return total, [SearchHit(*row) for row in rows]
+
+
+# ==================== In-memory index ====================
+
+
+class CaseSearchIndex:
+    """
+    N-gram inverted index of one case's person names, title and description
+
+    Postings map every 1- and 2-character gram to the entries containing
+    it; a query is answered by intersecting the postings of its grams and
+    verifying the substring match on the few candidates left.
+    """
+
+    __slots__ = ("case_id", "revision", "title", "entries", "postings")
+
+    def __init__(
+        self,
+        case_id: int,
+        revision: int,
+        title: str,
+        description: Optional[str],
+        persons: Sequence[Tuple[int, str]],
+    ):
+        self.case_id = case_id
+        self.revision = revision
+        self.title = title
+        # (person_id or None, person name, normalized text, weight)
+        self.entries: List[Tuple[Optional[int], Optional[str], str, float]] = [
+            (None, None, normalize_search_text(title), 1.0),
+            (None, None, normalize_search_text(description), DESCRIPTION_WEIGHT),
+        ]
+        self.entries.extend(
+            (person_id, name, normalize_search_text(name), 1.0)
+            for person_id, name in persons
+        )
+        self.postings: Dict[str, List[int]] = {}
+        for i, (_, _, text, _) in enumerate(self.entries):
+            grams = set(text)
+            grams.update(text[j:j + 2] for j in range(len(text) - 1))
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(i)
+
+    def search(self, query: str) -> List[SearchHit]:
+        grams = (
+            {query[j:j + 2] for j in range(len(query) - 1)}
+            if len(query) > 1
+            else {query}
+        )
+        postings = sorted((self.postings.get(gram, ()) for gram in grams), key=len)
+        if not postings or not postings[0]:
+            return []
+        candidates = set(postings[0]).intersection(*postings[1:])
+
+        hits: List[SearchHit] = []
+        case_score = 0.0
+        for i in candidates:
+            person_id, name, text, weight = self.entries[i]
+            score = match_score(text, query) * weight
+            if not score:
+                continue
+            if person_id is None:
+                case_score = max(case_score, score)
+            else:
+                hits.append(
+                    SearchHit(
+                        "person", self.case_id, self.title, person_id, name, score
+                    )
+                )
+        if case_score:
+            hits.append(
+                SearchHit("case", self.case_id, self.title, None, None, case_score)
+            )
+        return hits
+
+
+class SearchIndexCache:
+    """Process-local LRU cache of per-case search indexes, checked by revision"""
+
+    def __init__(self, max_size: int):
+        self._entries: LRUCache[int, CaseSearchIndex] = LRUCache(max_size)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, case_id: int, revision: int) -> Optional[CaseSearchIndex]:
+        index = self._entries.get(case_id)
+        if index is None or index.revision != revision:
+            return None
+        return index
+
+    def put(self, index: CaseSearchIndex) -> None:
+        self._entries.put(index.case_id, index)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Global search index cache
+search_index_cache = SearchIndexCache(max_size=settings.search_index_cache_size)
+
+
+async def search_memory(
+    session: AsyncSession, user_id: int, query: str, limit: int, offset: int
+) -> Tuple[int, List[SearchHit]]:
+    """
+    Search with in-process n-gram indexes (databases without pg_trgm)
+
+    Only cases whose revision changed since they were indexed are loaded,
+    with one query for all of their persons.
+    """
+    cases_result = await session.execute(
+        select(Case.id, Case.revision, Case.title, Case.description).where(
+            and_(Case.user_id == user_id, Case.deleted_at.is_(None))
+        )
+    )
+    indexes: List[CaseSearchIndex] = []
+    stale: Dict[int, tuple] = {}
+    for case_id, revision, title, description in cases_result:
+        index = search_index_cache.get(case_id, revision)
+        if index is None:
+            stale[case_id] = (revision, title, description)
+        else:
+            indexes.append(index)
+
+    if stale:
+        persons: Dict[int, List[Tuple[int, str]]] = {case_id: [] for case_id in stale}
+        persons_result = await session.execute(
+            select(Person.case_id, Person.id, Person.name).where(
+                Person.case_id.in_(stale)
+            )
+        )
+        for case_id, person_id, name in persons_result:
+            persons[case_id].append((person_id, name))
+        for case_id, (revision, title, description) in stale.items():
+            index = CaseSearchIndex(
+                case_id, revision, title, description, persons[case_id]
+            )
+            search_index_cache.put(index)
+            indexes.append(index)
+
+    hits = [hit for index in indexes for hit in index.search(query)]
+    hits.sort(key=_sort_key)
+    return len(hits), hits[offset:offset + limit]
+
+
+async def search(
+    session: AsyncSession, user_id: int, text: str, limit: int, offset: int
+) -> Tuple[int, List[SearchHit]]:
+    """
+    Ranked, paginated search of a user's persons and cases
+
+    Returns:
+        (total number of hits, hits of the requested page)
+    """
+    query = normalize_search_text(text)
+    if not query:
+        return 0, []
+    if session.get_bind().dialect.name == "postgresql":
+        return await search_database(session, user_id, query, limit, offset)
+    return await search_memory(session, user_id, query, limit, offset)
@@ -0,0 +1,141 @@
+"""Successive inheritance (数次相続) over chained calculations"""
+from collections import deque
+from fractions import Fraction
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+# A decedent in the chain: (case_id, person_id)
+ChainNode = Tuple[int, int]
+
+SummaryFn = Callable[[ChainNode], Awaitable[Dict[str, Any]]]
+SuccessorFn = Callable[[ChainNode, int], Awaitable[Optional[ChainNode]]]
+
+# An heir of a node: (heir, share of the node's estate, successor node or None)
+ChainEdge = Tuple[Dict[str, Any], Fraction, Optional[ChainNode]]
+
+
+class SuccessionCycle(Exception):
+    """Raised when the decedents of a chain inherit from each other in a loop"""
+
+
+def _share_fields(share: Fraction) -> Dict[str, Any]:
+    return {
+        "share_numerator": share.numerator,
+        "share_denominator": share.denominator,
+        "share_decimal": float(share),
+        "share_percentage": float(share * 100),
+    }
+
+
+async def resolve_succession(
+    root: ChainNode, summary_of: SummaryFn, successor_of: SuccessorFn
+) -> Dict[str, Any]:
+    """
+    Combine the calculations of a chain of decedents into final shares
+
+    Every decedent is calculated once, however many paths lead to it, and
+    shares are then pushed through the chain in topological order, so the
+    work is linear in the number of decedents and edges.
+
+    Args:
+        root: The first decedent
+        summary_of: Returns the calculation summary of a decedent
+        successor_of: Returns the chain node of an heir whose share passes
+            on through their own inheritance, or None for a final heir
+
+    Returns:
+        Dict with "steps" (one per decedent, with the fraction of the
+        original estate passing through them) and "heirs" (final heirs with
+        their combined share and its sources)
+
+    Raises:
+        SuccessionCycle: The chain loops back to an earlier decedent
+    """
+    summaries: Dict[ChainNode, Dict[str, Any]] = {}
+    edges: Dict[ChainNode, List[ChainEdge]] = {}
+
+    # Discover the chain breadth-first, calculating each decedent once
+    pending: Deque[ChainNode] = deque([root])
+    while pending:
+        node = pending.popleft()
+        if node in summaries:
+            continue
+        summary = await summary_of(node)
+        summaries[node] = summary
+        node_edges = []
+        for heir in summary["heirs"]:
+            share = Fraction(heir["share_numerator"], heir["share_denominator"])
+            successor = await successor_of(node, int(heir["id"]))
+            if successor is not None and successor not in summaries:
+                pending.append(successor)
+            node_edges.append((heir, share, successor))
+        edges[node] = node_edges
+
+    # Kahn's algorithm over the decedent graph
+    in_degree: Dict[ChainNode, int] = {node: 0 for node in summaries}
+    for node_edges in edges.values():
+        for _, _, successor in node_edges:
+            if successor is not None:
+                in_degree[successor] += 1
+    ready: Deque[ChainNode] = deque(n for n, d in in_degree.items() if d == 0)
+    order: List[ChainNode] = []
+    while ready:
+        node = ready.popleft()
+        order.append(node)
+        for _, _, successor in edges[node]:
+            if successor is not None:
+                in_degree[successor] -= 1
+                if in_degree[successor] == 0:
+                    ready.append(successor)
+    if len(order) != len(summaries):
+        raise SuccessionCycle("Succession chain contains a cycle")
+
+    # Push the estate through the chain
+    incoming: Dict[ChainNode, Fraction] = {root: Fraction(1)}
+    final: Dict[ChainNode, Dict[str, Any]] = {}
+    steps = []
+    for node in order:
+        amount = incoming.get(node, Fraction(0))
+        decedent = summaries[node]["decedent"]
+        steps.append(
+            {
+                "case_id": node[0],
+                "decedent_id": node[1],
+                "decedent_name": decedent["name"],
+                **_share_fields(amount),
+            }
+        )
+        for heir, share, successor in edges[node]:
+            portion = amount * share
+            if successor is not None:
+                incoming[successor] = incoming.get(successor, Fraction(0)) + portion
+                continue
+            key = (node[0], int(heir["id"]))
+            entry = final.setdefault(
+                key,
+                {
+                    "case_id": node[0],
+                    "id": key[1],
+                    "name": heir["name"],
+                    "share": Fraction(0),
+                    "sources": [],
+                },
+            )
+            entry["share"] += portion
+            entry["sources"].append(
+                {"case_id": node[0], "decedent_id": node[1], **_share_fields(portion)}
+            )
+
+    ranked = sorted(
+        final.values(), key=lambda e: (-e["share"], e["case_id"], e["id"])
+    )
+    heirs = []
+    for entry in ranked:
+        share = entry.pop("share")
+        heirs.append({**entry, **_share_fields(share)})
+
+    return {
+        "case_id": root[0],
+        "decedent_id": root[1],
+        "steps": steps,
+        "heirs": heirs,
+    }
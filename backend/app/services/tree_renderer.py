@@ -0,0 +1,234 @@
+"""Size-aware ASCII family tree rendering over the graph index"""
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from app.config import settings
+from app.services.graph_index import CaseGraphIndex
+from app.services.result_cache import LRUCache
+
+# "full" renders everything, "heirs" drops branches without heirs and
+# "collapsed" folds branches without heirs into a single line
+TREE_MODES = ("full", "heirs", "collapsed")
+
+# Generations expanded at most in each direction, whatever depth is asked
+# for: keeps the recursive render well inside the interpreter's stack limit
+MAX_DEPTH = 200
+
+BRANCH = "├── "
+LAST_BRANCH = "└── "
+PIPE = "│   "
+SPACE = "    "
+
+
+class TreeRenderer:
+    """
+    Renders a family tree from the decedent outwards
+
+    Descendants are drawn below the decedent, followed by sections for
+    ascendants and siblings (with their descendants, for 代襲相続). Each
+    person appears once; ``depth`` limits how many generations are expanded
+    in each direction.
+    """
+
+    def __init__(
+        self,
+        index: CaseGraphIndex,
+        labels: Dict[int, str],
+        decedent_id: int,
+        heirs: Dict[int, str],
+        mode: str = "full",
+        depth: Optional[int] = None,
+    ):
+        self.index = index
+        self.labels = labels
+        self.decedent_id = decedent_id
+        self.heirs = heirs
+        self.mode = mode
+        self.depth = MAX_DEPTH if depth is None else min(depth, MAX_DEPTH)
+        self._seen: Set[int] = set()
+        self._heir_subtrees: Optional[Set[int]] = None
+        self._heir_ancestries: Optional[Set[int]] = None
+
+    def render(self) -> List[str]:
+        self._seen = {self.decedent_id}
+        decedent = self._person(self.decedent_id)
+        lines = [f"{decedent} (被相続人){self._spouses(self.decedent_id)}"]
+        self._descendants(self.decedent_id, "", 0, lines)
+
+        ascendants: List[str] = []
+        self._ascendants(self.decedent_id, "", 1, ascendants)
+        if ascendants:
+            lines.append("直系尊属")
+            lines.extend(ascendants)
+
+        siblings = [
+            (sibling_id, blood)
+            for sibling_id, blood in self.index.siblings(self.decedent_id)
+            if sibling_id not in self._seen and self._keep(sibling_id)
+        ]
+        if siblings:
+            lines.append("兄弟姉妹")
+            for i, (sibling_id, blood) in enumerate(siblings):
+                last = i == len(siblings) - 1
+                self._seen.add(sibling_id)
+                suffix = " (半血)" if blood == "half" else ""
+                branch = LAST_BRANCH if last else BRANCH
+                line = f"{branch}{self._person(sibling_id)}{suffix}"
+                self._expand(sibling_id, line, SPACE if last else PIPE, 1, lines)
+        return lines
+
+    # ---------- Internals ----------
+
+    def _person(self, person_id: int) -> str:
+        label = self.labels.get(person_id, f"#{person_id}")
+        share = self.heirs.get(person_id)
+        return f"{label} [{share}]" if share else label
+
+    def _spouses(self, person_id: int) -> str:
+        parts = []
+        for spouse_id in self.index.spouses(person_id):
+            if spouse_id in self._seen:
+                continue
+            if self.mode == "heirs" and spouse_id not in self.heirs:
+                continue
+            self._seen.add(spouse_id)
+            parts.append(f" ═ {self._person(spouse_id)}")
+        return "".join(parts)
+
+    def _closure(self, start: Set[int], step: Callable[[int], List[int]]) -> Set[int]:
+        """The start persons and everyone reachable from them through step"""
+        found = set(start)
+        stack = list(found)
+        while stack:
+            for next_id in step(stack.pop()):
+                if next_id not in found:
+                    found.add(next_id)
+                    stack.append(next_id)
+        return found
+
+    def _heirs_in_index(self) -> Set[int]:
+        return {heir_id for heir_id in self.heirs if heir_id in self.index}
+
+    def _subtree_has_heir(self, person_id: int) -> bool:
+        """Whether the person, a spouse or any descendant is an heir"""
+        if self._heir_subtrees is None:
+            # Heirs, their spouses and all of their ancestors, in one walk
+            # up the tree per render
+            heirs = self._heirs_in_index()
+            for heir_id in list(heirs):
+                heirs.update(self.index.spouses(heir_id))
+            self._heir_subtrees = self._closure(heirs, self.index.parents)
+        return person_id in self._heir_subtrees
+
+    def _keep(self, person_id: int) -> bool:
+        return self.mode != "heirs" or self._subtree_has_heir(person_id)
+
+    def _count_descendants(self, person_id: int) -> int:
+        found: Set[int] = set()
+        stack = [person_id]
+        while stack:
+            for child_id in self.index.children(stack.pop()):
+                if child_id not in found and child_id not in self._seen:
+                    found.add(child_id)
+                    stack.append(child_id)
+        return len(found)
+
+    def _expand(
+        self, person_id: int, line: str, child_prefix: str, level: int, lines: List[str]
+    ) -> None:
+        """Emit a person's line and, unless cut off, their descendants"""
+        line += self._spouses(person_id)
+        folded = level >= self.depth or (
+            self.mode == "collapsed" and not self._subtree_has_heir(person_id)
+        )
+        if folded:
+            hidden = self._count_descendants(person_id)
+            lines.append(f"{line} … (+{hidden})" if hidden else line)
+            return
+        lines.append(line)
+        self._descendants(person_id, child_prefix, level, lines)
+
+    def _descendants(
+        self, person_id: int, prefix: str, level: int, lines: List[str]
+    ) -> None:
+        children = [
+            child_id
+            for child_id in self.index.children(person_id)
+            if child_id not in self._seen and self._keep(child_id)
+        ]
+        for child_id in children:
+            self._seen.add(child_id)
+        for i, child_id in enumerate(children):
+            last = i == len(children) - 1
+            line = f"{prefix}{LAST_BRANCH if last else BRANCH}{self._person(child_id)}"
+            self._expand(
+                child_id, line, prefix + (SPACE if last else PIPE), level + 1, lines
+            )
+
+    def _ascendants(
+        self, person_id: int, prefix: str, level: int, lines: List[str]
+    ) -> None:
+        if level > self.depth:
+            return
+        parents = [
+            parent_id
+            for parent_id in self.index.parents(person_id)
+            if parent_id not in self._seen
+            and (self.mode != "heirs" or self._ancestry_has_heir(parent_id))
+        ]
+        for parent_id in parents:
+            self._seen.add(parent_id)
+        for i, parent_id in enumerate(parents):
+            last = i == len(parents) - 1
+            branch = LAST_BRANCH if last else BRANCH
+            lines.append(f"{prefix}{branch}{self._person(parent_id)}")
+            self._ascendants(
+                parent_id, prefix + (SPACE if last else PIPE), level + 1, lines
+            )
+
+    def _ancestry_has_heir(self, person_id: int) -> bool:
+        """Whether the person or any ancestor is an heir"""
+        if self._heir_ancestries is None:
+            # Heirs and all of their descendants, in one walk down the tree
+            # per render
+            self._heir_ancestries = self._closure(
+                self._heirs_in_index(), self.index.children
+            )
+        return person_id in self._heir_ancestries
+
+
+def render_tree_lines(
+    index: CaseGraphIndex,
+    labels: Dict[int, str],
+    decedent_id: int,
+    heirs: Dict[int, str],
+    mode: str = "full",
+    depth: Optional[int] = None,
+) -> List[str]:
+    """Render a family tree as a list of lines (see TreeRenderer)"""
+    return TreeRenderer(index, labels, decedent_id, heirs, mode, depth).render()
+
+
+RenderKey = Tuple[int, int, str, Optional[int]]
+
+
+class RenderedTree:
+    """A rendered tree kept both as lines (for streaming) and as one string"""
+
+    __slots__ = ("lines", "_text")
+
+    def __init__(self, lines: List[str], text: Optional[str] = None):
+        self.lines = lines
+        self._text = text
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = "\n".join(self.lines)
+        return self._text
+
+
+# Global rendered tree cache, keyed by (case_id, revision, mode, depth): a
+# render is built once per case version and shared by every viewer
+tree_render_cache: LRUCache[RenderKey, RenderedTree] = LRUCache(
+    max_size=settings.tree_render_cache_size
+)
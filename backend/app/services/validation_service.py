@@ -0,0 +1,214 @@
+"""Family tree validation run before inheritance calculation"""
+from collections import deque
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.models import RelationshipType
+from app.schemas.case import ValidationIssue
+from app.services.graph_index import CaseGraphIndex
+from app.services.person_rows import PersonRow
+
+# 嫡出推定（民法772条2項）: a child born within 300 days of the father's
+# death is still his child, so births shortly after a parent's death are valid.
+POSTHUMOUS_BIRTH_GRACE = timedelta(days=300)
+
+
+def _issue(
+    code: str,
+    message: str,
+    person_ids: Optional[List[int]] = None,
+    relationship_id: Optional[int] = None,
+    severity: str = "error",
+) -> ValidationIssue:
+    return ValidationIssue(
+        code=code,
+        message=message,
+        severity=severity,
+        person_ids=person_ids or [],
+        relationship_id=relationship_id,
+    )
+
+
+def topological_order(index: CaseGraphIndex) -> Tuple[List[int], List[int]]:
+    """
+    Order persons so that parents come before their children (Kahn's algorithm)
+
+    Self-loops are ignored; they are reported separately by the validator.
+
+    Returns:
+        (ordered person IDs, IDs of persons on or below a CHILD_OF cycle)
+    """
+    person_ids = index.person_ids
+    table = index.edges[RelationshipType.CHILD_OF]
+    indegree: Dict[int, int] = {slot: 0 for _, slot in index.person_slots()}
+    children: Dict[int, List[int]] = {}
+
+    for child, parent in zip(table.src, table.dst):
+        if child == parent:
+            continue
+        indegree[child] += 1
+        children.setdefault(parent, []).append(child)
+
+    queue = deque(slot for slot, degree in indegree.items() if degree == 0)
+    ordered: List[int] = []
+    while queue:
+        slot = queue.popleft()
+        ordered.append(person_ids[slot])
+        for child in children.get(slot, ()):
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                queue.append(child)
+
+    cyclic = [person_ids[slot] for slot, degree in indegree.items() if degree > 0]
+    return ordered, cyclic
+
+
+def validate_family_tree(
+    persons: Iterable[PersonRow],
+    index: CaseGraphIndex,
+) -> List[ValidationIssue]:
+    """
+    Validate a family tree in a single O(V+E) pass
+
+    Args:
+        persons: Persons of the case (only id, name, flags and dates are read)
+        index: Adjacency index of the case
+
+    Returns:
+        List of validation issues, empty if the tree is valid
+    """
+    issues: List[ValidationIssue] = []
+    by_id: Dict[int, PersonRow] = {}
+    decedent_ids: List[int] = []
+
+    # Persons
+    for person in persons:
+        by_id[person.id] = person
+        if person.is_decedent:
+            decedent_ids.append(person.id)
+        if (
+            person.birth_date
+            and person.death_date
+            and person.death_date < person.birth_date
+        ):
+            issues.append(
+                _issue(
+                    "death_before_birth",
+                    f"{person.name}: death date is before birth date",
+                    [person.id],
+                )
+            )
+        if person.is_alive and person.death_date:
+            issues.append(
+                _issue(
+                    "alive_with_death_date",
+                    f"{person.name}: marked alive but has a death date",
+                    [person.id],
+                    severity="warning",
+                )
+            )
+
+    if not decedent_ids:
+        issues.append(
+            _issue("no_decedent", "No decedent (被相続人) specified in this case")
+        )
+    elif len(decedent_ids) > 1:
+        issues.append(
+            _issue(
+                "multiple_decedents",
+                "More than one person is marked as decedent (被相続人)",
+                decedent_ids,
+            )
+        )
+
+    # Relationships
+    seen: Set[Tuple[RelationshipType, int, int]] = set()
+    for (
+        rel_id,
+        from_id,
+        to_id,
+        rel_type,
+        _is_biological,
+        _is_adopted,
+        _blood_type,
+    ) in index.relationship_rows():
+        if from_id not in by_id or to_id not in by_id:
+            issues.append(
+                _issue(
+                    "unknown_person",
+                    "Relationship references a person outside this case",
+                    [from_id, to_id],
+                    rel_id,
+                )
+            )
+            continue
+
+        if from_id == to_id:
+            issues.append(
+                _issue(
+                    "self_relationship",
+                    f"{by_id[from_id].name}: relationship to self",
+                    [from_id],
+                    rel_id,
+                )
+            )
+            continue
+
+        if rel_type == RelationshipType.CHILD_OF:
+            key = (rel_type, from_id, to_id)
+        else:
+            key = (rel_type, min(from_id, to_id), max(from_id, to_id))
+        if key in seen:
+            issues.append(
+                _issue(
+                    f"duplicate_{rel_type.value}",
+                    f"Duplicate {rel_type.value} relationship between "
+                    f"{by_id[from_id].name} and {by_id[to_id].name}",
+                    [from_id, to_id],
+                    rel_id,
+                )
+            )
+        seen.add(key)
+
+        if rel_type == RelationshipType.CHILD_OF:
+            child, parent = by_id[from_id], by_id[to_id]
+            if (
+                child.birth_date
+                and parent.birth_date
+                and child.birth_date < parent.birth_date
+            ):
+                issues.append(
+                    _issue(
+                        "child_born_before_parent",
+                        f"{child.name} is born before parent {parent.name}",
+                        [child.id, parent.id],
+                        rel_id,
+                    )
+                )
+            if (
+                child.birth_date
+                and parent.death_date
+                and child.birth_date > parent.death_date + POSTHUMOUS_BIRTH_GRACE
+            ):
+                issues.append(
+                    _issue(
+                        "child_born_after_parent_death",
+                        f"{child.name} is born after parent {parent.name} died",
+                        [child.id, parent.id],
+                        rel_id,
+                    )
+                )
+
+    # Cycles in CHILD_OF
+    _, cyclic = topological_order(index)
+    if cyclic:
+        issues.append(
+            _issue(
+                "child_of_cycle",
+                "CHILD_OF relationships form a cycle (a person is their own ancestor)",
+                cyclic,
+            )
+        )
+
+    return issues
+
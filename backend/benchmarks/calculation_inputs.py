@@ -0,0 +1,170 @@
+"""Cost of loading calculation inputs: ORM Person objects vs column-only rows
+
+Seeds an in-memory SQLite database with a synthetic family tree, then
+compares, per calculation:
+
+- ``orm``: ``select(Person)`` and a picklable copy of each instance (the
+  previous input path of the calculator)
+- ``rows``: ``select(*PERSON_ROW_COLUMNS)`` into PersonRow tuples
+
+and reports wall time, peak traced allocations and the size of the
+payload sent to a calculation worker. If the core library is installed,
+the conversion to core models is included.
+
+Usage (from backend/):
+    uv run python benchmarks/calculation_inputs.py
+    uv run python benchmarks/calculation_inputs.py --persons 1000 --runs 20
+    uv run python benchmarks/calculation_inputs.py --json calculation_inputs.json
+"""
+import argparse
+import json
+import pickle
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, insert, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.models import Case, Person, PersonRelationship, RelationshipType, User  # noqa: E402
+from app.models.user import Base  # noqa: E402
+from app.services.person_rows import PERSON_ROW_COLUMNS, PersonRow  # noqa: E402
+
+
+def seed(session: Session, persons: int) -> int:
+    """Create a case with a decedent, a spouse and descendants; returns the case ID"""
+    session.execute(
+        insert(User).values(id=1, email="bench@example.com", hashed_password="x")
+    )
+    session.execute(insert(Case).values(id=1, user_id=1, title="benchmark"))
+    session.execute(
+        insert(Person),
+        [
+            {
+                "id": i,
+                "case_id": 1,
+                "name": f"相続 太郎{i}",
+                "is_alive": i != 1,
+                "death_date": datetime(2024, 1, 1) if i == 1 else None,
+                "birth_date": datetime(1950 + i % 50, 1, 1),
+                "gender": "male" if i % 2 else "female",
+                "is_decedent": i == 1,
+                "is_spouse": i == 2,
+            }
+            for i in range(1, persons + 1)
+        ],
+    )
+    # Binary-ish tree of descendants below the decedent
+    edges = [{"case_id": 1, "from_person_id": 2, "to_person_id": 1,
+              "relationship_type": RelationshipType.SPOUSE_OF}]
+    edges.extend(
+        {"case_id": 1, "from_person_id": i, "to_person_id": max(1, i // 2),
+         "relationship_type": RelationshipType.CHILD_OF}
+        for i in range(3, persons + 1)
+    )
+    session.execute(insert(PersonRelationship), edges)
+    session.commit()
+    return 1
+
+
+def load_orm(session: Session, case_id: int) -> List[Any]:
+    persons = (
+        session.execute(select(Person).where(Person.case_id == case_id))
+        .scalars()
+        .all()
+    )
+    snapshot = [
+        SimpleNamespace(
+            id=p.id, name=p.name, is_alive=p.is_alive, death_date=p.death_date,
+            birth_date=p.birth_date, gender=p.gender,
+        )
+        for p in persons
+    ]
+    session.expunge_all()
+    return snapshot
+
+
+def load_rows(session: Session, case_id: int) -> List[PersonRow]:
+    result = session.execute(
+        select(*PERSON_ROW_COLUMNS).where(Person.case_id == case_id)
+    )
+    return [PersonRow._make(row) for row in result.tuples()]
+
+
+def core_converter() -> Callable[[List[Any]], Any]:
+    """Conversion to core models if the core library is installed, else a no-op"""
+    from app.services.calculation_service import CalculationService
+
+    service = CalculationService()
+    if service.calculator is None:
+        return lambda persons: None
+    return lambda persons: [service._convert_to_core_person(p) for p in persons]
+
+
+def measure(
+    session: Session, case_id: int, load: Callable[[Session, int], List[Any]],
+    convert: Callable[[List[Any]], Any], runs: int,
+) -> Dict[str, float]:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        convert(load(session, case_id))
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    persons = load(session, case_id)
+    convert(persons)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "min_ms": round(min(timings) * 1000, 3),
+        "peak_kib": round(peak / 1024, 1),
+        "payload_kib": round(len(pickle.dumps(persons)) / 1024, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--persons", type=int, default=1000)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument(
+        "--json", dest="json_path", help="Write the report to this file"
+    )
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    convert = core_converter()
+    with Session(engine) as session:
+        case_id = seed(session, args.persons)
+        report = {
+            "persons": args.persons,
+            "runs": args.runs,
+            "orm": measure(session, case_id, load_orm, convert, args.runs),
+            "rows": measure(session, case_id, load_rows, convert, args.runs),
+        }
+
+    print(f"{args.persons} persons, {args.runs} runs")
+    print(f"{'':6}{'median ms':>12}{'min ms':>10}{'peak KiB':>12}{'payload KiB':>14}")
+    for name in ("orm", "rows"):
+        entry = report[name]
+        print(
+            f"{name:6}{entry['median_ms']:>12.2f}{entry['min_ms']:>10.2f}"
+            f"{entry['peak_kib']:>12.1f}{entry['payload_kib']:>14.1f}"
+        )
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
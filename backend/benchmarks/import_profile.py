@@ -0,0 +1,99 @@
+"""Import-time profile of the API application
+
+Runs ``python -X importtime -c "import app.main"`` in fresh interpreters and
+reports the slowest modules by cumulative import time.
+
+Usage (from backend/):
+    uv run python benchmarks/import_profile.py
+    uv run python benchmarks/import_profile.py --module app.main --runs 5 --top 30
+    uv run python benchmarks/import_profile.py --json import_profile.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def profile_once(module: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Import the module in a fresh interpreter
+
+    Returns:
+        {module: (self_us, cumulative_us)}
+    """
+    env = {**os.environ, "PYTHONPATH": str(BACKEND_DIR)}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings: Dict[str, Tuple[int, int]] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue  # header line
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument(
+        "--json", dest="json_path", help="Write the report to this file"
+    )
+    args = parser.parse_args()
+
+    runs = [profile_once(args.module) for _ in range(args.runs)]
+    totals = [run[args.module][1] for run in runs if args.module in run]
+    cumulative: Dict[str, List[int]] = {}
+    for run in runs:
+        for name, (_, cumulative_us) in run.items():
+            cumulative.setdefault(name, []).append(cumulative_us)
+
+    slowest = sorted(
+        ((name, statistics.median(values)) for name, values in cumulative.items()),
+        key=lambda item: item[1],
+        reverse=True,
+    )[: args.top]
+
+    report = {
+        "module": args.module,
+        "runs": args.runs,
+        "total_ms": {
+            "median": statistics.median(totals) / 1000,
+            "min": min(totals) / 1000,
+            "max": max(totals) / 1000,
+        },
+        "slowest": [
+            {"module": name, "cumulative_ms": round(us / 1000, 2)}
+            for name, us in slowest
+        ],
+    }
+
+    print(
+        f"import {args.module}: median {report['total_ms']['median']:.1f} ms "
+        f"over {args.runs} runs"
+    )
+    for entry in report["slowest"]:
+        print(f"{entry['cumulative_ms']:>10.2f} ms  {entry['module']}")
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
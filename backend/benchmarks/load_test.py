@@ -0,0 +1,460 @@
+"""Load test of the API application with a weighted mix of requests
+
+Runs the ASGI app in-process (one server worker, as in one container with
+WEB_CONCURRENCY=1) behind httpx, seeds synthetic users and cases through
+the API, then replays a weighted mix of reads, writes and calculations
+from concurrent virtual users. Reports throughput and p50/p95/p99 latency
+per route.
+
+Needs a database and, unless ``--graph-backend memory`` stands in for it,
+Neo4j (see docker-compose.yml). Seeded data is deleted afterwards unless
+``--keep-data`` is given.
+
+Usage (from backend/):
+    uv run python benchmarks/load_test.py
+    uv run python benchmarks/load_test.py --graph-backend memory --duration 60
+    uv run python benchmarks/load_test.py --users 4 --cases-per-user 10 \\
+        --persons 50 --concurrency 32 --json load_test.json
+    uv run python benchmarks/load_test.py --mix calculate=1,ascii_tree=1
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Relative weights of the operations in the traffic mix
+DEFAULT_MIX: Dict[str, float] = {
+    "list_cases": 10,
+    "get_case": 25,
+    "create_person": 8,
+    "update_person": 8,
+    "delete_person": 4,
+    "create_relationship": 5,
+    "delete_relationship": 3,
+    "calculate": 25,
+    "ascii_tree": 12,
+}
+
+
+@dataclass
+class SeededCase:
+    """A case of a virtual user, with the persons the harness may touch"""
+    id: int
+    decedent_id: int
+    descendant_ids: List[int]
+    # Persons and relationships created during the run (safe to delete);
+    # relationships map to their (from, to) persons
+    added_persons: List[int] = field(default_factory=list)
+    added_relationships: Dict[int, Tuple[int, int]] = field(default_factory=dict)
+
+
+@dataclass
+class SeededUser:
+    headers: Dict[str, str]
+    cases: List[SeededCase]
+
+
+class Recorder:
+    """Latencies and errors (by status, or "exception") per route"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, Dict[str, int]] = {}
+
+    def record(self, route: str, seconds: float, status: Optional[int]) -> None:
+        self.latencies.setdefault(route, []).append(seconds)
+        if status not in ACCEPTED_STATUS:
+            errors = self.errors.setdefault(route, {})
+            key = "exception" if status is None else str(status)
+            errors[key] = errors.get(key, 0) + 1
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        routes = {}
+        for route, samples in sorted(self.latencies.items()):
+            ordered = sorted(samples)
+            routes[route] = {
+                "count": len(ordered),
+                "errors": sum(self.errors.get(route, {}).values()),
+                "error_statuses": self.errors.get(route, {}),
+                "throughput_rps": round(len(ordered) / elapsed, 2),
+                "mean_ms": round(statistics.fmean(ordered) * 1000, 2),
+                "p50_ms": round(_percentile(ordered, 50) * 1000, 2),
+                "p95_ms": round(_percentile(ordered, 95) * 1000, 2),
+                "p99_ms": round(_percentile(ordered, 99) * 1000, 2),
+                "max_ms": round(ordered[-1] * 1000, 2),
+            }
+        total = sum(route["count"] for route in routes.values())
+        return {
+            "duration_s": round(elapsed, 2),
+            "requests": total,
+            "errors": sum(route["errors"] for route in routes.values()),
+            "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+            "routes": routes,
+        }
+
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    """Nearest-rank percentile of sorted samples"""
+    rank = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def parse_mix(text: Optional[str]) -> Dict[str, float]:
+    """Parse "route=weight,..." into weights (unknown routes are rejected)"""
+    if not text:
+        return dict(DEFAULT_MIX)
+    mix: Dict[str, float] = {}
+    for part in text.split(","):
+        route, _, weight = part.partition("=")
+        route = route.strip()
+        if route not in DEFAULT_MIX:
+            raise SystemExit(
+                f"Unknown route {route!r}; choose from {', '.join(DEFAULT_MIX)}"
+            )
+        mix[route] = float(weight or 1)
+    return mix
+
+
+# ==================== Seeding ====================
+
+
+def template_tree(
+    persons: int,
+) -> Tuple[List[Dict[str, Any]], List[Tuple[int, int, str]]]:
+    """
+    Persons and (from, to, type) edges by position of a synthetic family
+
+    A deceased decedent, a spouse, three children and further generations
+    of descendants, two children per person. Only the children have birth
+    dates, which keeps every generation valid.
+    """
+    people: List[Dict[str, Any]] = [
+        {"name": "被相続人 太郎", "is_decedent": True, "is_alive": False,
+         "death_date": "2024-01-01T00:00:00", "birth_date": "1940-04-01T00:00:00"},
+        {"name": "配偶者 花子", "is_spouse": True, "birth_date": "1945-06-01T00:00:00"},
+    ]
+    edges: List[Tuple[int, int, str]] = [(1, 0, "spouse_of")]
+    for position in range(2, max(persons, 2)):
+        parent = 0 if position < 5 else 2 + (position - 5) // 2
+        person: Dict[str, Any] = {"name": f"子孫 {position}"}
+        if parent == 0:
+            person["birth_date"] = f"{1965 + position}-01-01T00:00:00"
+        people.append(person)
+        edges.append((position, parent, "child_of"))
+    return people[:max(persons, 2)], edges
+
+
+async def seed_user(client, index: int, cases: int, persons: int) -> SeededUser:
+    """Register a user, build one case through the API and clone it"""
+    email = f"load-{uuid.uuid4().hex[:12]}-{index}@example.com"
+    password = "load-test-password"
+    response = await client.post(
+        "/auth/register", json={"email": email, "password": password}
+    )
+    response.raise_for_status()
+    response = await client.post(
+        "/auth/jwt/login", data={"username": email, "password": password}
+    )
+    response.raise_for_status()
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    response = await client.post(
+        "/api/cases/", json={"title": f"負荷試験 {index}-0"}, headers=headers
+    )
+    response.raise_for_status()
+    template_id = response.json()["id"]
+    people, edges = template_tree(persons)
+    ids: List[int] = []
+    for person in people:
+        response = await client.post(
+            f"/api/cases/{template_id}/persons", json=person, headers=headers
+        )
+        response.raise_for_status()
+        ids.append(response.json()["id"])
+    for from_pos, to_pos, rel_type in edges:
+        response = await client.post(
+            f"/api/cases/{template_id}/relationships",
+            json={"from_person_id": ids[from_pos], "to_person_id": ids[to_pos],
+                  "relationship_type": rel_type},
+            headers=headers,
+        )
+        response.raise_for_status()
+
+    seeded = [SeededCase(template_id, ids[0], ids[2:])]
+    for copy in range(1, cases):
+        response = await client.post(
+            f"/api/cases/{template_id}/clone",
+            json={"title": f"負荷試験 {index}-{copy}"},
+            headers=headers,
+        )
+        response.raise_for_status()
+        case_id = response.json()["id"]
+        detail = (await client.get(f"/api/cases/{case_id}", headers=headers)).json()
+        person_ids = sorted(person["id"] for person in detail["persons"])
+        seeded.append(SeededCase(case_id, detail["decedent_person_id"], person_ids[2:]))
+    return SeededUser(headers, seeded)
+
+
+# ==================== Traffic ====================
+
+
+Operation = Callable[[Any, SeededUser, SeededCase, random.Random], Awaitable[Any]]
+
+
+async def op_list_cases(client, user, case, rng):
+    return await client.get("/api/cases/", headers=user.headers)
+
+
+async def op_get_case(client, user, case, rng):
+    return await client.get(f"/api/cases/{case.id}", headers=user.headers)
+
+
+async def op_create_person(client, user, case, rng):
+    response = await client.post(
+        f"/api/cases/{case.id}/persons",
+        json={"name": f"追加 {rng.randrange(10**6)}"},
+        headers=user.headers,
+    )
+    if response.status_code == 201:
+        case.added_persons.append(response.json()["id"])
+    return response
+
+
+async def op_update_person(client, user, case, rng):
+    if not case.descendant_ids:
+        return await op_get_case(client, user, case, rng)
+    person_id = rng.choice(case.descendant_ids)
+    return await client.patch(
+        f"/api/cases/{case.id}/persons/{person_id}",
+        json={"name": f"子孫 {person_id}-{rng.randrange(1000)}"},
+        headers=user.headers,
+    )
+
+
+async def op_delete_person(client, user, case, rng):
+    if not case.added_persons:
+        return await op_create_person(client, user, case, rng)
+    person_id = case.added_persons.pop(rng.randrange(len(case.added_persons)))
+    # The server deletes the person's relationships with it
+    for relationship_id, ends in list(case.added_relationships.items()):
+        if person_id in ends:
+            del case.added_relationships[relationship_id]
+    return await client.delete(
+        f"/api/cases/{case.id}/persons/{person_id}", headers=user.headers
+    )
+
+
+async def op_create_relationship(client, user, case, rng):
+    # A person added by the harness becomes a child of a descendant
+    if not case.added_persons or not case.descendant_ids:
+        return await op_create_person(client, user, case, rng)
+    from_id = rng.choice(case.added_persons)
+    to_id = rng.choice(case.descendant_ids)
+    response = await client.post(
+        f"/api/cases/{case.id}/relationships",
+        json={
+            "from_person_id": from_id,
+            "to_person_id": to_id,
+            "relationship_type": "child_of",
+        },
+        headers=user.headers,
+    )
+    # Unless the person was deleted while the request was in flight
+    if response.status_code == 201 and from_id in case.added_persons:
+        case.added_relationships[response.json()["id"]] = (from_id, to_id)
+    return response
+
+
+async def op_delete_relationship(client, user, case, rng):
+    if not case.added_relationships:
+        return await op_create_relationship(client, user, case, rng)
+    relationship_id = rng.choice(list(case.added_relationships))
+    del case.added_relationships[relationship_id]
+    return await client.delete(
+        f"/api/cases/{case.id}/relationships/{relationship_id}", headers=user.headers
+    )
+
+
+async def op_calculate(client, user, case, rng):
+    return await client.post(f"/api/cases/{case.id}/calculate", headers=user.headers)
+
+
+async def op_ascii_tree(client, user, case, rng):
+    return await client.get(f"/api/cases/{case.id}/ascii-tree", headers=user.headers)
+
+
+OPERATIONS: Dict[str, Operation] = {
+    "list_cases": op_list_cases,
+    "get_case": op_get_case,
+    "create_person": op_create_person,
+    "update_person": op_update_person,
+    "delete_person": op_delete_person,
+    "create_relationship": op_create_relationship,
+    "delete_relationship": op_delete_relationship,
+    "calculate": op_calculate,
+    "ascii_tree": op_ascii_tree,
+}
+
+# Expected conflicts under contention are not failures of the server
+ACCEPTED_STATUS = {200, 201, 204, 304, 409}
+
+
+async def virtual_user(
+    client,
+    users: List[SeededUser],
+    mix: Dict[str, float],
+    rng: random.Random,
+    recorder: Recorder,
+    deadline: float,
+    budget: List[int],
+) -> None:
+    """Send requests of the mix back to back until time or budget runs out"""
+    routes = list(mix)
+    weights = [mix[route] for route in routes]
+    while time.perf_counter() < deadline and budget[0] > 0:
+        budget[0] -= 1
+        route = rng.choices(routes, weights)[0]
+        user = rng.choice(users)
+        case = rng.choice(user.cases)
+        start = time.perf_counter()
+        try:
+            response = await OPERATIONS[route](client, user, case, rng)
+            status: Optional[int] = response.status_code
+        except Exception:
+            status = None
+        recorder.record(route, time.perf_counter() - start, status)
+
+
+# ==================== Main ====================
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    import httpx
+
+    from app.main import app
+
+    mix = parse_mix(args.mix)
+    rng = random.Random(args.seed)
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://loadtest", timeout=args.timeout
+        ) as client:
+            seed_start = time.perf_counter()
+            users = [
+                await seed_user(client, i, args.cases_per_user, args.persons)
+                for i in range(args.users)
+            ]
+            seed_seconds = time.perf_counter() - seed_start
+            print(
+                f"seeded {args.users} users x {args.cases_per_user} cases x "
+                f"{args.persons} persons in {seed_seconds:.1f} s",
+                file=sys.stderr,
+            )
+
+            recorder = Recorder()
+            budget = [args.requests or sys.maxsize]
+            start = time.perf_counter()
+            deadline = start + args.duration
+            await asyncio.gather(
+                *(
+                    virtual_user(
+                        client, users, mix, random.Random(rng.random()),
+                        recorder, deadline, budget,
+                    )
+                    for _ in range(args.concurrency)
+                )
+            )
+            elapsed = time.perf_counter() - start
+
+            if not args.keep_data:
+                for user in users:
+                    for case in user.cases:
+                        await client.delete(
+                            f"/api/cases/{case.id}", headers=user.headers
+                        )
+
+    report = recorder.report(elapsed)
+    report["config"] = {
+        "users": args.users,
+        "cases_per_user": args.cases_per_user,
+        "persons": args.persons,
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "requests": args.requests,
+        "graph_backend": os.environ.get("GRAPH_BACKEND", "neo4j"),
+        "mix": mix,
+        "seed": args.seed,
+    }
+    report["seed_s"] = round(seed_seconds, 2)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=2)
+    parser.add_argument("--cases-per-user", type=int, default=5)
+    parser.add_argument("--persons", type=int, default=20, help="Persons per case")
+    parser.add_argument("--concurrency", type=int, default=16, help="Virtual users")
+    parser.add_argument(
+        "--duration", type=float, default=30.0, help="Seconds of traffic"
+    )
+    parser.add_argument("--requests", type=int, help="Stop after this many requests")
+    parser.add_argument(
+        "--mix", help="Weights as route=weight,... (default: built-in mix)"
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--timeout", type=float, default=60.0, help="Per-request timeout"
+    )
+    parser.add_argument("--database-url", help="Overrides DATABASE_URL")
+    parser.add_argument(
+        "--graph-backend", choices=("neo4j", "memory"), help="Overrides GRAPH_BACKEND"
+    )
+    parser.add_argument("--keep-data", action="store_true", help="Keep seeded cases")
+    parser.add_argument(
+        "--json", dest="json_path", help="Write the report to this file"
+    )
+    args = parser.parse_args()
+
+    # Settings are read when the app is imported
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    if args.graph_backend:
+        os.environ["GRAPH_BACKEND"] = args.graph_backend
+    os.environ.setdefault("CACHE_WARMUP_CASES", "0")
+
+    report = asyncio.run(run(args))
+
+    print(
+        f"{report['requests']} requests in {report['duration_s']} s: "
+        f"{report['throughput_rps']} req/s, {report['errors']} errors"
+    )
+    print(
+        f"{'route':22}{'count':>8}{'err':>6}{'req/s':>9}"
+        f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    )
+    for route, entry in report["routes"].items():
+        print(
+            f"{route:22}{entry['count']:>8}{entry['errors']:>6}{entry['throughput_rps']:>9.1f}"
+            f"{entry['p50_ms']:>10.1f}{entry['p95_ms']:>10.1f}{entry['p99_ms']:>10.1f}"
+        )
+
+    if args.json_path:
+        Path(args.json_path).write_text(
+            json.dumps(report, indent=2, ensure_ascii=False)
+        )
+
+
+if __name__ == "__main__":
+    main()